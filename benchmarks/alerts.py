@@ -0,0 +1,93 @@
+"""Measure alert evaluation cost as the number of rules on one instrument grows.
+
+Three numbers per rule count:
+
+* arming: the first tick, which arms every ``move`` rule at once;
+* quiet: per-tick cost when ticks cross no rules (pure index lookup);
+* busy: per-tick cost on a random walk through densely placed rules, where
+  the number of alerts fired per tick grows with the rule count.
+
+Run with ``python benchmarks/alerts.py [ticks]``.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pricemonitor.analytics.alerts import AlertEngine, AlertEvent, AlertKind  # noqa: E402
+from pricemonitor.models.instruments import AssetClass, Instrument  # noqa: E402
+from pricemonitor.models.quotes import Tick  # noqa: E402
+from pricemonitor.utils.time import utc_now  # noqa: E402
+
+INSTRUMENT = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+class CountingSink:
+    def __init__(self) -> None:
+        self.events = 0
+
+    def notify(self, events: list[AlertEvent]) -> None:
+        self.events += len(events)
+
+
+def build(rules: int, rng: random.Random, quiet: bool) -> tuple[AlertEngine, CountingSink]:
+    sink = CountingSink()
+    engine = AlertEngine(sink)
+    for _ in range(rules):
+        kind = rng.choice((AlertKind.ABOVE, AlertKind.BELOW, AlertKind.MOVE))
+        if kind is AlertKind.MOVE:
+            threshold = rng.uniform(20.0, 50.0) if quiet else rng.uniform(2.0, 20.0)
+        elif quiet:
+            # Keep price levels well away from the walk around 100.
+            threshold = rng.uniform(150.0, 300.0) if kind is AlertKind.ABOVE else rng.uniform(10.0, 50.0)
+        else:
+            threshold = rng.uniform(50.0, 150.0)
+        engine.add("binance", "BTCUSDT", kind, threshold, cooldown_seconds=0)
+    return engine, sink
+
+
+def walk(ticks: int, rng: random.Random) -> list[list[Tick]]:
+    timestamp = utc_now()
+    price = 100.0
+    batches = []
+    for _ in range(ticks):
+        price = max(1.0, price + rng.gauss(0.0, 0.01))
+        batches.append([Tick(INSTRUMENT, price, timestamp, "USDT", "binance")])
+    return batches
+
+
+def measure(rules: int, ticks: int, quiet: bool, seed: int = 7) -> tuple[float, float, float]:
+    rng = random.Random(seed)
+    engine, sink = build(rules, rng, quiet)
+    batches = walk(ticks, rng)
+
+    started = time.perf_counter()
+    engine.publish(batches[0])
+    arming = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for batch in batches[1:]:
+        engine.publish(batch)
+    per_tick = (time.perf_counter() - started) / (ticks - 1)
+    return arming * 1e3, per_tick * 1e6, sink.events / (ticks - 1)
+
+
+def main() -> None:
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{ticks} ticks on one instrument")
+    for rules in (10, 1_000, 10_000, 100_000, 200_000):
+        arming, quiet, _ = measure(rules, ticks, quiet=True)
+        _, busy, fired = measure(rules, ticks, quiet=False)
+        print(
+            f"{rules:>7} rules: first tick {arming:7.2f} ms, quiet {quiet:6.2f} us/tick, "
+            f"busy {busy:6.2f} us/tick at {fired:6.3f} alerts/tick"
+        )
+
+
+if __name__ == "__main__":
+    main()
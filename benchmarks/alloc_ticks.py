@@ -0,0 +1,80 @@
+"""Compare per-tick allocations of the legacy Quote path and the slotted Tick path.
+
+Run with ``python benchmarks/alloc_ticks.py [count]``.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pricemonitor.models.instruments import AssetClass, Instrument, intern_instrument  # noqa: E402
+from pricemonitor.models.quotes import Quote, Tick  # noqa: E402
+from pricemonitor.utils.time import utc_now  # noqa: E402
+
+
+def legacy_tick(instrument: Instrument, price: float) -> Quote:
+    # Mirrors the old BinanceProvider.fetch_quote: a throwaway Instrument plus
+    # up to three Quote objects, each with its own ``extra`` dict.
+    timestamp = utc_now()
+    scratch = Instrument(symbol=instrument.symbol, asset_class=AssetClass.CRYPTO, quote="USDT")
+    quote = Quote(instrument=scratch, price=price, timestamp=timestamp, currency="USDT", provider="binance")
+    quote = Quote(
+        instrument=quote.instrument,
+        price=quote.price,
+        timestamp=quote.timestamp,
+        currency=instrument.quote or "USDT",
+        provider=quote.provider,
+    )
+    return Quote(
+        instrument=instrument,
+        price=quote.price,
+        timestamp=quote.timestamp,
+        currency=quote.currency,
+        provider=quote.provider,
+    )
+
+
+def compact_tick(instrument: Instrument, price: float) -> Tick:
+    return Tick(instrument, price, utc_now(), instrument.quote or "USDT", "binance")
+
+
+def measure(build: Callable[[Instrument, float], Any], instruments: list[Instrument], count: int) -> dict[str, float]:
+    gc.collect()
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+    ticks = [build(instruments[index % len(instruments)], 100.0 + index) for index in range(count)]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections
+    del ticks
+    return {
+        "retained_bytes_per_tick": (retained - start_current) / count,
+        "peak_bytes_per_tick": (peak - start_current) / count,
+        "gc_collections": collections,
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    instruments = [
+        intern_instrument(Instrument(symbol=f"SYM{index}USDT", asset_class=AssetClass.CRYPTO, quote="USDT"))
+        for index in range(100)
+    ]
+    print(f"{count} ticks over {len(instruments)} instruments")
+    for label, build in (("quote (before)", legacy_tick), ("tick (after)", compact_tick)):
+        result = measure(build, instruments, count)
+        print(
+            f"{label:>15}: {result['retained_bytes_per_tick']:7.1f} B/tick retained, "
+            f"{result['peak_bytes_per_tick']:7.1f} B/tick peak, {result['gc_collections']} gen collections"
+        )
+
+
+if __name__ == "__main__":
+    main()
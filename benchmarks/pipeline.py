@@ -0,0 +1,326 @@
+"""End-to-end throughput benchmark for the polling pipeline.
+
+Drives ``scheduler.runner.run`` with the provider stack ``build_provider``
+assembles for production (``BinanceProvider`` behind its weight limiter,
+wrapped in ``ResilientProvider``), its HTTP client talking to an in-process
+Binance stand-in (an httpx mock transport with configurable latency and error
+rate), writing into a real storage backend in a temporary directory. Each
+scale runs in a fresh subprocess so peak RSS is per scenario.
+
+    python benchmarks/pipeline.py --scales 10,100,1000,10000 --duration 10 \\
+        --latency-ms 25 --error-rate 0.01 --output results.json
+    python benchmarks/pipeline.py --baseline results.json --output new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import httpx  # noqa: E402
+
+from pricemonitor.config.models import ProviderConfig, StorageConfig  # noqa: E402
+from pricemonitor.models.instruments import AssetClass, Instrument, intern_instrument  # noqa: E402
+from pricemonitor.models.quotes import Quote  # noqa: E402
+from pricemonitor.providers.binance.client import DEFAULT_WEIGHT_LIMIT  # noqa: E402
+from pricemonitor.providers.registry import build_provider  # noqa: E402
+from pricemonitor.scheduler.engine import ScheduledGroup, Scheduler  # noqa: E402
+from pricemonitor.scheduler.runner import run  # noqa: E402
+from pricemonitor.scheduler.tasks import PollTask  # noqa: E402
+from pricemonitor.storage.base import Storage  # noqa: E402
+from pricemonitor.storage.buffered import BufferedStorage  # noqa: E402
+from pricemonitor.storage.registry import build_storage  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Scenario:
+    instruments: int
+    duration: float
+    interval: float
+    latency_ms: float
+    jitter_ms: float
+    error_rate: float
+    weight_limit: float
+    hedge: bool
+    backend: str
+    seed: int
+
+
+class FakeBinance:
+    """Serves ``/api/v3/ticker/price`` for any symbol after a simulated delay."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, seed: int) -> None:
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return httpx.Response(503, json={"code": -1001, "msg": "Internal error"})
+        price = f"{100 + self.random.random():.8f}"
+        if "symbols" in request.url.params:
+            symbols = json.loads(request.url.params["symbols"])
+            return httpx.Response(200, json=[{"symbol": symbol, "price": price} for symbol in symbols])
+        return httpx.Response(200, json={"symbol": request.url.params["symbol"], "price": price})
+
+
+class TimedStorage(Storage):
+    """Records how long each batch write to the wrapped backend takes."""
+
+    def __init__(self, storage: Storage) -> None:
+        self.storage = storage
+        self.write_seconds: list[float] = []
+        self.written = 0
+
+    def append_quote(self, quote: Quote) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        quotes = list(quotes)
+        started = time.perf_counter()
+        self.storage.append_quotes(quotes)
+        self.write_seconds.append(time.perf_counter() - started)
+        self.written += len(quotes)
+
+    def append_bars(self, bars) -> None:
+        self.storage.append_bars(bars)
+
+    def latest(self, instrument: Instrument) -> Quote | None:
+        return self.storage.latest(instrument)
+
+    def history(self, instrument, limit=None, start=None, end=None) -> list[Quote]:
+        return self.storage.history(instrument, limit=limit, start=start, end=end)
+
+    def iter_history(self, instrument, start=None, end=None):
+        return self.storage.iter_history(instrument, start=start, end=end)
+
+    def bars(self, instrument, interval_seconds, limit=None, start=None, end=None):
+        return self.storage.bars(instrument, interval_seconds, limit=limit, start=start, end=end)
+
+    def close(self) -> None:
+        self.storage.close()
+
+
+class LagScheduler(Scheduler):
+    """Scheduler that keeps every dispatch lag instead of only the last one."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lags: list[float] = []
+        self.entries: list[ScheduledGroup] = []
+
+    def add(self, group: Any, delay: float | None = None) -> ScheduledGroup:
+        entry = super().add(group, delay)
+        self.entries.append(entry)
+        return entry
+
+    def _dispatch(self, entry: ScheduledGroup) -> None:
+        self.lags.append(entry.last_lag)
+        super()._dispatch(entry)
+
+
+class TickCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def publish(self, quotes: list[Quote]) -> None:
+        self.count += len(quotes)
+
+
+def _percentiles(values: list[float], scale: float = 1000.0) -> dict[str, float | None]:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * scale, 3)
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": round(ordered[-1] * scale, 3)}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run_scenario(scenario: Scenario, root: Path) -> dict[str, Any]:
+    server = FakeBinance(scenario.latency_ms, scenario.jitter_ms, scenario.error_rate, scenario.seed)
+    settings = {"weight_limit": scenario.weight_limit, "hedge": scenario.hedge}
+    provider = build_provider(
+        ProviderConfig(name="binance", kind="binance", settings=settings),
+        transport=httpx.MockTransport(server),
+    )
+    tasks = [
+        PollTask(
+            instrument=intern_instrument(
+                Instrument(symbol=f"BENCH{index}USDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+            ),
+            provider=provider,
+            interval_seconds=scenario.interval,
+        )
+        for index in range(scenario.instruments)
+    ]
+    timed = TimedStorage(build_storage(StorageConfig(backend=scenario.backend, root=str(root)), write_behind=False))
+    storage = BufferedStorage(timed)
+    counter = TickCounter()
+    scheduler = LagScheduler(handler=None)  # run() installs the pipeline handler
+
+    started = time.perf_counter()
+    try:
+        await run(tasks, storage, run_seconds=scenario.duration, sinks=[counter], scheduler=scheduler)
+        elapsed = time.perf_counter() - started
+        storage.close()
+    finally:
+        await provider.close()
+
+    return {
+        "scenario": asdict(scenario),
+        "elapsed_seconds": round(elapsed, 3),
+        "ticks": counter.count,
+        "ticks_per_second": round(counter.count / elapsed, 1),
+        "expected_ticks_per_second": round(scenario.instruments / scenario.interval, 1),
+        "requests": server.requests,
+        "injected_errors": server.errors,
+        "circuit_state": provider.breaker.state.name,
+        "dispatches": len(scheduler.lags),
+        "skipped_ticks": sum(entry.skipped for entry in scheduler.entries),
+        "schedule_lag_ms": _percentiles(scheduler.lags),
+        "storage_writes": len(timed.write_seconds),
+        "storage_quotes_written": timed.written,
+        "storage_write_ms": _percentiles(timed.write_seconds),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_scenario(scenario: Scenario) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="pricemonitor-bench-") as root:
+        return asyncio.run(_run_scenario(scenario, Path(root)))
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _compare(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    previous = {result["scenario"]["instruments"]: result for result in baseline.get("results", [])}
+    print(f"\nvs baseline {baseline.get('revision') or '?'} ({baseline.get('created_at', '?')})")
+    for result in current["results"]:
+        old = previous.get(result["scenario"]["instruments"])
+        if old is None:
+            continue
+        rows = (
+            ("ticks/s", result["ticks_per_second"], old["ticks_per_second"]),
+            ("lag p99 ms", result["schedule_lag_ms"]["p99"], old["schedule_lag_ms"]["p99"]),
+            ("write p99 ms", result["storage_write_ms"]["p99"], old["storage_write_ms"]["p99"]),
+            ("rss MB", result["peak_rss_mb"], old["peak_rss_mb"]),
+        )
+        parts = []
+        for label, new_value, old_value in rows:
+            if new_value is None or old_value in (None, 0):
+                parts.append(f"{label} {new_value} (was {old_value})")
+            else:
+                parts.append(f"{label} {new_value} ({(new_value - old_value) / old_value:+.1%})")
+        print(f"  {result['scenario']['instruments']:>6} instruments: " + ", ".join(parts))
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="10,100,1000,10000", help="comma-separated instrument counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--interval", type=float, default=1.0, help="poll interval per instrument in seconds")
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="mean fake upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="uniform latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--weight-limit", type=float, default=DEFAULT_WEIGHT_LIMIT, help="request weight per minute")
+    parser.add_argument("--hedge", action="store_true", help="hedge slow requests")
+    parser.add_argument("--backend", default="csv", choices=("csv", "binary", "sqlite"))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON results to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    scenarios = [
+        Scenario(
+            instruments=int(scale),
+            duration=args.duration,
+            interval=args.interval,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            weight_limit=args.weight_limit,
+            hedge=args.hedge,
+            backend=args.backend,
+            seed=args.seed,
+        )
+        for scale in args.scales.split(",")
+        if scale.strip()
+    ]
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for scenario in scenarios:
+        # A fresh interpreter per scenario keeps peak RSS attributable to it.
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_scenario, scenario).result()
+        results.append(result)
+        print(
+            f"{scenario.instruments:>6} instruments: {result['ticks_per_second']:>9.1f} ticks/s "
+            f"(target {result['expected_ticks_per_second']}), "
+            f"lag p50/p99 {result['schedule_lag_ms']['p50']}/{result['schedule_lag_ms']['p99']} ms, "
+            f"write p99 {result['storage_write_ms']['p99']} ms, "
+            f"rss {result['peak_rss_mb']} MB, errors {result['injected_errors']}/{result['requests']}"
+        )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.baseline is not None:
+        _compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import itertools
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Protocol
+
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.store import QuoteKey
+from pricemonitor.utils.log import get_logger, log_event
+from pricemonitor.utils.metrics import ALERTS, ERRORS
+
+logger = get_logger(__name__)
+
+
+class AlertKind(str, Enum):
+    ABOVE = "above"
+    BELOW = "below"
+    MOVE = "move"
+
+
+@dataclass
+class AlertRule:
+    """Price alert on one instrument.
+
+    ``above``/``below`` fire when the price crosses ``threshold`` in that
+    direction. ``move`` fires when the price has moved ``threshold`` percent
+    either way from ``reference`` (the price when the rule was armed) and then
+    re-arms at the new price. Repeats within ``cooldown_seconds`` of quote time
+    are suppressed.
+    """
+
+    id: int
+    provider: str
+    symbol: str
+    kind: AlertKind
+    threshold: float
+    cooldown_seconds: float = 60.0
+    reference: float | None = None
+    last_fired: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "provider": self.provider,
+            "symbol": self.symbol,
+            "kind": self.kind.value,
+            "threshold": self.threshold,
+            "cooldown_seconds": self.cooldown_seconds,
+            "reference": self.reference,
+            "last_fired": self.last_fired.isoformat() if self.last_fired else None,
+        }
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    rule_id: int
+    provider: str
+    symbol: str
+    kind: AlertKind
+    level: float
+    previous: float
+    price: float
+    timestamp: datetime
+
+    @property
+    def direction(self) -> str:
+        return "up" if self.price > self.previous else "down"
+
+
+class AlertSink(Protocol):
+    """Receives alert notifications, one batch per published tick."""
+
+    def notify(self, events: list[AlertEvent]) -> None:
+        """Deliver fired alerts."""
+
+
+class LogAlertSink:
+    """Default sink: one structured log line per alert."""
+
+    def notify(self, events: list[AlertEvent]) -> None:
+        for event in events:
+            log_event(
+                logger,
+                logging.WARNING,
+                "alert",
+                rule=event.rule_id,
+                provider=event.provider,
+                symbol=event.symbol,
+                kind=event.kind.value,
+                direction=event.direction,
+                level=event.level,
+                price=event.price,
+                timestamp=event.timestamp.isoformat(),
+            )
+
+
+class _Ladder:
+    """Rule trigger levels kept sorted in bounded buckets.
+
+    Levels live in a list of sorted buckets of at most ``2 * load`` entries
+    (with the rules in parallel lists), plus the maximum of each bucket.
+    Lookups bisect the bucket maxima and then one bucket, and an insert or
+    remove only shifts entries within a bucket, so arming and re-arming stay
+    cheap however many rules an instrument has.
+    """
+
+    __slots__ = ("load", "_levels", "_rules", "_maxes", "_size")
+
+    def __init__(self, load: int = 256) -> None:
+        self.load = load
+        self._levels: list[list[float]] = []
+        self._rules: list[list[AlertRule]] = []
+        self._maxes: list[float] = []
+        self._size = 0
+
+    def insert(self, level: float, rule: AlertRule) -> None:
+        if not self._maxes:
+            self._levels.append([level])
+            self._rules.append([rule])
+            self._maxes.append(level)
+            self._size = 1
+            return
+        index = min(bisect_right(self._maxes, level), len(self._maxes) - 1)
+        levels = self._levels[index]
+        position = bisect_right(levels, level)
+        levels.insert(position, level)
+        self._rules[index].insert(position, rule)
+        self._maxes[index] = levels[-1]
+        self._size += 1
+        if len(levels) > 2 * self.load:
+            self._split(index)
+
+    def extend(self, levels: list[float], rules: list[AlertRule]) -> None:
+        """Insert many rules with one sort instead of one shift each."""
+
+        if not levels:
+            return
+        merged_levels = list(itertools.chain.from_iterable(self._levels))
+        merged_rules = list(itertools.chain.from_iterable(self._rules))
+        merged_levels.extend(levels)
+        merged_rules.extend(rules)
+        # The existing levels are one sorted run, so timsort mostly merges.
+        order = sorted(range(len(merged_levels)), key=merged_levels.__getitem__)
+        merged_levels = [merged_levels[index] for index in order]
+        merged_rules = [merged_rules[index] for index in order]
+        bounds = range(0, len(merged_levels), self.load)
+        self._levels = [merged_levels[start : start + self.load] for start in bounds]
+        self._rules = [merged_rules[start : start + self.load] for start in bounds]
+        self._maxes = [bucket[-1] for bucket in self._levels]
+        self._size = len(merged_levels)
+
+    def remove(self, level: float, rule: AlertRule) -> None:
+        index = bisect_left(self._maxes, level)
+        while index < len(self._maxes):
+            levels = self._levels[index]
+            if levels[0] > level:
+                return
+            position = bisect_left(levels, level)
+            rules = self._rules[index]
+            while position < len(levels) and levels[position] == level:
+                if rules[position] is rule:
+                    del levels[position]
+                    del rules[position]
+                    self._size -= 1
+                    if levels:
+                        self._maxes[index] = levels[-1]
+                    else:
+                        del self._levels[index]
+                        del self._rules[index]
+                        del self._maxes[index]
+                    return
+                position += 1
+            index += 1
+
+    def crossed_up(self, previous: float, price: float) -> list[tuple[float, AlertRule]]:
+        # Levels in (previous, price], lowest first.
+        crossed: list[tuple[float, AlertRule]] = []
+        for index in range(bisect_right(self._maxes, previous), len(self._maxes)):
+            levels = self._levels[index]
+            lower = bisect_right(levels, previous)
+            upper = bisect_right(levels, price)
+            crossed.extend(zip(levels[lower:upper], self._rules[index][lower:upper]))
+            if upper < len(levels):
+                break
+        return crossed
+
+    def crossed_down(self, previous: float, price: float) -> list[tuple[float, AlertRule]]:
+        # Levels in [price, previous), nearest the previous price first.
+        crossed: list[tuple[float, AlertRule]] = []
+        for index in range(bisect_left(self._maxes, price), len(self._maxes)):
+            levels = self._levels[index]
+            lower = bisect_left(levels, price)
+            upper = bisect_left(levels, previous)
+            crossed.extend(zip(levels[lower:upper], self._rules[index][lower:upper]))
+            if upper < len(levels):
+                break
+        crossed.reverse()
+        return crossed
+
+    def _split(self, index: int) -> None:
+        levels, rules = self._levels[index], self._rules[index]
+        half = len(levels) // 2
+        self._levels[index : index + 1] = [levels[:half], levels[half:]]
+        self._rules[index : index + 1] = [rules[:half], rules[half:]]
+        self._maxes[index : index + 1] = [levels[half - 1], levels[-1]]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _InstrumentAlerts:
+    __slots__ = ("last", "up", "down", "unarmed")
+
+    def __init__(self) -> None:
+        self.last: float | None = None
+        self.up = _Ladder()
+        self.down = _Ladder()
+        self.unarmed: list[AlertRule] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.up or self.down or self.unarmed)
+
+
+class AlertEngine:
+    """Quote sink evaluating price alerts against sorted trigger ladders.
+
+    Every instrument with rules keeps two ladders of trigger levels: one
+    crossed by rising prices (``above`` levels and the upper band of ``move``
+    rules) and one by falling prices. A tick only bisects the ladder for its
+    direction between the previous and current price, so its cost is
+    logarithmic in the number of rules plus linear in the number it crosses.
+    ``move`` rules that fire are re-armed after the tick, merged in bulk when
+    there are many (as on an instrument's first tick). Rules need a
+    previous price to detect a crossing, so nothing fires on an instrument's
+    first tick. Identical rules are created once, and fired events go to
+    ``sink`` in one batch per published tick. Not thread-safe: manage rules
+    from the event loop that delivers quotes.
+    """
+
+    def __init__(self, sink: AlertSink | None = None) -> None:
+        self.sink: AlertSink = sink if sink is not None else LogAlertSink()
+        self._instruments: dict[QuoteKey, _InstrumentAlerts] = {}
+        self._rules: dict[int, AlertRule] = {}
+        self._signatures: dict[tuple[str, str, AlertKind, float, float], int] = {}
+        self._ids = itertools.count(1)
+        self.suppressed = 0
+
+    def add(
+        self,
+        provider: str,
+        symbol: str,
+        kind: AlertKind | str,
+        threshold: float,
+        cooldown_seconds: float = 60.0,
+    ) -> AlertRule:
+        """Create a rule, or return the existing identical one."""
+
+        kind = AlertKind(kind)
+        threshold = float(threshold)
+        if threshold <= 0 or (kind is AlertKind.MOVE and threshold >= 100):
+            raise ValueError(f"Invalid threshold for {kind.value} alert: {threshold}")
+        if cooldown_seconds < 0:
+            raise ValueError("cooldown_seconds must not be negative")
+        signature = (provider, symbol, kind, threshold, float(cooldown_seconds))
+        existing = self._signatures.get(signature)
+        if existing is not None:
+            return self._rules[existing]
+
+        rule = AlertRule(next(self._ids), provider, symbol, kind, threshold, float(cooldown_seconds))
+        state = self._instruments.setdefault((provider, symbol), _InstrumentAlerts())
+        if kind is AlertKind.ABOVE:
+            state.up.insert(threshold, rule)
+        elif kind is AlertKind.BELOW:
+            state.down.insert(threshold, rule)
+        elif state.last is not None:
+            self._arm(state, rule, state.last)
+        else:
+            state.unarmed.append(rule)
+        self._rules[rule.id] = rule
+        self._signatures[signature] = rule.id
+        return rule
+
+    def remove(self, rule_id: int) -> AlertRule | None:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return None
+        del self._signatures[(rule.provider, rule.symbol, rule.kind, rule.threshold, rule.cooldown_seconds)]
+        key = (rule.provider, rule.symbol)
+        state = self._instruments[key]
+        if rule.kind is AlertKind.ABOVE:
+            state.up.remove(rule.threshold, rule)
+        elif rule.kind is AlertKind.BELOW:
+            state.down.remove(rule.threshold, rule)
+        elif rule.reference is None:
+            state.unarmed.remove(rule)
+        else:
+            self._disarm(state, rule)
+        if not state:
+            del self._instruments[key]
+        return rule
+
+    def get(self, rule_id: int) -> AlertRule | None:
+        return self._rules.get(rule_id)
+
+    def rules(self, provider: str | None = None, symbol: str | None = None) -> list[AlertRule]:
+        return [
+            rule
+            for rule in self._rules.values()
+            if (provider is None or rule.provider == provider) and (symbol is None or rule.symbol == symbol)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def publish(self, quotes: list[Quote]) -> None:
+        if not self._instruments:
+            return
+        events: list[AlertEvent] = []
+        for quote in quotes:
+            state = self._instruments.get((quote.provider, quote.instrument.symbol))
+            if state is None:
+                continue
+            price = quote.price
+            previous = state.last
+            state.last = price
+            if state.unarmed:
+                self._arm_many(state, state.unarmed, price)
+                state.unarmed.clear()
+            if previous is None or price == previous:
+                continue
+            crossed = state.up.crossed_up(previous, price) if price > previous else state.down.crossed_down(previous, price)
+            rearm: list[AlertRule] = []
+            for level, rule in crossed:
+                if rule.kind is AlertKind.MOVE:
+                    self._disarm(state, rule)
+                    rearm.append(rule)
+                if rule.last_fired is not None and (quote.timestamp - rule.last_fired).total_seconds() < rule.cooldown_seconds:
+                    self.suppressed += 1
+                    continue
+                rule.last_fired = quote.timestamp
+                events.append(
+                    AlertEvent(rule.id, rule.provider, rule.symbol, rule.kind, level, previous, price, quote.timestamp)
+                )
+            if rearm:
+                self._arm_many(state, rearm, price)
+        if not events:
+            return
+        for event in events:
+            ALERTS.labels(event.provider, event.kind.value).inc()
+        try:
+            self.sink.notify(events)
+        except Exception as exc:  # pragma: no cover - a broken sink must not stall ingestion
+            ERRORS.labels("alerts", type(exc).__name__).inc()
+            log_event(logger, logging.ERROR, "alert sink failed", error=repr(exc), events=len(events))
+
+    @staticmethod
+    def _arm(state: _InstrumentAlerts, rule: AlertRule, price: float) -> None:
+        fraction = rule.threshold / 100.0
+        rule.reference = price
+        state.up.insert(price * (1 + fraction), rule)
+        state.down.insert(price * (1 - fraction), rule)
+
+    @classmethod
+    def _arm_many(cls, state: _InstrumentAlerts, rules: list[AlertRule], price: float) -> None:
+        # A handful of rules go in one by one; a large batch (first tick, big jump) is merged in one sort.
+        if len(rules) < state.up.load:
+            for rule in rules:
+                cls._arm(state, rule, price)
+            return
+        for rule in rules:
+            rule.reference = price
+        state.up.extend([price * (1 + rule.threshold / 100.0) for rule in rules], rules)
+        state.down.extend([price * (1 - rule.threshold / 100.0) for rule in rules], rules)
+
+    @staticmethod
+    def _disarm(state: _InstrumentAlerts, rule: AlertRule) -> None:
+        assert rule.reference is not None
+        fraction = rule.threshold / 100.0
+        state.up.remove(rule.reference * (1 + fraction), rule)
+        state.down.remove(rule.reference * (1 - fraction), rule)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from pricemonitor.analytics.series import AnalyticsError, require_numpy
+from pricemonitor.utils.time import parse_duration
+
+
+def parse_interval(value: str) -> int:
+    """Parse a bar width such as ``"1s"``, ``"5m"`` or ``"1h"`` into seconds."""
+
+    try:
+        return parse_duration(value)
+    except ValueError as exc:
+        raise AnalyticsError(f"Invalid bar interval: {value}") from exc
+
+
+@dataclass(frozen=True)
+class OhlcBars:
+    """Column arrays of OHLC bars; ``start_ns`` is each bar's aligned open time."""
+
+    start_ns: Any
+    open: Any
+    high: Any
+    low: Any
+    close: Any
+    count: Any
+
+    def __len__(self) -> int:
+        return len(self.start_ns)
+
+
+def resample_ohlc(timestamps_ns: Any, prices: Any, interval_seconds: int) -> OhlcBars:
+    """Bucket time-sorted ticks into epoch-aligned OHLC bars without Python loops."""
+
+    np = require_numpy()
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(timestamps_ns) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return OhlcBars(np.empty(0, dtype=np.int64), empty, empty, empty, empty, np.empty(0, dtype=np.int64))
+
+    width = interval_seconds * 1_000_000_000
+    buckets = timestamps_ns // width
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.concatenate((starts[1:], [len(prices)]))
+    return OhlcBars(
+        start_ns=buckets[starts] * width,
+        open=prices[starts],
+        high=np.maximum.reduceat(prices, starts),
+        low=np.minimum.reduceat(prices, starts),
+        close=prices[ends - 1],
+        count=ends - starts,
+    )
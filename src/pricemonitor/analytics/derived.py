@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from pricemonitor.config.models import DERIVED_PROVIDER
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote, Tick
+from pricemonitor.state.store import QuoteKey
+
+QuoteWriter = Callable[[list[Quote]], None]
+
+
+@dataclass(frozen=True)
+class DerivedDefinition:
+    """A derived instrument resolved for evaluation: price = product of ``leg ** power``."""
+
+    instrument: Instrument
+    currency: str
+    legs: tuple[tuple[QuoteKey, int], ...]
+    max_skew_seconds: float | None = None
+
+    @property
+    def key(self) -> QuoteKey:
+        return (DERIVED_PROVIDER, self.instrument.symbol)
+
+
+class DerivedEngine:
+    """Quote sink that keeps derived instruments up to date as their inputs tick.
+
+    Definitions form a dependency graph (derived series may build on each
+    other) ranked in topological order. Each published batch marks only the
+    definitions reachable from the keys it touched, and those are evaluated
+    once, lowest rank first, so a node is recomputed after all of its dirty
+    inputs within the same batch. Results go to ``emit`` (normally the
+    pipeline's delivery, so they are stored and fanned out like any quote);
+    derived quotes coming back through the sink are ignored. Register the
+    engine as the last sink so a derived quote never reaches a sink before
+    the inputs it was computed from. A definition is
+    skipped while any input is missing, non-positive in a divisor, or its
+    inputs are further apart in time than ``max_skew_seconds``.
+    """
+
+    def __init__(self, definitions: Iterable[DerivedDefinition] = (), emit: QuoteWriter | None = None) -> None:
+        self.emit = emit
+        self._latest: dict[QuoteKey, Quote] = {}
+        self._order: list[DerivedDefinition] = []
+        self._dependents: dict[QuoteKey, list[int]] = {}
+        self.update(definitions)
+
+    def update(self, definitions: Iterable[DerivedDefinition]) -> None:
+        """Replace the definitions; last seen input quotes are kept."""
+
+        order = _topological(list(definitions))
+        dependents: dict[QuoteKey, list[int]] = {}
+        for rank, definition in enumerate(order):
+            for key in {key for key, _ in definition.legs}:
+                dependents.setdefault(key, []).append(rank)
+        self._order = order
+        self._dependents = dependents
+
+    def publish(self, quotes: list[Quote]) -> None:
+        if not self._dependents:
+            return
+        dirty: set[int] = set()
+        for quote in quotes:
+            if quote.provider == DERIVED_PROVIDER:
+                continue
+            key = (quote.provider, quote.instrument.symbol)
+            ranks = self._dependents.get(key)
+            if ranks is not None:
+                self._latest[key] = quote
+                dirty.update(ranks)
+        if not dirty:
+            return
+
+        pending = list(dirty)
+        heapq.heapify(pending)
+        emitted: list[Quote] = []
+        while pending:
+            definition = self._order[heapq.heappop(pending)]
+            quote = self._evaluate(definition)
+            if quote is None:
+                continue
+            self._latest[definition.key] = quote
+            emitted.append(quote)
+            for rank in self._dependents.get(definition.key, ()):
+                if rank not in dirty:
+                    dirty.add(rank)
+                    heapq.heappush(pending, rank)
+        if emitted and self.emit is not None:
+            self.emit(emitted)
+
+    def latest(self, symbol: str) -> Quote | None:
+        return self._latest.get((DERIVED_PROVIDER, symbol))
+
+    def _evaluate(self, definition: DerivedDefinition) -> Quote | None:
+        price = 1.0
+        oldest = newest = None
+        for key, power in definition.legs:
+            quote = self._latest.get(key)
+            if quote is None:
+                return None
+            if power > 0:
+                price *= quote.price
+            elif quote.price > 0:
+                price /= quote.price
+            else:
+                return None
+            if oldest is None or quote.timestamp < oldest:
+                oldest = quote.timestamp
+            if newest is None or quote.timestamp > newest:
+                newest = quote.timestamp
+        assert oldest is not None and newest is not None
+        if definition.max_skew_seconds is not None and (newest - oldest).total_seconds() > definition.max_skew_seconds:
+            return None
+        return Tick(definition.instrument, price, newest, definition.currency, DERIVED_PROVIDER)
+
+
+def _topological(definitions: list[DerivedDefinition]) -> list[DerivedDefinition]:
+    by_key = {definition.key: definition for definition in definitions}
+    order: list[DerivedDefinition] = []
+    state: dict[QuoteKey, bool] = {}
+
+    def visit(definition: DerivedDefinition) -> None:
+        mark = state.get(definition.key)
+        if mark is True:
+            return
+        if mark is False:
+            raise ValueError(f"Derived instruments form a cycle through {definition.instrument.symbol}")
+        state[definition.key] = False
+        for key, _ in definition.legs:
+            upstream = by_key.get(key)
+            if upstream is not None:
+                visit(upstream)
+        state[definition.key] = True
+        order.append(definition)
+
+    for definition in definitions:
+        visit(definition)
+    return order
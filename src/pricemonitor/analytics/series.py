@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.storage.base import Storage
+from pricemonitor.utils.time import to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class AnalyticsError(RuntimeError):
+    """Raised when analytics cannot be computed."""
+
+
+def require_numpy() -> Any:
+    if np is None:
+        raise AnalyticsError("NumPy is required for analytics.")
+    return np
+
+
+# Ticks loaded when a caller bounds neither time nor count, so a bare query
+# cannot pull an instrument's whole history into memory.
+DEFAULT_SERIES_LIMIT = 100_000
+
+
+def load_series(
+    storage: Storage,
+    instrument: Instrument,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int | None = None,
+) -> tuple[Any, Any]:
+    """Return ``(timestamps_ns, prices)`` arrays for an instrument.
+
+    Backends exposing ``history_arrays`` (all built-in ones) read the two
+    columns directly; others fall back to converting ``history`` once. With
+    no ``start``, ``end`` or ``limit`` the latest ``DEFAULT_SERIES_LIMIT``
+    ticks are returned.
+    """
+
+    require_numpy()
+    if start is None and end is None and limit is None:
+        limit = DEFAULT_SERIES_LIMIT
+    history_arrays = getattr(storage, "history_arrays", None)
+    if history_arrays is not None:
+        try:
+            timestamps, prices = history_arrays(instrument, limit=limit, start=start, end=end)
+        except NotImplementedError:
+            pass
+        else:
+            return np.asarray(timestamps, dtype=np.int64), np.asarray(prices, dtype=np.float64)
+    quotes = storage.history(instrument, limit=limit, start=start, end=end)
+    timestamps = np.fromiter((to_epoch_micros(quote.timestamp) * 1000 for quote in quotes), dtype=np.int64, count=len(quotes))
+    prices = np.fromiter((quote.price for quote in quotes), dtype=np.float64, count=len(quotes))
+    return timestamps, prices
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pricemonitor.analytics.series import AnalyticsError, require_numpy
+
+
+def simple_returns(prices: Any) -> Any:
+    np = require_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) < 2:
+        return np.empty(0, dtype=np.float64)
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def log_returns(prices: Any) -> Any:
+    np = require_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) < 2:
+        return np.empty(0, dtype=np.float64)
+    return np.diff(np.log(prices))
+
+
+def rolling_mean(values: Any, window: int) -> Any:
+    """Mean over each trailing ``window``; the result has ``len(values) - window + 1`` points."""
+
+    np = require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    _check_window(window)
+    if len(values) < window:
+        return np.empty(0, dtype=np.float64)
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def rolling_std(values: Any, window: int) -> Any:
+    """Sample standard deviation over each trailing ``window``."""
+
+    np = require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    _check_window(window)
+    if window < 2 or len(values) < window:
+        return np.empty(0, dtype=np.float64)
+    # Centre on the overall mean so the cumulative-sum variance stays well conditioned.
+    centred = values - values.mean()
+    sums = np.cumsum(np.concatenate(([0.0], centred)))
+    squares = np.cumsum(np.concatenate(([0.0], centred * centred)))
+    total = sums[window:] - sums[:-window]
+    total_sq = squares[window:] - squares[:-window]
+    variance = (total_sq - total * total / window) / (window - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def rolling_volatility(prices: Any, window: int) -> Any:
+    """Rolling standard deviation of log returns over ``window`` returns."""
+
+    return rolling_std(log_returns(prices), window)
+
+
+def _check_window(window: int) -> None:
+    if window <= 0:
+        raise AnalyticsError(f"Rolling window must be positive: {window}")
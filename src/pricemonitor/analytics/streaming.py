@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.quotes import Quote
+from pricemonitor.utils.time import to_epoch_micros
+
+BarWriter = Callable[[list[Bar]], None]
+
+
+class _OpenBar:
+    __slots__ = ("bucket", "open", "high", "low", "close", "count", "mean", "m2", "quote")
+
+    def __init__(self, bucket: int, quote: Quote) -> None:
+        self.bucket = bucket
+        self.open = self.high = self.low = self.close = self.mean = quote.price
+        self.count = 1
+        self.m2 = 0.0
+        self.quote = quote
+
+    def update(self, price: float) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        # Welford's online update keeps mean/variance exact without storing ticks.
+        self.count += 1
+        delta = price - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (price - self.mean)
+
+    def to_bar(self, interval_seconds: int) -> Bar:
+        return Bar(
+            instrument=self.quote.instrument,
+            provider=self.quote.provider,
+            currency=self.quote.currency,
+            interval_seconds=interval_seconds,
+            start=datetime.fromtimestamp(self.bucket * interval_seconds, tz=timezone.utc),
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            count=self.count,
+            mean=self.mean,
+            variance=self.m2 / (self.count - 1) if self.count > 1 else 0.0,
+        )
+
+
+class BarAggregator:
+    """Quote sink that maintains streaming OHLC bars for each configured width.
+
+    A bar closes when the first quote of a later bucket arrives for the same
+    (provider, symbol, width); closed bars are handed to ``writer`` in one batch
+    per published tick. Quotes older than the open bar are ignored.
+    """
+
+    def __init__(self, intervals: Iterable[int], writer: BarWriter) -> None:
+        self.intervals = tuple(sorted(set(intervals)))
+        self.writer = writer
+        self._open: dict[tuple[str, str, int], _OpenBar] = {}
+
+    def publish(self, quotes: list[Quote]) -> None:
+        closed: list[Bar] = []
+        for quote in quotes:
+            seconds = to_epoch_micros(quote.timestamp) // 1_000_000
+            for interval in self.intervals:
+                key = (quote.provider, quote.instrument.symbol, interval)
+                bucket = seconds // interval
+                current = self._open.get(key)
+                if current is None or bucket > current.bucket:
+                    if current is not None:
+                        closed.append(current.to_bar(interval))
+                    self._open[key] = _OpenBar(bucket, quote)
+                elif bucket == current.bucket:
+                    current.update(quote.price)
+        if closed:
+            self.writer(closed)
+
+    def open_bars(self) -> list[Bar]:
+        """Snapshot of the bars still accumulating."""
+
+        return [state.to_bar(key[2]) for key, state in self._open.items()]
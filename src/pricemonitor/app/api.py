@@ -1,55 +1,455 @@
 from __future__ import annotations
 
+import asyncio
+import csv
+import heapq
+import io
+import json
 import os
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Iterable, Iterator
 
+from pricemonitor.analytics.alerts import AlertEngine, AlertKind
+from pricemonitor.analytics.bars import parse_interval, resample_ohlc
+from pricemonitor.analytics.series import DEFAULT_SERIES_LIMIT, AnalyticsError, load_series
+from pricemonitor.analytics.stats import rolling_mean, rolling_volatility, simple_returns
+from pricemonitor.app.deps import AppContext
 from pricemonitor.config.loader import ConfigError
-from pricemonitor.providers.base import ProviderError
-from pricemonitor.providers.registry import build_provider_from_config
+from pricemonitor.models.quotes import Quote
+from pricemonitor.providers.base import Provider, ProviderError
+from pricemonitor.scheduler.runner import run_pipeline
+from pricemonitor.state.bus import QuoteBus, Subscription
+from pricemonitor.state.cache import LatestCache
+from pricemonitor.state.store import QuoteStore
+from pricemonitor.utils.log import configure_logging
+from pricemonitor.utils.metrics import REGISTRY
+from pricemonitor.utils.time import to_epoch_micros, utc_now
 
 try:
-    from fastapi import FastAPI, HTTPException
+    from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
+    from fastapi.responses import PlainTextResponse, StreamingResponse
+    from pydantic import BaseModel, ConfigDict, Field
 except ImportError:  # pragma: no cover - optional dependency
     FastAPI = None
+else:
+
+    class AlertRequest(BaseModel):
+        """Body of ``POST /alerts``; ``threshold`` is a price, or a percentage for ``move``."""
+
+        model_config = ConfigDict(extra="forbid", strict=True)
+
+        provider: str = Field(min_length=1)
+        symbol: str = Field(min_length=1)
+        kind: AlertKind = Field(strict=False)
+        threshold: float = Field(gt=0)
+        cooldown_seconds: float = Field(60.0, ge=0)
 
 
 def _config_dir() -> Path:
     return Path(os.environ.get("PRICEMONITOR_CONFIG", "config"))
 
 
-def create_app() -> Any:
+def _quote_payload(quote: Quote) -> dict[str, Any]:
+    return {
+        "symbol": quote.instrument.symbol,
+        "price": quote.price,
+        "timestamp": quote.timestamp.isoformat(),
+        "currency": quote.currency,
+        "provider": quote.provider,
+    }
+
+
+def _aged_payload(quote: Quote) -> dict[str, Any]:
+    payload = _quote_payload(quote)
+    payload["age_seconds"] = round(max(0.0, (utc_now() - quote.timestamp).total_seconds()), 6)
+    return payload
+
+
+def _embed_scheduler() -> bool:
+    return os.environ.get("PRICEMONITOR_EMBED_SCHEDULER", "").lower() in {"1", "true", "yes"}
+
+
+def _encode_quote(quote: Quote) -> str:
+    return json.dumps(_quote_payload(quote), separators=(",", ":"))
+
+
+# Upper bound on ticks (or stored bars) one /prices/bars or /prices/stats request may load.
+MAX_SERIES_LIMIT = 1_000_000
+
+_EXPORT_CHUNK = 1000
+_EXPORT_COLUMNS = ("timestamp", "provider", "symbol", "price", "currency")
+
+
+def _export_ndjson(quotes: Iterable[Quote]) -> Iterator[str]:
+    lines: list[str] = []
+    for quote in quotes:
+        lines.append(_encode_quote(quote))
+        if len(lines) >= _EXPORT_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _export_csv(quotes: Iterable[Quote]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(_EXPORT_COLUMNS)
+    rows = 0
+    for quote in quotes:
+        writer.writerow(
+            (quote.timestamp.isoformat(), quote.provider, quote.instrument.symbol, repr(quote.price), quote.currency)
+        )
+        rows += 1
+        if rows >= _EXPORT_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+_EXPORT_FORMATS = {
+    "ndjson": (_export_ndjson, "application/x-ndjson"),
+    "csv": (_export_csv, "text/csv"),
+}
+
+
+def _subscribe(bus: QuoteBus, provider: str | None, symbols: str | None) -> Subscription:
+    """Subscribe to ``provider``'s ``symbols``, all of ``provider``'s symbols, or everything.
+
+    Raises ``ValueError`` for ``symbols`` without a ``provider``.
+    """
+
+    names = [symbol.strip() for symbol in (symbols or "").split(",") if symbol.strip()]
+    if provider is None:
+        if names:
+            raise ValueError("symbols requires provider")
+        return bus.subscribe()
+    if not names:
+        return bus.subscribe(providers=[provider])
+    return bus.subscribe([(provider, symbol) for symbol in names])
+
+
+def create_app(
+    store: QuoteStore | None = None,
+    context: AppContext | None = None,
+    embed_scheduler: bool | None = None,
+    cache: LatestCache | None = None,
+    alerts: AlertEngine | None = None,
+) -> Any:
     if FastAPI is None:
         raise RuntimeError("FastAPI is required to create the web API.")
 
-    app = FastAPI(title="Price Monitor API")
+    store = store if store is not None else QuoteStore()
+    cache = cache if cache is not None else LatestCache()
+    alerts = alerts if alerts is not None else AlertEngine()
+    bus = QuoteBus(_encode_quote)
+    if embed_scheduler is None:
+        embed_scheduler = _embed_scheduler()
+
+    @asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[None]:
+        configure_logging()
+        app.state.context = context if context is not None else AppContext.load(_config_dir())
+        pipeline = None
+        if embed_scheduler:
+            ctx: AppContext = app.state.context
+            providers = {name: ctx.provider(name) for name in ctx.config.providers}
+            pipeline = asyncio.create_task(run_pipeline(ctx.config, providers, sinks=[store, bus, alerts]))
+        try:
+            yield
+        finally:
+            if pipeline is not None:
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+            await app.state.context.close()
+
+    app = FastAPI(title="Price Monitor API", lifespan=lifespan)
+    app.state.store = store
+    app.state.bus = bus
+    app.state.cache = cache
+    app.state.alerts = alerts
+
+    def provider_for(name: str) -> Provider:
+        try:
+            return app.state.context.provider(name)
+        except ConfigError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     @app.get("/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def metrics() -> Any:
+        return PlainTextResponse(REGISTRY.render(), media_type=REGISTRY.content_type)
+
     @app.get("/prices/latest")
-    async def latest(provider: str, symbol: str) -> dict[str, Any]:
-        try:
-            provider_instance = build_provider_from_config(_config_dir(), provider)
-        except ConfigError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    async def latest(provider: str, symbol: str, max_age: float = 1.0) -> dict[str, Any]:
+        cached = store.latest(provider, symbol, max_age=max_age)
+        if cached is not None:
+            return _aged_payload(cached)
 
-        try:
+        provider_instance = provider_for(provider)
+
+        async def fetch() -> Quote:
             quote = await provider_instance.get_latest_price(symbol)
+            store.publish([quote])
+            return quote
+
+        try:
+            quote = await cache.get((provider, symbol), fetch)
         except ProviderError as exc:
             raise HTTPException(status_code=502, detail=str(exc)) from exc
+        return _aged_payload(quote)
+
+    @app.get("/prices/latest/many")
+    async def latest_many(provider: str, symbols: str, max_age: float = 1.0) -> dict[str, Any]:
+        requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+        found = store.latest_many(provider, requested, max_age=max_age)
+        missing = [symbol for symbol in requested if symbol not in found]
+
+        if missing:
+            provider_instance = provider_for(provider)
+            context: AppContext = app.state.context
+            instruments = [context.instrument(provider, symbol) for symbol in missing]
+            unknown = [symbol for symbol, instrument in zip(missing, instruments) if instrument is None]
+            if unknown:
+                raise HTTPException(status_code=404, detail=f"Unknown {provider} symbols: {', '.join(unknown)}")
+
+            try:
+                quotes = await provider_instance.fetch_quotes(instruments)
+            except ProviderError as exc:
+                raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+            store.publish(quotes)
+            found.update((quote.instrument.symbol, quote) for quote in quotes)
+
+        return {
+            "provider": provider,
+            "quotes": [_quote_payload(found[symbol]) for symbol in requested if symbol in found],
+        }
+
+    def stored_series(
+        provider: str,
+        symbol: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+    ) -> tuple[Any, Any]:
+        context: AppContext = app.state.context
+        instrument = context.instrument(provider, symbol)
+        if instrument is None:
+            raise HTTPException(status_code=404, detail=f"Unknown instrument: {provider}:{symbol}")
+        try:
+            return load_series(context.storage, instrument, start=start, end=end, limit=limit)
+        except AnalyticsError as exc:
+            raise HTTPException(status_code=501, detail=str(exc)) from exc
+
+    @app.get("/prices/bars")
+    def bars(
+        provider: str,
+        symbol: str,
+        interval: str = "1m",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        stored: bool = False,
+        limit: int = Query(DEFAULT_SERIES_LIMIT, ge=1, le=MAX_SERIES_LIMIT),
+    ) -> dict[str, Any]:
+        try:
+            width = parse_interval(interval)
+        except AnalyticsError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if stored:
+            context: AppContext = app.state.context
+            instrument = context.instrument(provider, symbol)
+            if instrument is None:
+                raise HTTPException(status_code=404, detail=f"Unknown instrument: {provider}:{symbol}")
+            closed = context.storage.bars(instrument, width, limit=limit, start=start, end=end)
+            columns = {
+                "start_ns": [to_epoch_micros(bar.start) * 1000 for bar in closed],
+                "open": [bar.open for bar in closed],
+                "high": [bar.high for bar in closed],
+                "low": [bar.low for bar in closed],
+                "close": [bar.close for bar in closed],
+                "count": [bar.count for bar in closed],
+            }
+        else:
+            timestamps, prices = stored_series(provider, symbol, start, end, limit)
+            result = resample_ohlc(timestamps, prices, width)
+            columns = {
+                "start_ns": result.start_ns.tolist(),
+                "open": result.open.tolist(),
+                "high": result.high.tolist(),
+                "low": result.low.tolist(),
+                "close": result.close.tolist(),
+                "count": result.count.tolist(),
+            }
+        return {"provider": provider, "symbol": symbol, "interval": interval, **columns}
+
+    @app.get("/prices/stats")
+    def stats(
+        provider: str,
+        symbol: str,
+        window: int = 60,
+        interval: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int = Query(DEFAULT_SERIES_LIMIT, ge=1, le=MAX_SERIES_LIMIT),
+    ) -> dict[str, Any]:
+        timestamps, prices = stored_series(provider, symbol, start, end, limit)
+        try:
+            if interval is not None:
+                result = resample_ohlc(timestamps, prices, parse_interval(interval))
+                timestamps, prices = result.start_ns, result.close
+            returns = simple_returns(prices)
+            mean = rolling_mean(prices, window)
+            volatility = rolling_volatility(prices, window)
+        except AnalyticsError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {
+            "provider": provider,
+            "symbol": symbol,
+            "window": window,
+            "interval": interval,
+            "timestamps_ns": timestamps.tolist(),
+            "returns": returns.tolist(),
+            "rolling_mean": mean.tolist(),
+            "rolling_volatility": volatility.tolist(),
+        }
+
+    @app.get("/prices/export")
+    def export(
+        provider: str,
+        symbols: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        export_format: str = Query("ndjson", alias="format"),
+    ) -> Any:
+        """Stream stored quotes for one or many instruments, merged in time order."""
+
+        if export_format not in _EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {export_format}")
+        context: AppContext = app.state.context
+        if symbols:
+            requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+        else:
+            requested = [symbol for symbol, name in context.instruments if name == provider]
+        instruments = [context.instrument(provider, symbol) for symbol in requested]
+        unknown = [symbol for symbol, instrument in zip(requested, instruments) if instrument is None]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown {provider} symbols: {', '.join(unknown)}")
+
+        storage = context.storage
+        quotes = heapq.merge(
+            *(storage.iter_history(instrument, start=start, end=end) for instrument in instruments),
+            key=lambda quote: quote.timestamp,
+        )
+        encode, media_type = _EXPORT_FORMATS[export_format]
+        return StreamingResponse(
+            encode(quotes),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{provider}-export.{export_format}"'},
+        )
+
+    @app.post("/alerts", status_code=201)
+    async def create_alert(rule: AlertRequest) -> dict[str, Any]:
+        """Create a rule, evaluated only while this process runs the embedded scheduler."""
+
+        context: AppContext = app.state.context
+        if context.instrument(rule.provider, rule.symbol) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown instrument: {rule.provider}:{rule.symbol}")
+        try:
+            created = alerts.add(rule.provider, rule.symbol, rule.kind, rule.threshold, rule.cooldown_seconds)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return created.as_dict()
+
+    @app.get("/alerts")
+    async def list_alerts(provider: str | None = None, symbol: str | None = None) -> dict[str, Any]:
+        return {"alerts": [rule.as_dict() for rule in alerts.rules(provider, symbol)]}
+
+    @app.get("/alerts/{rule_id}")
+    async def get_alert(rule_id: int) -> dict[str, Any]:
+        rule = alerts.get(rule_id)
+        if rule is None:
+            raise HTTPException(status_code=404, detail=f"Unknown alert: {rule_id}")
+        return rule.as_dict()
+
+    @app.delete("/alerts/{rule_id}")
+    async def delete_alert(rule_id: int) -> dict[str, Any]:
+        rule = alerts.remove(rule_id)
+        if rule is None:
+            raise HTTPException(status_code=404, detail=f"Unknown alert: {rule_id}")
+        return rule.as_dict()
+
+    @app.get("/prices/stream")
+    async def stream(
+        provider: str | None = None,
+        symbols: str | None = None,
+        # Bounded so a client cannot make the server spin on keep-alives (or never send one).
+        heartbeat: float = Query(15.0, ge=1.0, le=300.0),
+    ) -> Any:
+        try:
+            subscription = _subscribe(bus, provider, symbols)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+        async def events() -> AsyncIterator[str]:
+            try:
+                while True:
+                    payloads = await subscription.get(timeout=heartbeat)
+                    if payloads:
+                        yield f"data: [{','.join(payloads)}]\n\n"
+                    else:
+                        yield ": keep-alive\n\n"
+            finally:
+                bus.unsubscribe(subscription)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.websocket("/prices/ws")
+    async def stream_ws(websocket: WebSocket, provider: str | None = None, symbols: str | None = None) -> None:
+        try:
+            subscription = _subscribe(bus, provider, symbols)
+        except ValueError as exc:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc)) from exc
+        await websocket.accept()
+        # Watch for the client going away while we wait on quotes.
+        receiver = asyncio.ensure_future(websocket.receive())
+        pending = asyncio.ensure_future(subscription.get())
+        try:
+            while True:
+                done, _ = await asyncio.wait({pending, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if receiver in done:
+                    if receiver.result().get("type") == "websocket.disconnect":
+                        return
+                    receiver = asyncio.ensure_future(websocket.receive())
+                if pending in done:
+                    await websocket.send_text(f"[{','.join(pending.result())}]")
+                    pending = asyncio.ensure_future(subscription.get())
+        except WebSocketDisconnect:
+            return
         finally:
-            close = getattr(provider_instance, "close", None)
-            if close is not None:
-                await close()
+            receiver.cancel()
+            pending.cancel()
+            bus.unsubscribe(subscription)
 
+    @app.get("/prices/recent")
+    def recent(provider: str, symbol: str, limit: int | None = None) -> dict[str, Any]:
+        timestamps, prices = store.recent(provider, symbol, limit=limit)
         return {
-            "symbol": quote.instrument.symbol,
-            "price": quote.price,
-            "timestamp": quote.timestamp.isoformat(),
-            "currency": quote.currency,
-            "provider": quote.provider,
+            "provider": provider,
+            "symbol": symbol,
+            "timestamps_us": timestamps.tolist(),
+            "prices": prices.tolist(),
         }
 
     return app
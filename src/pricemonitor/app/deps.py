@@ -1,11 +1,52 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
 
 from pricemonitor.config.loader import load_app_config
-from pricemonitor.storage.csv import CsvStorage
+from pricemonitor.config.models import AppConfig
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.providers.base import Provider
+from pricemonitor.providers.registry import ProviderPool
+from pricemonitor.scheduler.runner import build_instruments
+from pricemonitor.storage.base import Storage
+from pricemonitor.storage.registry import build_storage
 
 
-def load_storage(config_dir: Path) -> CsvStorage:
+def load_storage(config_dir: Path) -> Storage:
     config = load_app_config(config_dir)
-    return CsvStorage(Path(config.storage.root))
+    return build_storage(config.storage, write_behind=False)
+
+
+@dataclass
+class AppContext:
+    """Config and providers parsed once at startup and shared by all requests."""
+
+    config_dir: Path
+    config: AppConfig
+    providers: ProviderPool
+    instruments: dict[tuple[str, str], Instrument]
+    storage: Storage
+
+    @classmethod
+    def load(cls, config_dir: Path) -> AppContext:
+        config = load_app_config(config_dir)
+        return cls(
+            config_dir=config_dir,
+            config=config,
+            providers=ProviderPool(config.providers),
+            instruments=build_instruments(config),
+            storage=build_storage(config.storage, write_behind=False),
+        )
+
+    def provider(self, name: str) -> Provider:
+        return self.providers.get(name)
+
+    def instrument(self, provider: str, symbol: str) -> Instrument | None:
+        return self.instruments.get((symbol, provider))
+
+    async def close(self) -> None:
+        await self.providers.close()
+        close = getattr(self.storage, "close", None)
+        if close is not None:
+            close()
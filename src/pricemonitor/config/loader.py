@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import Any
 
 from pricemonitor.config.models import (
+    DERIVED_PROVIDER,
     AppConfig,
+    DerivedConfig,
+    DerivedLeg,
+    FilterConfig,
     InstrumentConfig,
     ProviderConfig,
     ScheduleConfig,
     StorageConfig,
 )
 from pricemonitor.models.instruments import AssetClass
+from pricemonitor.utils.time import parse_duration
 
 try:
     import yaml  # type: ignore
@@ -28,12 +34,98 @@ def load_yaml(path: Path) -> dict[str, Any]:
     if not path.exists():
         raise ConfigError(f"Missing config file: {path}")
     with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+        try:
+            data = yaml.safe_load(handle) or {}
+        except yaml.YAMLError as exc:
+            raise ConfigError(f"Invalid YAML in {path}: {exc}") from exc
     if not isinstance(data, dict):
         raise ConfigError(f"Invalid config format in {path}")
     return data
 
 
+def _filter_config(data: dict[str, Any] | None) -> FilterConfig | None:
+    if not data:
+        return None
+    config = FilterConfig(
+        absolute=float(data.get("absolute", 0.0)),
+        relative=float(data.get("relative", 0.0)),
+        heartbeat_seconds=float(data.get("heartbeat_seconds", 60.0)),
+    )
+    if config.absolute < 0 or config.relative < 0 or config.heartbeat_seconds <= 0:
+        raise ConfigError(f"Invalid filter settings: {data}")
+    return config
+
+
+_DERIVED_OPERATOR = re.compile(r"\s*([*/])\s*")
+
+
+def _derived_legs(symbol: str, expression: str) -> tuple[DerivedLeg, ...]:
+    """Parse ``"binance:ETHUSDT / binance:BTCUSDT"``; a bare symbol names another derived instrument."""
+
+    parts = _DERIVED_OPERATOR.split(expression.strip())
+    legs: list[DerivedLeg] = []
+    for index in range(0, len(parts), 2):
+        term = parts[index].strip()
+        if not term:
+            raise ConfigError(f"Invalid expression for derived instrument {symbol}: {expression!r}")
+        provider, _, name = term.rpartition(":")
+        power = -1 if index and parts[index - 1] == "/" else 1
+        legs.append(DerivedLeg(provider=provider or DERIVED_PROVIDER, symbol=name, power=power))
+    return tuple(legs)
+
+
+def _derived_config(item: dict[str, Any]) -> DerivedConfig:
+    symbol = item["symbol"]
+    quote = item.get("quote")
+    if not quote:
+        raise ConfigError(f"Derived instrument {symbol} needs a quote currency")
+    max_skew = item.get("max_skew_seconds")
+    return DerivedConfig(
+        symbol=symbol,
+        asset_class=AssetClass(item["asset_class"]),
+        legs=_derived_legs(symbol, str(item["expression"])),
+        quote=quote,
+        base=item.get("base"),
+        name=item.get("name"),
+        max_skew_seconds=float(max_skew) if max_skew is not None else None,
+    )
+
+
+def _validate_derived(derived: list[DerivedConfig], instruments: list[InstrumentConfig]) -> None:
+    known = {(item.provider, item.symbol) for item in instruments}
+    definitions = {item.symbol: item for item in derived}
+    if len(definitions) != len(derived):
+        raise ConfigError("Derived instrument symbols must be unique")
+    for item in derived:
+        if any(symbol == item.symbol for _, symbol in known):
+            raise ConfigError(f"Derived instrument {item.symbol} clashes with a configured instrument")
+        for leg in item.legs:
+            if leg.provider == DERIVED_PROVIDER:
+                if leg.symbol not in definitions:
+                    raise ConfigError(f"Derived instrument {item.symbol} references unknown derived {leg.symbol}")
+            elif (leg.provider, leg.symbol) not in known:
+                raise ConfigError(f"Derived instrument {item.symbol} references unknown {leg.provider}:{leg.symbol}")
+
+    # Depth-first search for cycles among derived-on-derived references.
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(symbol: str) -> None:
+        if symbol in done:
+            return
+        if symbol in visiting:
+            raise ConfigError(f"Derived instruments form a cycle through {symbol}")
+        visiting.add(symbol)
+        for leg in definitions[symbol].legs:
+            if leg.provider == DERIVED_PROVIDER:
+                visit(leg.symbol)
+        visiting.discard(symbol)
+        done.add(symbol)
+
+    for symbol in definitions:
+        visit(symbol)
+
+
 def load_app_config(config_dir: Path) -> AppConfig:
     sources = load_yaml(config_dir / "sources.yaml")
     schedules = load_yaml(config_dir / "schedules.yaml")
@@ -57,24 +149,50 @@ def load_app_config(config_dir: Path) -> AppConfig:
         for item in (sources.get("instruments") or [])
     ]
 
+    if DERIVED_PROVIDER in providers:
+        raise ConfigError(f"Provider name {DERIVED_PROVIDER!r} is reserved for derived instruments")
+    derived = [_derived_config(item) for item in (sources.get("derived") or [])]
+    _validate_derived(derived, instruments)
+
     schedule_items = [
         ScheduleConfig(
             symbol=item["symbol"],
             provider=item["provider"],
             interval_seconds=int(item["interval_seconds"]),
+            filter=_filter_config(item.get("filter")),
         )
         for item in (schedules.get("schedules") or [])
     ]
+    for item in schedule_items:
+        if item.interval_seconds <= 0:
+            raise ConfigError(f"Schedule {item.provider}:{item.symbol} interval_seconds must be positive")
+
+    try:
+        bar_intervals = sorted({parse_duration(item) for item in (schedules.get("bars") or [])})
+    except ValueError as exc:
+        raise ConfigError(f"Invalid bar interval in schedules.yaml: {exc}") from exc
 
     storage_cfg = storage.get("storage") or {}
     storage_config = StorageConfig(
         backend=storage_cfg.get("backend", "csv"),
         root=storage_cfg.get("root", "data"),
+        write_behind=bool(storage_cfg.get("write_behind", True)),
+        flush_max_quotes=int(storage_cfg.get("flush_max_quotes", 500)),
+        flush_interval_seconds=float(storage_cfg.get("flush_interval_seconds", 0.5)),
+        max_pending_quotes=int(storage_cfg.get("max_pending_quotes", 100_000)),
+        partition=storage_cfg.get("partition"),
+        shards=int(storage_cfg.get("shards", 1)),
     )
+    if storage_config.shards < 1:
+        raise ConfigError("storage.shards must be at least 1")
+    if storage_config.max_pending_quotes < storage_config.flush_max_quotes:
+        raise ConfigError("storage.max_pending_quotes must be at least flush_max_quotes")
 
     return AppConfig(
         providers=providers,
         instruments=instruments,
         schedules=schedule_items,
         storage=storage_config,
+        bar_intervals=bar_intervals,
+        derived=derived,
     )
@@ -24,17 +24,58 @@ class InstrumentConfig:
     name: str | None = None
 
 
+DERIVED_PROVIDER = "derived"
+
+
+@dataclass(frozen=True)
+class DerivedLeg:
+    """One factor of a derived price: ``provider:symbol`` raised to ``power`` (1 or -1)."""
+
+    provider: str
+    symbol: str
+    power: int = 1
+
+
+@dataclass(frozen=True)
+class DerivedConfig:
+    """Instrument priced as a product/quotient of other instruments' latest quotes."""
+
+    symbol: str
+    asset_class: AssetClass
+    legs: tuple[DerivedLeg, ...]
+    quote: str
+    base: str | None = None
+    name: str | None = None
+    max_skew_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class FilterConfig:
+    """Change-suppression rule applied before quotes are written to storage."""
+
+    absolute: float = 0.0
+    relative: float = 0.0
+    heartbeat_seconds: float = 60.0
+
+
 @dataclass(frozen=True)
 class ScheduleConfig:
     symbol: str
     provider: str
     interval_seconds: int
+    filter: FilterConfig | None = None
 
 
 @dataclass(frozen=True)
 class StorageConfig:
     backend: str
     root: str
+    write_behind: bool = True
+    flush_max_quotes: int = 500
+    flush_interval_seconds: float = 0.5
+    max_pending_quotes: int = 100_000
+    partition: str | None = None
+    shards: int = 1
 
 
 @dataclass(frozen=True)
@@ -43,3 +84,5 @@ class AppConfig:
     instruments: list[InstrumentConfig]
     schedules: list[ScheduleConfig]
     storage: StorageConfig
+    bar_intervals: list[int] = field(default_factory=list)
+    derived: list[DerivedConfig] = field(default_factory=list)
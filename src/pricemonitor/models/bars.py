@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .instruments import Instrument
+
+
+@dataclass(frozen=True)
+class Bar:
+    """Closed OHLC bar with the running mean/variance of prices inside it."""
+
+    instrument: Instrument
+    provider: str
+    currency: str
+    interval_seconds: int
+    start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
+    mean: float
+    variance: float
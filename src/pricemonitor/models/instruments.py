@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from enum import Enum
+from weakref import WeakValueDictionary
 
 
 class AssetClass(str, Enum):
@@ -27,3 +28,14 @@ class Instrument:
         if self.base and self.quote:
             return f"{self.base}/{self.quote}"
         return self.symbol
+
+
+# Weak values keyed by field tuples (which do not reference the instrument), so an
+# instrument stays canonical only while something such as a poll task holds it.
+_interned: WeakValueDictionary[tuple, Instrument] = WeakValueDictionary()
+
+
+def intern_instrument(instrument: Instrument) -> Instrument:
+    """Return the canonical shared instance equal to ``instrument``."""
+
+    return _interned.setdefault(astuple(instrument), instrument)
@@ -7,7 +7,7 @@ from typing import Any
 from .instruments import Instrument
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Quote:
     instrument: Instrument
     price: float
@@ -15,3 +15,75 @@ class Quote:
     currency: str
     provider: str
     extra: dict[str, Any] = field(default_factory=dict)
+
+
+# Bypasses the frozen checks; only for filling in a Tick under construction.
+_set = object.__setattr__
+
+
+class Tick(Quote):
+    """Allocation-light ``Quote`` used on the ingest hot path.
+
+    It points at a shared (interned) ``Instrument``, only allocates ``extra``
+    when first accessed and skips the frozen dataclass ``__setattr__`` checks
+    on construction; afterwards it is as immutable as any ``Quote``. Being a ``Quote`` subclass, it works with
+    ``isinstance``, ``dataclasses.replace`` and ``asdict``; ``as_quote``
+    materialises a plain ``Quote`` when an exact type is needed.
+    """
+
+    __slots__ = ("_extra",)
+
+    def __init__(
+        self,
+        instrument: Instrument,
+        price: float,
+        timestamp: datetime,
+        currency: str,
+        provider: str,
+        extra: dict[str, Any] | None = None,
+    ) -> None:
+        _set(self, "instrument", instrument)
+        _set(self, "price", price)
+        _set(self, "timestamp", timestamp)
+        _set(self, "currency", currency)
+        _set(self, "provider", provider)
+        _set(self, "_extra", extra)
+
+    @property
+    def extra(self) -> dict[str, Any]:
+        if self._extra is None:
+            _set(self, "_extra", {})
+        return self._extra
+
+    def as_quote(self) -> Quote:
+        return Quote(
+            instrument=self.instrument,
+            price=self.price,
+            timestamp=self.timestamp,
+            currency=self.currency,
+            provider=self.provider,
+            extra=dict(self._extra) if self._extra else {},
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Tick, Quote)):
+            return (
+                self.instrument == other.instrument
+                and self.price == other.price
+                and self.timestamp == other.timestamp
+                and self.currency == other.currency
+                and self.provider == other.provider
+                and (self._extra or {}) == other.extra
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple:
+        return (Tick, (self.instrument, self.price, self.timestamp, self.currency, self.provider, self._extra))
+
+    def __repr__(self) -> str:
+        return (
+            f"Tick(instrument={self.instrument!r}, price={self.price!r}, timestamp={self.timestamp!r}, "
+            f"currency={self.currency!r}, provider={self.provider!r})"
+        )
@@ -12,6 +12,18 @@ class ProviderError(RuntimeError):
     """Base error for provider failures."""
 
 
+class ProviderRequestError(ProviderError):
+    """The provider rejected the request itself (a 4xx answer), so it says nothing about provider health."""
+
+
+class UnknownSymbolError(ProviderRequestError):
+    """The provider does not list one or more of the requested symbols."""
+
+    def __init__(self, message: str, symbols: Iterable[str] = ()) -> None:
+        super().__init__(message)
+        self.symbols = tuple(symbols)
+
+
 @dataclass(frozen=True)
 class ProviderCapabilities:
     supports_realtime: bool = True
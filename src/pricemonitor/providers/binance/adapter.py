@@ -1,65 +1,168 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, Iterator
 
-from pricemonitor.models.instruments import AssetClass, Instrument
-from pricemonitor.models.quotes import Quote
-from pricemonitor.providers.base import HistoryQuery, ProviderCapabilities, ProviderError
+from pricemonitor.models.instruments import AssetClass, Instrument, intern_instrument
+from pricemonitor.models.quotes import Quote, Tick
+from pricemonitor.providers.base import HistoryQuery, ProviderCapabilities, ProviderError, UnknownSymbolError
 from pricemonitor.providers.binance.client import BinanceClient
+from pricemonitor.utils.log import get_logger, log_event
+from pricemonitor.utils.metrics import ERRORS
+from pricemonitor.utils.ratelimit import WeightLimiter
 from pricemonitor.utils.time import utc_now
 
+logger = get_logger(__name__)
+
 
 class BinanceProvider:
-    """Adapter for Binance spot prices."""
+    """Adapter for Binance spot prices.
+
+    ``fetch_quotes`` asks for many symbols per request. Binance rejects the
+    whole request if one symbol is unknown, so a rejected batch is bisected
+    until the offending symbols are isolated; those are quarantined (left out
+    of batches) for ``quarantine_seconds`` and the rest are still priced.
+    Symbols Binance leaves out of an otherwise good answer are logged and
+    counted as errors, as are the symbols of a chunk whose request fails
+    while other chunks of the same fetch succeed.
+    """
 
     name = "binance"
     capabilities = ProviderCapabilities(supports_realtime=True, supports_historical=False)
+    # A multi-symbol ticker request costs weight 4 however many symbols it
+    # names, so batches are capped only by the URL: each symbol adds its length
+    # plus 9 characters of URL-encoded quotes and comma to the query string,
+    # which is kept within 6000 characters (servers commonly allow 8 KB).
+    max_batch_size = 400
+    max_query_length = 6000
+    # BinanceClient bounds and times its own requests (see ``upstream_request``).
+    times_requests = True
 
-    def __init__(self, client: BinanceClient | None = None, default_quote: str = "USDT") -> None:
+    def __init__(
+        self,
+        client: BinanceClient | None = None,
+        default_quote: str = "USDT",
+        quarantine_seconds: float = 300.0,
+    ) -> None:
         self.client = client or BinanceClient()
         self.default_quote = default_quote
+        self.quarantine_seconds = quarantine_seconds
+        self._quarantined: dict[str, float] = {}
+
+    @property
+    def limiter(self) -> WeightLimiter | None:
+        return self.client.limiter
 
     async def get_latest_price(self, symbol: str) -> Quote:
         price = await self.client.fetch_price(symbol)
-        instrument = Instrument(
-            symbol=symbol,
-            asset_class=AssetClass.CRYPTO,
-            quote=self.default_quote,
-        )
-        return Quote(
-            instrument=instrument,
-            price=price,
-            timestamp=utc_now(),
-            currency=self.default_quote,
-            provider=self.name,
-        )
+        return self.make_quote(self._instrument_for(symbol), price, utc_now())
 
     async def get_history(self, query: HistoryQuery) -> list[Quote]:
         raise ProviderError(f"Binance history not implemented yet: {query.symbol}")
 
     async def fetch_quote(self, instrument: Instrument) -> Quote:
-        quote = await self.get_latest_price(instrument.symbol)
-        if instrument.quote and instrument.quote != quote.currency:
-            quote = Quote(
-                instrument=quote.instrument,
-                price=quote.price,
-                timestamp=quote.timestamp,
-                currency=instrument.quote,
-                provider=quote.provider,
-            )
-        return Quote(
-            instrument=instrument,
-            price=quote.price,
-            timestamp=quote.timestamp,
-            currency=quote.currency,
-            provider=quote.provider,
-        )
-
-    async def fetch_quotes(self, instruments: list[Instrument]) -> list[Quote]:
+        try:
+            price = await self.client.fetch_price(instrument.symbol)
+        except UnknownSymbolError:
+            self._quarantine(instrument.symbol)
+            raise
+        return self.make_quote(instrument, price, utc_now())
+
+    async def fetch_quotes(self, instruments: Iterable[Instrument]) -> list[Quote]:
+        instruments = self._admitted(instruments)
         if not instruments:
             return []
-        tasks = [self.fetch_quote(instrument) for instrument in instruments]
-        return list(await asyncio.gather(*tasks))
+        if len(instruments) == 1:
+            return [await self.fetch_quote(instruments[0])]
+        chunks = list(self._chunks(instruments))
+        results = await asyncio.gather(*(self._fetch_batch(chunk) for chunk in chunks), return_exceptions=True)
+        failed = [(chunk, result) for chunk, result in zip(chunks, results) if isinstance(result, BaseException)]
+        for _, error in failed:
+            if not isinstance(error, Exception):
+                raise error
+        if len(failed) == len(chunks):
+            raise failed[0][1]
+        # Keep what the other chunks priced; only the failed chunks' symbols are reported.
+        for chunk, error in failed:
+            ERRORS.labels(self.name, type(error).__name__).inc()
+            log_event(
+                logger,
+                logging.WARNING,
+                "binance batch failed",
+                symbols=",".join(instrument.symbol for instrument in chunk),
+                error=str(error),
+            )
+        return [quote for result in results if not isinstance(result, BaseException) for quote in result]
+
+    @property
+    def quarantined(self) -> list[str]:
+        """Symbols currently left out of batch requests."""
+
+        return sorted(self._quarantined)
+
+    def _chunks(self, instruments: list[Instrument]) -> Iterator[list[Instrument]]:
+        chunk: list[Instrument] = []
+        length = 0
+        for instrument in instruments:
+            size = len(instrument.symbol) + 9
+            if chunk and (len(chunk) >= self.max_batch_size or length + size > self.max_query_length):
+                yield chunk
+                chunk, length = [], 0
+            chunk.append(instrument)
+            length += size
+        if chunk:
+            yield chunk
+
+    async def _fetch_batch(self, instruments: list[Instrument]) -> list[Quote]:
+        try:
+            prices = await self.client.fetch_prices(instrument.symbol for instrument in instruments)
+        except UnknownSymbolError:
+            if len(instruments) == 1:
+                self._quarantine(instruments[0].symbol)
+                return []
+            middle = len(instruments) // 2
+            left, right = await asyncio.gather(
+                self._fetch_batch(instruments[:middle]),
+                self._fetch_batch(instruments[middle:]),
+            )
+            return left + right
+        timestamp = utc_now()
+        quotes: list[Quote] = []
+        missing: list[str] = []
+        for instrument in instruments:
+            price = prices.get(instrument.symbol)
+            if price is None:
+                missing.append(instrument.symbol)
+                continue
+            quotes.append(self.make_quote(instrument, price, timestamp))
+        if missing:
+            ERRORS.labels(self.name, "MissingSymbol").inc(len(missing))
+            log_event(logger, logging.WARNING, "binance symbols missing from response", symbols=",".join(missing))
+        return quotes
+
+    def _admitted(self, instruments: Iterable[Instrument]) -> list[Instrument]:
+        if not self._quarantined:
+            return list(instruments)
+        now = time.monotonic()
+        for symbol, until in list(self._quarantined.items()):
+            if until <= now:
+                del self._quarantined[symbol]
+        return [instrument for instrument in instruments if instrument.symbol not in self._quarantined]
+
+    def _quarantine(self, symbol: str) -> None:
+        self._quarantined[symbol] = time.monotonic() + self.quarantine_seconds
+        ERRORS.labels(self.name, "UnknownSymbolError").inc()
+        log_event(logger, logging.WARNING, "binance symbol quarantined", symbol=symbol, seconds=self.quarantine_seconds)
+
+    def make_quote(self, instrument: Instrument, price: float, timestamp: datetime) -> Tick:
+        return Tick(instrument, price, timestamp, instrument.quote or self.default_quote, self.name)
+
+    def _instrument_for(self, symbol: str) -> Instrument:
+        # Symbols here come from API callers, so nothing is cached per symbol; interning is weak.
+        return intern_instrument(Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO, quote=self.default_quote))
 
     async def close(self) -> None:
         await self.client.close()
@@ -1,8 +1,29 @@
 from __future__ import annotations
 
+import json
+from typing import Iterable
+
 import httpx
 
-from pricemonitor.providers.base import ProviderError
+from pricemonitor.providers.base import ProviderError, ProviderRequestError, UnknownSymbolError
+from pricemonitor.providers.resilience import upstream_request
+from pricemonitor.utils.ratelimit import WeightLimiter
+
+# Request weights of /api/v3/ticker/price and Binance's default REQUEST_WEIGHT limit.
+SINGLE_TICKER_WEIGHT = 2
+MULTI_TICKER_WEIGHT = 4
+DEFAULT_WEIGHT_LIMIT = 6000
+
+# Binance error code for a symbol it does not list.
+INVALID_SYMBOL_CODE = -1121
+
+
+class RateLimitedError(ProviderRequestError):
+    """Binance answered 429 (rate limited) or 418 (IP banned)."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class BinanceClient:
@@ -14,21 +35,88 @@ class BinanceClient:
         api_secret: str | None = None,
         base_url: str = "https://api.binance.com",
         timeout: float = 10.0,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limiter: WeightLimiter | None = None,
     ) -> None:
         self.api_key = api_key
         self.api_secret = api_secret
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+        self.limiter = limiter
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=limits,
+            transport=transport,
+        )
 
     async def fetch_price(self, symbol: str) -> float:
+        data = await self._get_ticker({"symbol": symbol}, [symbol], SINGLE_TICKER_WEIGHT)
+        return self._parse_price(data, symbol)
+
+    async def fetch_prices(self, symbols: Iterable[str]) -> dict[str, float]:
+        """Fetch prices for many symbols with one multi-symbol ticker request."""
+
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        label = ",".join(symbols)
+        data = await self._get_ticker(
+            {"symbols": json.dumps(symbols, separators=(",", ":"))},
+            symbols,
+            MULTI_TICKER_WEIGHT,
+        )
+        if not isinstance(data, list):
+            raise ProviderError(f"Binance batch response is not a list for {label}: {data}")
+        prices: dict[str, float] = {}
+        for item in data:
+            symbol = item.get("symbol")
+            if symbol is None:
+                raise ProviderError(f"Binance batch response missing symbol: {item}")
+            prices[symbol] = self._parse_price(item, symbol)
+        return prices
+
+    async def _get_ticker(self, params: dict[str, str], symbols: list[str], weight: int):
+        label = ",".join(symbols)
+        if self.limiter is not None:
+            await self.limiter.acquire(weight)
         try:
-            response = await self._client.get("/api/v3/ticker/price", params={"symbol": symbol})
+            # Only the request itself is timed and bounded, not the wait for weight above.
+            async with upstream_request():
+                response = await self._client.get("/api/v3/ticker/price", params=params)
+            self._observe(response)
+            if response.status_code in (418, 429):
+                retry_after = _retry_after(response)
+                raise RateLimitedError(
+                    f"Binance rate limit for {label}: {response.status_code} (retry after {retry_after}s)",
+                    retry_after=retry_after,
+                )
+            if 400 <= response.status_code < 500:
+                raise _request_error(response, label, symbols)
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
-            raise ProviderError(f"Binance HTTP error for {symbol}: {exc.response.status_code}") from exc
+            raise ProviderError(f"Binance HTTP error for {label}: {exc.response.status_code}") from exc
         except httpx.HTTPError as exc:
-            raise ProviderError(f"Binance network error for {symbol}: {exc}") from exc
+            raise ProviderError(f"Binance network error for {label}: {exc}") from exc
+        return response.json()
+
+    def _observe(self, response: httpx.Response) -> None:
+        if self.limiter is None:
+            return
+        used = response.headers.get("x-mbx-used-weight-1m") or response.headers.get("x-mbx-used-weight")
+        try:
+            used_weight = float(used) if used is not None else None
+        except ValueError:
+            used_weight = None
+        limited = response.status_code in (418, 429)
+        self.limiter.observe(used_weight, _retry_after(response) if limited else None, limited=limited)
 
-        data = response.json()
+    @staticmethod
+    def _parse_price(data: dict, symbol: str) -> float:
         price = data.get("price")
         if price is None:
             raise ProviderError(f"Binance response missing price for {symbol}: {data}")
@@ -39,3 +127,25 @@ class BinanceClient:
 
     async def close(self) -> None:
         await self._client.aclose()
+
+
+def _request_error(response: httpx.Response, label: str, symbols: list[str]) -> ProviderRequestError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    code = body.get("code") if isinstance(body, dict) else None
+    message = body.get("msg", "") if isinstance(body, dict) else ""
+    if code == INVALID_SYMBOL_CODE:
+        return UnknownSymbolError(f"Binance does not list {label}: {message}", symbols=symbols)
+    return ProviderRequestError(f"Binance rejected request for {label}: {response.status_code} {message}".rstrip())
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.providers.binance.adapter import BinanceProvider
+from pricemonitor.utils.backoff import exponential_backoff
+from pricemonitor.utils.log import get_logger, log_event
+from pricemonitor.utils.metrics import ERRORS
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    from websockets.exceptions import WebSocketException
+except ImportError:  # pragma: no cover - optional dependency
+    ws_connect = None
+    WebSocketException = OSError
+
+QuoteCallback = Callable[[list[Quote]], None]
+
+logger = get_logger(__name__)
+
+
+class _Coalescer:
+    """Collects quotes parsed during one event-loop pass and delivers them as one batch.
+
+    Frames already buffered on a connection are read back to back without
+    yielding to the loop, so a single ``call_soon`` flush picks up the burst
+    from every connection.
+    """
+
+    def __init__(self, deliver: QuoteCallback) -> None:
+        self.deliver = deliver
+        self.quotes: list[Quote] = []
+        self._handle: asyncio.Handle | None = None
+
+    def add(self, quote: Quote) -> None:
+        self.quotes.append(quote)
+        if self._handle is None:
+            self._handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self.quotes:
+            quotes, self.quotes = self.quotes, []
+            self.deliver(quotes)
+
+
+class BinanceStream:
+    """Realtime Binance trade feed multiplexed over combined WebSocket streams.
+
+    Symbols are split across connections of at most ``max_streams`` streams.
+    Each connection reconnects with jittered exponential backoff; the stream
+    URL carries the subscription, so reconnecting resubscribes. ``covers``
+    reports whether a symbol's connection is currently live, which the
+    scheduler uses to fall back to REST polling while a connection is down.
+    Malformed frames are logged, counted and skipped.
+    """
+
+    def __init__(
+        self,
+        provider: BinanceProvider,
+        instruments: Iterable[Instrument],
+        base_url: str = "wss://stream.binance.com:9443",
+        channel: str = "aggTrade",
+        max_streams: int = 200,
+        connect: Callable[..., Any] | None = None,
+    ) -> None:
+        connect = connect or ws_connect
+        if connect is None:
+            raise RuntimeError("websockets is required for Binance streaming.")
+        self.provider = provider
+        self.instruments = {instrument.symbol: instrument for instrument in instruments}
+        self.base_url = base_url.rstrip("/")
+        self.channel = channel
+        self.max_streams = max_streams
+        self._connect = connect
+        self._live: set[str] = set()
+
+    def covers(self, symbol: str) -> bool:
+        return symbol in self._live
+
+    @property
+    def healthy(self) -> bool:
+        return len(self._live) == len(self.instruments)
+
+    async def run(self, deliver: QuoteCallback) -> None:
+        symbols = list(self.instruments)
+        chunks = [symbols[start : start + self.max_streams] for start in range(0, len(symbols), self.max_streams)]
+        batch = _Coalescer(deliver)
+        try:
+            await asyncio.gather(*(self._run_connection(chunk, batch) for chunk in chunks))
+        finally:
+            batch.flush()
+
+    def url_for(self, symbols: list[str]) -> str:
+        streams = "/".join(f"{symbol.lower()}@{self.channel}" for symbol in symbols)
+        return f"{self.base_url}/stream?streams={streams}"
+
+    async def _run_connection(self, symbols: list[str], batch: _Coalescer) -> None:
+        url = self.url_for(symbols)
+        attempt = 0
+        while True:
+            try:
+                async with self._connect(url, open_timeout=10) as connection:
+                    attempt = 0
+                    self._live.update(symbols)
+                    async for message in connection:
+                        quote = self.parse(message)
+                        if quote is not None:
+                            batch.add(quote)
+            except (OSError, TimeoutError, WebSocketException) as exc:
+                ERRORS.labels(f"{self.provider.name}-stream", type(exc).__name__).inc()
+                log_event(logger, logging.WARNING, "binance stream error", symbols=len(symbols), error=str(exc))
+            finally:
+                self._live.difference_update(symbols)
+            await asyncio.sleep(exponential_backoff(attempt, base=1.0, cap=30.0))
+            attempt += 1
+
+    def parse(self, message: str | bytes) -> Quote | None:
+        """Turn one stream frame into a quote; ``None`` for other symbols, events or bad frames."""
+
+        try:
+            payload = json.loads(message)
+            data = payload.get("data", payload)
+            instrument = self.instruments.get(data.get("s", ""))
+            price = data.get("p", data.get("c"))
+            if instrument is None or price is None:
+                return None
+            event_ms = data.get("T") or data.get("E")
+            timestamp = datetime.fromtimestamp(event_ms / 1000, tz=timezone.utc)
+            return self.provider.make_quote(instrument, float(price), timestamp)
+        except (AttributeError, TypeError, ValueError, OverflowError, OSError) as exc:
+            ERRORS.labels(f"{self.provider.name}-stream", "malformed").inc()
+            log_event(logger, logging.WARNING, "binance stream malformed frame", error=str(exc), frame=str(message)[:200])
+            return None
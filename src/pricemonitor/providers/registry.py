@@ -1,33 +1,70 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterable
+
+import httpx
 
 from pricemonitor.config.loader import ConfigError, load_app_config
 from pricemonitor.config.models import ProviderConfig
 from pricemonitor.providers.base import Provider
 from pricemonitor.providers.binance.adapter import BinanceProvider
-from pricemonitor.providers.binance.client import BinanceClient
+from pricemonitor.providers.binance.client import DEFAULT_WEIGHT_LIMIT, BinanceClient
 from pricemonitor.providers.interactive_brokers.adapter import InteractiveBrokersProvider
+from pricemonitor.providers.resilience import CircuitBreaker, ResilientProvider
 from pricemonitor.providers.tradingview.adapter import TradingViewProvider
+from pricemonitor.utils.ratelimit import WeightLimiter
 
 
 class ProviderRegistryError(RuntimeError):
     """Raised when a provider cannot be constructed."""
 
 
-def build_provider(config: ProviderConfig) -> Provider:
-    if config.kind == "binance":
-        settings = config.settings or {}
+def build_provider(config: ProviderConfig, transport: httpx.AsyncBaseTransport | None = None) -> Provider:
+    """Build the adapter for ``config``, wrapped in a circuit breaker unless disabled.
+
+    ``transport`` replaces the HTTP transport of HTTP-based adapters (tests and
+    benchmarks point it at an in-process stand-in).
+    """
+
+    settings = config.settings or {}
+    provider = _build_adapter(config.kind, settings, transport)
+    if not settings.get("circuit_breaker", True):
+        return provider
+    return ResilientProvider(
+        provider,
+        breaker=CircuitBreaker(
+            failure_threshold=int(settings.get("failure_threshold", 5)),
+            reset_seconds=float(settings.get("reset_seconds", 5.0)),
+        ),
+        max_timeout=float(settings.get("timeout", 10.0)),
+        hedge=bool(settings.get("hedge", False)),
+    )
+
+
+def _build_adapter(kind: str, settings: dict, transport: httpx.AsyncBaseTransport | None = None) -> Provider:
+    if kind == "binance":
+        # Keep some headroom below the server limit for other clients on the same IP.
+        weight_limit = float(settings.get("weight_limit", DEFAULT_WEIGHT_LIMIT))
+        headroom = float(settings.get("weight_headroom", 0.9))
         client = BinanceClient(
             api_key=settings.get("api_key"),
             api_secret=settings.get("api_secret"),
+            timeout=float(settings.get("timeout", 10.0)),
+            max_connections=int(settings.get("max_connections", 20)),
+            transport=transport,
+            limiter=WeightLimiter(kind, weight_limit * headroom),
+        )
+        return BinanceProvider(
+            client=client,
+            default_quote=settings.get("default_quote", "USDT"),
+            quarantine_seconds=float(settings.get("quarantine_seconds", 300.0)),
         )
-        return BinanceProvider(client=client, default_quote=settings.get("default_quote", "USDT"))
-    if config.kind == "tradingview":
+    if kind == "tradingview":
         return TradingViewProvider()
-    if config.kind == "interactive_brokers":
+    if kind == "interactive_brokers":
         return InteractiveBrokersProvider()
-    raise ProviderRegistryError(f"Provider kind '{config.kind}' is not implemented yet.")
+    raise ProviderRegistryError(f"Provider kind '{kind}' is not implemented yet.")
 
 
 def build_providers(configs: dict[str, ProviderConfig]) -> dict[str, Provider]:
@@ -43,3 +80,39 @@ def build_provider_from_config(config_dir: Path, name: str) -> Provider:
         return build_provider(provider_config)
     except ProviderRegistryError as exc:
         raise ConfigError(f"Failed to construct provider {name}: {exc}") from exc
+
+
+class ProviderPool:
+    """Long-lived providers built on first use and shared across callers.
+
+    Keeping instances alive keeps their HTTP connection pools warm, so callers
+    avoid a fresh TCP/TLS handshake per request.
+    """
+
+    def __init__(self, configs: dict[str, ProviderConfig]) -> None:
+        self.configs = configs
+        self._providers: dict[str, Provider] = {}
+
+    def get(self, name: str) -> Provider:
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider
+        provider_config = self.configs.get(name)
+        if provider_config is None:
+            raise ConfigError(f"Unknown provider: {name}")
+        try:
+            provider = build_provider(provider_config)
+        except ProviderRegistryError as exc:
+            raise ConfigError(f"Failed to construct provider {name}: {exc}") from exc
+        self._providers[name] = provider
+        return provider
+
+    def items(self) -> Iterable[tuple[str, Provider]]:
+        return self._providers.items()
+
+    async def close(self) -> None:
+        providers, self._providers = self._providers, {}
+        for provider in providers.values():
+            close = getattr(provider, "close", None)
+            if close is not None:
+                await close()
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.providers.base import HistoryQuery, Provider, ProviderError, ProviderRequestError
+from pricemonitor.utils.backoff import exponential_backoff
+from pricemonitor.utils.metrics import CIRCUIT_STATE, HEDGED_REQUESTS
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(ProviderError):
+    """Raised without calling upstream while a provider's circuit is open."""
+
+
+class RequestBudget:
+    """Timeout for, and latencies of, the upstream requests behind one wrapped call."""
+
+    __slots__ = ("timeout", "samples")
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.samples: list[float] = []
+
+
+_request_budget: ContextVar[RequestBudget | None] = ContextVar("pricemonitor_request_budget", default=None)
+
+
+@asynccontextmanager
+async def upstream_request() -> AsyncIterator[None]:
+    """Bound and time one upstream request made on behalf of a ``ResilientProvider``.
+
+    Clients enter this after any rate-limit wait, so time spent queued for
+    request weight counts neither towards the timeout nor the latency window.
+    Outside a wrapped call it does nothing.
+    """
+
+    budget = _request_budget.get()
+    if budget is None:
+        yield
+        return
+    started = time.monotonic()
+    async with asyncio.timeout(budget.timeout):
+        yield
+    budget.samples.append(time.monotonic() - started)
+
+
+class CircuitState(int, Enum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies."""
+
+    def __init__(self, window: int = 256) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, quantile: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures.
+
+    While open, calls fail fast. After the reset delay one probe is let through
+    (half-open): success closes the circuit, failure re-opens it with a longer,
+    jittered delay.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 5.0, max_reset_seconds: float = 120.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.state is CircuitState.OPEN and time.monotonic() >= self.retry_at:
+            self.state = CircuitState.HALF_OPEN
+            self._probing = False
+        if self.state is CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            delay = exponential_backoff(self.trips, base=self.reset_seconds, cap=self.max_reset_seconds)
+            self.trips += 1
+            self.state = CircuitState.OPEN
+            self.retry_at = time.monotonic() + delay
+            self._probing = False
+
+    def release(self) -> None:
+        """Give up a half-open probe slot without recording an outcome (e.g. on cancellation)."""
+
+        self._probing = False
+
+
+class ResilientProvider:
+    """Provider wrapper adding a circuit breaker, adaptive timeouts and optional hedging.
+
+    The per-call timeout is ``timeout_factor`` times the observed p99 latency,
+    clamped to ``[min_timeout, max_timeout]``; until ``min_samples`` calls have
+    succeeded ``max_timeout`` applies. With ``hedge`` enabled, latest-price
+    reads that outlive the observed p95 get a second identical request and the
+    first result wins. Anything else is delegated to the wrapped provider, so
+    provider-specific helpers (``make_quote``, ``max_batch_size``) still work.
+
+    Providers that set ``times_requests`` wrap each upstream request in
+    ``upstream_request`` themselves; the timeout and latency samples then
+    cover only the requests, not waits for their rate limiter. A provider
+    exposing that ``limiter`` is never hedged while it has less than
+    ``hedge_headroom`` of its capacity to spare. Requests the provider rejects
+    as malformed (``ProviderRequestError``: 4xx, unknown symbols, rate limits)
+    do not count against the circuit.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        breaker: CircuitBreaker | None = None,
+        latency: LatencyTracker | None = None,
+        min_timeout: float = 0.5,
+        max_timeout: float = 10.0,
+        timeout_factor: float = 3.0,
+        min_samples: int = 20,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_headroom: float = 0.05,
+    ) -> None:
+        self.provider = provider
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency or LatencyTracker()
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.min_samples = min_samples
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_headroom = hedge_headroom
+        self._state = CIRCUIT_STATE.labels(provider.name)
+        self._state.set(CircuitState.CLOSED)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+
+    @property
+    def timeout(self) -> float:
+        if len(self.latency.samples) < self.min_samples:
+            return self.max_timeout
+        p99 = self.latency.percentile(0.99) or 0.0
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_factor))
+
+    async def get_latest_price(self, symbol: str) -> Quote:
+        return await self._call(lambda: self.provider.get_latest_price(symbol), hedge=self.hedge)
+
+    async def get_history(self, query: HistoryQuery) -> list[Quote]:
+        return await self._call(lambda: self.provider.get_history(query), adaptive=False)
+
+    async def fetch_quote(self, instrument: Instrument) -> Quote:
+        return await self._call(lambda: self.provider.fetch_quote(instrument), hedge=self.hedge)
+
+    async def fetch_quotes(self, instruments: Iterable[Instrument]) -> list[Quote]:
+        instruments = list(instruments)
+        return await self._call(lambda: self.provider.fetch_quotes(instruments), hedge=self.hedge)
+
+    async def close(self) -> None:
+        close = getattr(self.provider, "close", None)
+        if close is not None:
+            await close()
+
+    async def _call(self, call: Callable[[], Awaitable[T]], hedge: bool = False, adaptive: bool = True) -> T:
+        if not self.breaker.allow():
+            self._state.set(self.breaker.state)
+            raise CircuitOpenError(f"{self.provider.name} circuit open; failing fast")
+        timeout = self.timeout if adaptive else self.max_timeout
+        cooperative = getattr(self.provider, "times_requests", False)
+        budget = RequestBudget(timeout)
+        token = _request_budget.set(budget)
+        started = time.monotonic()
+        try:
+            pending = self._hedged(call) if hedge else call()
+            result = await (pending if cooperative else asyncio.wait_for(pending, timeout))
+        except TimeoutError as exc:
+            self.breaker.record_failure()
+            self._state.set(self.breaker.state)
+            raise ProviderError(f"{self.provider.name} timed out after {timeout:.2f}s") from exc
+        except ProviderRequestError:
+            self.breaker.release()
+            raise
+        except ProviderError:
+            self.breaker.record_failure()
+            self._state.set(self.breaker.state)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        finally:
+            _request_budget.reset(token)
+        if adaptive:
+            if cooperative:
+                for seconds in budget.samples:
+                    self.latency.record(seconds)
+            else:
+                self.latency.record(time.monotonic() - started)
+        self.breaker.record_success()
+        self._state.set(self.breaker.state)
+        return result
+
+    async def _hedged(self, call: Callable[[], Awaitable[T]]) -> T:
+        delay = self.latency.percentile(self.hedge_quantile) if len(self.latency.samples) >= self.min_samples else None
+        primary = asyncio.ensure_future(call())
+        if delay is None:
+            return await primary
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        if not self._can_hedge():
+            return await primary
+
+        backup = asyncio.ensure_future(call())
+        pending = {primary, backup}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        HEDGED_REQUESTS.labels(self.provider.name, "primary" if task is primary else "hedge").inc()
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in (primary, backup):
+                if not task.done():
+                    task.cancel()
+
+    def _can_hedge(self) -> bool:
+        limiter = getattr(self.provider, "limiter", None)
+        if limiter is None:
+            return True
+        return limiter.headroom() >= limiter.capacity * self.hedge_headroom
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from pricemonitor.scheduler.tasks import PollGroup
+from pricemonitor.utils.metrics import IN_FLIGHT, SCHEDULE_LAG_SECONDS, SKIPPED_TICKS
+
+GroupHandler = Callable[[PollGroup], Awaitable[None]]
+
+
+@dataclass(eq=False)
+class ScheduledGroup:
+    """Mutable scheduling state for one poll group."""
+
+    group: PollGroup
+    deadline: float
+    running: bool = False
+    cancelled: bool = False
+    fired: int = 0
+    skipped: int = 0
+    last_lag: float = 0.0
+
+
+@dataclass(eq=False)
+class _ProviderSlot:
+    """Fetch cap and bookkeeping for one provider instance."""
+
+    semaphore: asyncio.Semaphore
+    groups: int = 0
+    tasks: int = 0
+    active: int = 0
+
+
+def _provider_name(provider: object) -> str:
+    return getattr(provider, "name", type(provider).__name__)
+
+
+class Scheduler:
+    """Deadline-heap scheduler that drives every poll group from one coroutine.
+
+    Ticks fire on absolute deadlines (``start + n * interval``) so fetch latency
+    never accumulates into drift. A group whose previous fetch is still running,
+    or whose deadlines were missed entirely, skips ahead to the next future tick
+    instead of bursting. Fetches are capped per provider instance via a
+    semaphore, dropped once the instance has no scheduled groups and no fetch
+    left running (as after a config reload replaces it).
+    """
+
+    def __init__(
+        self,
+        handler: GroupHandler,
+        max_in_flight: int = 8,
+        jitter: float = 1.0,
+    ) -> None:
+        self.handler = handler
+        self.max_in_flight = max_in_flight
+        self.jitter = jitter
+        self._heap: list[tuple[float, int, ScheduledGroup]] = []
+        self._seq = 0
+        # Keyed by id(provider); a slot only lives while a group or task holds the provider, so ids are not reused.
+        self._slots: dict[int, _ProviderSlot] = {}
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._wakeup: asyncio.Event | None = None
+
+    def add(self, group: PollGroup, delay: float | None = None) -> ScheduledGroup:
+        """Schedule a group; its first tick lands at a random phase within the interval."""
+
+        if group.interval_seconds <= 0:
+            raise ValueError(f"interval_seconds must be positive, got {group.interval_seconds}")
+        if delay is None:
+            delay = random.uniform(0.0, group.interval_seconds * self.jitter)
+        entry = ScheduledGroup(group=group, deadline=self._now() + delay)
+        self._slot_for(group.provider).groups += 1
+        self._push(entry)
+        return entry
+
+    def remove(self, entry: ScheduledGroup) -> None:
+        if entry.cancelled:
+            return
+        entry.cancelled = True
+        key = id(entry.group.provider)
+        self._slots[key].groups -= 1
+        self._prune(key)
+
+    def in_flight(self, provider: object) -> int:
+        slot = self._slots.get(id(provider))
+        return slot.active if slot is not None else 0
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                if not self._heap:
+                    await self._wait(None)
+                    continue
+                now = self._now()
+                deadline = self._heap[0][0]
+                if deadline > now:
+                    await self._wait(deadline - now)
+                    continue
+                self._fire_due(now)
+        finally:
+            for task in list(self._in_flight):
+                task.cancel()
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _fire_due(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)[2]
+            if entry.cancelled:
+                continue
+            provider = _provider_name(entry.group.provider)
+            if entry.running:
+                entry.skipped += 1
+                SKIPPED_TICKS.labels(provider).inc()
+            else:
+                entry.last_lag = now - entry.deadline
+                entry.fired += 1
+                SCHEDULE_LAG_SECONDS.labels(provider).observe(entry.last_lag)
+                self._dispatch(entry)
+            self._advance(entry, now)
+            self._push(entry)
+
+    def _advance(self, entry: ScheduledGroup, now: float) -> None:
+        interval = entry.group.interval_seconds
+        missed = math.floor((now - entry.deadline) / interval)
+        entry.skipped += missed
+        if missed:
+            SKIPPED_TICKS.labels(_provider_name(entry.group.provider)).inc(missed)
+        entry.deadline += (missed + 1) * interval
+
+    def _dispatch(self, entry: ScheduledGroup) -> None:
+        entry.running = True
+        self._slots[id(entry.group.provider)].tasks += 1
+        task = asyncio.get_running_loop().create_task(self._execute(entry))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _execute(self, entry: ScheduledGroup) -> None:
+        group = entry.group
+        key = id(group.provider)
+        slot = self._slots[key]
+        gauge = IN_FLIGHT.labels(_provider_name(group.provider))
+        try:
+            async with slot.semaphore:
+                slot.active += 1
+                gauge.inc()
+                try:
+                    await self.handler(group)
+                finally:
+                    slot.active -= 1
+                    gauge.dec()
+        finally:
+            entry.running = False
+            slot.tasks -= 1
+            self._prune(key)
+
+    def _slot_for(self, provider: object) -> _ProviderSlot:
+        slot = self._slots.get(id(provider))
+        if slot is None:
+            slot = _ProviderSlot(asyncio.Semaphore(self._limit_for(provider)))
+            self._slots[id(provider)] = slot
+        return slot
+
+    def _prune(self, key: int) -> None:
+        slot = self._slots.get(key)
+        if slot is not None and not slot.groups and not slot.tasks:
+            del self._slots[key]
+
+    def _limit_for(self, provider: object) -> int:
+        return getattr(provider, "max_in_flight", None) or self.max_in_flight
+
+    def _push(self, entry: ScheduledGroup) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (entry.deadline, self._seq, entry))
+        if self._wakeup is not None and self._heap[0][2] is entry:
+            self._wakeup.set()
+
+    async def _wait(self, timeout: float | None) -> None:
+        assert self._wakeup is not None
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
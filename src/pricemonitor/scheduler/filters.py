@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from pricemonitor.config.models import FilterConfig
+from pricemonitor.models.quotes import Quote
+from pricemonitor.scheduler.tasks import PollTask
+
+FilterKey = tuple[str, str]
+
+
+class QuoteFilter:
+    """Drops quotes that carry no new information before they reach storage.
+
+    A quote for a filtered instrument is written when its price moves from the
+    last *written* price by more than the deadband (``max(absolute, relative *
+    |last|)``; any change when both are zero), or when ``heartbeat_seconds``
+    have passed since the last write so gaps stay distinguishable from flat
+    prices. Instruments without a rule pass through untouched. Rules are keyed
+    by configured provider name, so providers of the same kind filter
+    independently; ``apply`` resolves the name from the provider instance that
+    fetched the quotes.
+    """
+
+    def __init__(self, rules: dict[FilterKey, FilterConfig]) -> None:
+        self.rules = rules
+        self._sources: dict[int, str] = {}
+        self._last: dict[FilterKey, tuple[float, float]] = {}
+        self.dropped = 0
+
+    @staticmethod
+    def rules_for(tasks: Iterable[PollTask]) -> dict[FilterKey, FilterConfig]:
+        return {
+            (task.source_name, task.instrument.symbol): task.filter
+            for task in tasks
+            if task.filter is not None
+        }
+
+    def update(self, tasks: Iterable[PollTask]) -> None:
+        """Swap in the rules for ``tasks``, keeping last-written state of unchanged keys."""
+
+        tasks = list(tasks)
+        self.rules = self.rules_for(tasks)
+        self._sources = {id(task.provider): task.source_name for task in tasks}
+        for key in [key for key in self._last if key not in self.rules]:
+            del self._last[key]
+
+    def apply(self, quotes: list[Quote], provider: object | None = None) -> list[Quote]:
+        source = self._sources.get(id(provider)) if provider is not None else None
+        kept: list[Quote] = []
+        for quote in quotes:
+            if self.accept(quote, source):
+                kept.append(quote)
+            else:
+                self.dropped += 1
+        return kept
+
+    def accept(self, quote: Quote, source: str | None = None) -> bool:
+        key = (source if source is not None else quote.provider, quote.instrument.symbol)
+        rule = self.rules.get(key)
+        if rule is None:
+            return True
+        now = quote.timestamp.timestamp()
+        last = self._last.get(key)
+        if last is not None:
+            last_price, last_time = last
+            threshold = max(rule.absolute, rule.relative * abs(last_price))
+            if abs(quote.price - last_price) <= threshold and now - last_time < rule.heartbeat_seconds:
+                return False
+        self._last[key] = (quote.price, now)
+        return True
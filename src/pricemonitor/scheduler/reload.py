@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Callable
+
+from pricemonitor.analytics.derived import DerivedEngine
+from pricemonitor.config.loader import ConfigError, load_app_config
+from pricemonitor.config.models import AppConfig
+from pricemonitor.providers.base import Provider
+from pricemonitor.providers.registry import ProviderRegistryError, build_provider
+from pricemonitor.scheduler.runner import Pipeline, build_derived, build_streams, build_tasks_from_config
+from pricemonitor.utils.log import get_logger, log_event
+
+logger = get_logger(__name__)
+
+CONFIG_FILES = ("sources.yaml", "schedules.yaml", "storage.yaml")
+
+
+class ConfigWatcher:
+    """Detects edits to the config files by polling their size and mtime."""
+
+    def __init__(self, config_dir: Path, files: tuple[str, ...] = CONFIG_FILES) -> None:
+        self.paths = [config_dir / name for name in files]
+        self._stamp = self._snapshot()
+
+    def changed(self) -> bool:
+        stamp = self._snapshot()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        return True
+
+    def _snapshot(self) -> tuple[tuple[int, int] | None, ...]:
+        stamps: list[tuple[int, int] | None] = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+
+class ConfigReloader:
+    """Applies config edits to a running ``Pipeline`` without restarting it.
+
+    Providers whose ``ProviderConfig`` is unchanged are kept, along with their
+    connection pools; changed or removed ones are closed once their in-flight
+    fetches finish. An edit that fails to load or validate is logged and the
+    running configuration stays in place. Derived instrument definitions are
+    swapped in place; storage and bar settings only take effect on restart.
+    """
+
+    def __init__(
+        self,
+        config_dir: Path,
+        config: AppConfig,
+        providers: dict[str, Provider],
+        pipeline: Pipeline,
+        prepare: Callable[[AppConfig], AppConfig] | None = None,
+        interval: float = 2.0,
+    ) -> None:
+        self.config_dir = config_dir
+        self.config = config
+        self.providers = providers
+        self.pipeline = pipeline
+        self.prepare = prepare
+        self.interval = interval
+        self.watcher = ConfigWatcher(config_dir)
+        self._retiring: set[asyncio.Task[None]] = set()
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                if self.watcher.changed():
+                    await self.reload()
+        finally:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    async def reload(self) -> bool:
+        providers: dict[str, Provider] = {}
+        try:
+            config = load_app_config(self.config_dir)
+            if self.prepare is not None:
+                config = self.prepare(config)
+            self._reconcile_providers(config, providers)
+            tasks = build_tasks_from_config(config, providers)
+            streams = build_streams(config, providers, tasks)
+            derived = build_derived(config)
+        except (ConfigError, ProviderRegistryError, KeyError, TypeError, ValueError) as exc:
+            log_event(logger, logging.ERROR, "config reload rejected", error=str(exc))
+            current = {id(provider) for provider in self.providers.values()}
+            for provider in providers.values():
+                if id(provider) not in current:
+                    await self._close(provider)
+            return False
+
+        kept = {id(provider) for provider in providers.values()}
+        retired = [provider for provider in self.providers.values() if id(provider) not in kept]
+
+        added, removed, changed = self.pipeline.update(tasks, streams)
+        for sink in self.pipeline.sinks:
+            if isinstance(sink, DerivedEngine):
+                sink.update(derived)
+        if config.storage != self.config.storage or config.bar_intervals != self.config.bar_intervals:
+            log_event(logger, logging.WARNING, "storage and bar settings change on restart only")
+        self.providers.clear()
+        self.providers.update(providers)
+        for provider in retired:
+            task = asyncio.create_task(self._retire(provider))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+        self.config = config
+        log_event(
+            logger,
+            logging.INFO,
+            "config reloaded",
+            tasks=len(tasks),
+            groups_added=added,
+            groups_removed=removed,
+            groups_changed=changed,
+            providers_replaced=len(retired),
+            derived=len(derived),
+        )
+        return True
+
+    def _reconcile_providers(self, config: AppConfig, providers: dict[str, Provider]) -> None:
+        # Fills ``providers`` as it goes so the caller can close new instances if a later step fails.
+        for name, provider_config in config.providers.items():
+            current = self.providers.get(name)
+            if current is not None and self.config.providers.get(name) == provider_config:
+                providers[name] = current
+            else:
+                providers[name] = build_provider(provider_config)
+
+    async def _retire(self, provider: Provider) -> None:
+        while self.pipeline.scheduler.in_flight(provider):
+            await asyncio.sleep(0.1)
+        await self._close(provider)
+
+    @staticmethod
+    async def _close(provider: Provider) -> None:
+        close = getattr(provider, "close", None)
+        if close is not None:
+            await close()
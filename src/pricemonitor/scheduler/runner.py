@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
+import time
+from functools import partial
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
 
+from pricemonitor.analytics.derived import DerivedDefinition, DerivedEngine
+from pricemonitor.analytics.streaming import BarAggregator
 from pricemonitor.config.loader import ConfigError, load_app_config
-from pricemonitor.models.instruments import Instrument
-from pricemonitor.providers.base import ProviderError
+from pricemonitor.config.models import DERIVED_PROVIDER, AppConfig
+from pricemonitor.models.instruments import Instrument, intern_instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.providers.base import Provider, ProviderError
+from pricemonitor.providers.binance.adapter import BinanceProvider
+from pricemonitor.providers.binance.stream import BinanceStream
 from pricemonitor.providers.registry import build_providers
-from pricemonitor.scheduler.tasks import PollTask
+from pricemonitor.scheduler.engine import ScheduledGroup, Scheduler
+from pricemonitor.scheduler.filters import QuoteFilter
+from pricemonitor.scheduler.sinks import QuoteSink
+from pricemonitor.scheduler.tasks import PollGroup, PollTask
 from pricemonitor.storage.base import Storage
-from pricemonitor.storage.csv import CsvStorage
+from pricemonitor.storage.registry import build_storage
+from pricemonitor.utils.log import configure_logging, get_logger, log_event
+from pricemonitor.utils.metrics import ERRORS, FETCH_SECONDS, STORAGE_WRITE_SECONDS, TICKS
+from pricemonitor.utils.ratelimit import request_priority
+
+logger = get_logger(__name__)
 
 
 def _config_dir() -> Path:
@@ -29,23 +46,60 @@ def _run_seconds() -> float | None:
     return seconds if seconds > 0 else None
 
 
-def build_instruments(config) -> dict[tuple[str, str], Instrument]:
+def _reload_seconds() -> float | None:
+    value = os.environ.get("PRICEMONITOR_RELOAD_SECONDS", "2")
+    try:
+        seconds = float(value)
+    except ValueError as exc:
+        raise ConfigError(f"Invalid PRICEMONITOR_RELOAD_SECONDS: {value}") from exc
+    return seconds if seconds > 0 else None
+
+
+def build_instruments(config: AppConfig) -> dict[tuple[str, str], Instrument]:
     instruments: dict[tuple[str, str], Instrument] = {}
     for item in config.instruments:
-        instruments[(item.symbol, item.provider)] = Instrument(
-            symbol=item.symbol,
-            asset_class=item.asset_class,
-            exchange=item.exchange,
-            base=item.base,
-            quote=item.quote,
-            name=item.name,
+        instruments[(item.symbol, item.provider)] = intern_instrument(
+            Instrument(
+                symbol=item.symbol,
+                asset_class=item.asset_class,
+                exchange=item.exchange,
+                base=item.base,
+                quote=item.quote,
+                name=item.name,
+            )
+        )
+    for item in config.derived:
+        instruments[(item.symbol, DERIVED_PROVIDER)] = intern_instrument(
+            Instrument(
+                symbol=item.symbol,
+                asset_class=item.asset_class,
+                base=item.base,
+                quote=item.quote,
+                name=item.name,
+            )
         )
     return instruments
 
 
+def build_derived(config: AppConfig) -> list[DerivedDefinition]:
+    instruments = build_instruments(config)
+    return [
+        DerivedDefinition(
+            instrument=instruments[(item.symbol, DERIVED_PROVIDER)],
+            currency=item.quote,
+            legs=tuple(((leg.provider, leg.symbol), leg.power) for leg in item.legs),
+            max_skew_seconds=item.max_skew_seconds,
+        )
+        for item in config.derived
+    ]
+
+
 def build_tasks(config_dir: Path) -> list[PollTask]:
     config = load_app_config(config_dir)
-    providers = build_providers(config.providers)
+    return build_tasks_from_config(config, build_providers(config.providers))
+
+
+def build_tasks_from_config(config: AppConfig, providers: dict[str, Provider]) -> list[PollTask]:
     instruments = build_instruments(config)
 
     tasks: list[PollTask] = []
@@ -62,63 +116,341 @@ def build_tasks(config_dir: Path) -> list[PollTask]:
                 instrument=instrument,
                 provider=provider,
                 interval_seconds=schedule.interval_seconds,
+                filter=schedule.filter,
+                source=schedule.provider,
             )
         )
     return tasks
 
 
-async def _run_task(task: PollTask, storage: Storage) -> None:
-    while True:
-        try:
-            quote = await task.provider.fetch_quote(task.instrument)
-            storage.append_quote(quote)
-            print(
-                f"[{quote.timestamp.isoformat()}] {quote.provider} {quote.instrument.symbol}={quote.price} {quote.currency}",
-                flush=True,
+def group_tasks(tasks: Iterable[PollTask]) -> list[PollGroup]:
+    grouped: dict[tuple[int, float], list[PollTask]] = {}
+    for task in tasks:
+        grouped.setdefault((id(task.provider), task.interval_seconds), []).append(task)
+
+    groups: list[PollGroup] = []
+    for members in grouped.values():
+        instruments: dict[str, Instrument] = {}
+        for task in members:
+            instruments.setdefault(task.instrument.symbol, task.instrument)
+        groups.append(
+            PollGroup(
+                provider=members[0].provider,
+                interval_seconds=members[0].interval_seconds,
+                instruments=tuple(instruments.values()),
             )
-            await asyncio.sleep(task.interval_seconds)
-        except ProviderError as exc:
-            print(
-                f"provider error ({task.provider.name}:{task.instrument.symbol}): {exc}",
-                flush=True,
+        )
+    return groups
+
+
+def _group_label(group: PollGroup) -> str:
+    if len(group.instruments) == 1:
+        return f"{group.provider.name}:{group.instruments[0].symbol}"
+    return f"{group.provider.name}:{len(group.instruments)} symbols"
+
+
+def build_streams(config: AppConfig, providers: dict[str, Provider], tasks: Iterable[PollTask]) -> list[BinanceStream]:
+    """Create WebSocket feeds for providers configured with ``stream: true``."""
+
+    tasks = list(tasks)
+    streams: list[BinanceStream] = []
+    for name, provider in providers.items():
+        settings = config.providers[name].settings or {}
+        if not settings.get("stream"):
+            continue
+        # Resilience wrappers delegate to the adapter; the stream keeps the wrapper for identity checks.
+        if not isinstance(getattr(provider, "provider", provider), BinanceProvider):
+            raise ConfigError(f"Provider {name} does not support streaming")
+        instruments = [task.instrument for task in tasks if task.provider is provider]
+        if not instruments:
+            continue
+        try:
+            streams.append(
+                BinanceStream(
+                    provider,
+                    instruments,
+                    base_url=settings.get("stream_url", "wss://stream.binance.com:9443"),
+                )
             )
-            await asyncio.sleep(max(1.0, task.interval_seconds))
-        except Exception as exc:  # pragma: no cover - safety net for long-running worker
-            print(
-                f"unexpected error ({task.provider.name}:{task.instrument.symbol}): {exc}",
-                flush=True,
+        except RuntimeError as exc:
+            raise ConfigError(str(exc)) from exc
+    return streams
+
+
+def _deliver(
+    quotes: list[Quote],
+    storage: Storage,
+    sinks: Sequence[QuoteSink],
+    quote_filter: QuoteFilter | None = None,
+    provider: object | None = None,
+) -> None:
+    if not quotes:
+        return
+    started = time.perf_counter()
+    storage.append_quotes(quote_filter.apply(quotes, provider) if quote_filter is not None else quotes)
+    STORAGE_WRITE_SECONDS.labels("enqueue").observe(time.perf_counter() - started)
+    TICKS.labels(quotes[0].provider).inc(len(quotes))
+    for sink in sinks:
+        sink.publish(quotes)
+    if logger.isEnabledFor(logging.DEBUG):
+        for quote in quotes:
+            log_event(
+                logger,
+                logging.DEBUG,
+                "quote",
+                provider=quote.provider,
+                symbol=quote.instrument.symbol,
+                price=quote.price,
+                currency=quote.currency,
+                timestamp=quote.timestamp.isoformat(),
             )
-            await asyncio.sleep(max(1.0, task.interval_seconds))
 
 
-async def run(tasks: Iterable[PollTask], storage: Storage, run_seconds: float | None = None) -> None:
-    workers = [asyncio.create_task(_run_task(task, storage)) for task in tasks]
-    if not workers:
+async def _poll_group(
+    group: PollGroup,
+    instruments: list[Instrument],
+    storage: Storage,
+    sinks: Sequence[QuoteSink] = (),
+    quote_filter: QuoteFilter | None = None,
+) -> None:
+    provider = group.provider.name
+    symbol = instruments[0].symbol if len(instruments) == 1 else "batch"
+    started = time.perf_counter()
+    # Shorter intervals win when the provider's request budget is short.
+    request_priority.set(group.interval_seconds)
+    try:
+        quotes = await group.provider.fetch_quotes(instruments)
+        FETCH_SECONDS.labels(provider, symbol).observe(time.perf_counter() - started)
+        _deliver(quotes, storage, sinks, quote_filter, group.provider)
+    except ProviderError as exc:
+        ERRORS.labels(provider, type(exc).__name__).inc()
+        log_event(logger, logging.WARNING, "provider error", group=_group_label(group), error=str(exc))
+    except Exception as exc:  # pragma: no cover - safety net for long-running worker
+        ERRORS.labels(provider, type(exc).__name__).inc()
+        log_event(logger, logging.ERROR, "unexpected error", group=_group_label(group), error=repr(exc))
+
+
+GroupKey = tuple[int, float]
+
+
+class Pipeline:
+    """Scheduler, streams and delivery for one set of poll tasks, updatable in place.
+
+    ``update`` reconciles a new task list against what is scheduled: groups
+    whose provider and interval are unchanged keep their ``ScheduledGroup``
+    (and so their phase and any in-flight fetch) and only have their
+    instrument tuple swapped, new groups are added and vanished ones removed.
+    Streams are restarted only when their provider or symbol set changes.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        sinks: Iterable[QuoteSink] = (),
+        scheduler: Scheduler | None = None,
+    ) -> None:
+        self.storage = storage
+        self.sinks = tuple(sinks)
+        self.quote_filter = QuoteFilter({})
+        self.scheduler = scheduler if scheduler is not None else Scheduler(self._handle)
+        self.scheduler.handler = self._handle
+        self.entries: dict[GroupKey, ScheduledGroup] = {}
+        self.streams: tuple[BinanceStream, ...] = ()
+        self._stream_workers: dict[tuple[int, tuple[str, ...]], tuple[BinanceStream, asyncio.Task[None] | None]] = {}
+        self._running = False
+
+    def update(self, tasks: Iterable[PollTask], streams: Iterable[BinanceStream] = ()) -> tuple[int, int, int]:
+        """Apply a new task list; returns ``(added, removed, changed)`` group counts."""
+
+        tasks = list(tasks)
+        self.quote_filter.update(tasks)
+        groups = {(id(group.provider), group.interval_seconds): group for group in group_tasks(tasks)}
+        added = removed = changed = 0
+        for key, entry in list(self.entries.items()):
+            if key not in groups:
+                self.scheduler.remove(entry)
+                del self.entries[key]
+                removed += 1
+        for key, group in groups.items():
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = self.scheduler.add(group)
+                added += 1
+            elif entry.group.instruments != group.instruments:
+                entry.group = group
+                changed += 1
+        self._update_streams(tuple(streams))
+        return added, removed, changed
+
+    async def run(self, run_seconds: float | None = None) -> None:
+        self._running = True
+        scheduler = asyncio.create_task(self.scheduler.run())
+        for key, (stream, worker) in self._stream_workers.items():
+            if worker is None:
+                self._stream_workers[key] = (stream, self._start_stream(stream))
+        try:
+            if run_seconds is None:
+                await scheduler
+            else:
+                await asyncio.sleep(run_seconds)
+        finally:
+            self._running = False
+            workers = [scheduler, *(worker for _, worker in self._stream_workers.values() if worker is not None)]
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            flush = getattr(self.storage, "flush", None)
+            if flush is not None:
+                await asyncio.to_thread(flush)
+
+    def deliver(self, quotes: list[Quote], provider: object | None = None) -> None:
+        _deliver(quotes, self.storage, self.sinks, self.quote_filter, provider)
+
+    async def _handle(self, group: PollGroup) -> None:
+        # Instruments on a live stream are skipped; polling resumes while their connection is down.
+        live = [stream for stream in self.streams if stream.provider is group.provider]
+        instruments = [
+            instrument
+            for instrument in group.instruments
+            if not any(stream.covers(instrument.symbol) for stream in live)
+        ]
+        if instruments:
+            await _poll_group(group, instruments, self.storage, self.sinks, self.quote_filter)
+
+    def _update_streams(self, streams: tuple[BinanceStream, ...]) -> None:
+        wanted = {(id(stream.provider), tuple(sorted(stream.instruments))): stream for stream in streams}
+        for key in list(self._stream_workers):
+            if key not in wanted:
+                _, worker = self._stream_workers.pop(key)
+                if worker is not None:
+                    worker.cancel()
+        for key, stream in wanted.items():
+            if key not in self._stream_workers:
+                self._stream_workers[key] = (stream, self._start_stream(stream) if self._running else None)
+        self.streams = tuple(stream for stream, _ in self._stream_workers.values())
+
+    def _start_stream(self, stream: BinanceStream) -> asyncio.Task[None]:
+        return asyncio.create_task(stream.run(partial(self.deliver, provider=stream.provider)))
+
+
+async def run(
+    tasks: Iterable[PollTask],
+    storage: Storage,
+    run_seconds: float | None = None,
+    sinks: Iterable[QuoteSink] = (),
+    streams: Iterable[BinanceStream] = (),
+    scheduler: Scheduler | None = None,
+) -> None:
+    pipeline = Pipeline(storage, sinks=sinks, scheduler=scheduler)
+    pipeline.update(tasks, streams)
+    if not pipeline.entries:
         return
+    await pipeline.run(run_seconds)
+
 
-    if run_seconds is None:
-        await asyncio.gather(*workers)
+def build_pipeline(config: AppConfig, storage: Storage, sinks: Iterable[QuoteSink] = ()) -> Pipeline:
+    """Pipeline delivering to ``sinks``, then bar aggregation, then derived instruments."""
+
+    # Derived quotes are delivered back through the pipeline, so they are stored and reach every sink.
+    # The engine goes last, so they follow their inputs everywhere rather than overtaking them.
+    derived = DerivedEngine(build_derived(config))
+    sinks = list(sinks)
+    if config.bar_intervals:
+        sinks.append(BarAggregator(config.bar_intervals, storage.append_bars))
+    sinks.append(derived)
+    pipeline = Pipeline(storage, sinks=sinks)
+    derived.emit = pipeline.deliver
+    return pipeline
+
+
+async def run_pipeline(
+    config: AppConfig,
+    providers: dict[str, Provider],
+    run_seconds: float | None = None,
+    sinks: Iterable[QuoteSink] = (),
+    config_dir: Path | None = None,
+    prepare: Callable[[AppConfig], AppConfig] | None = None,
+    require_tasks: bool = True,
+) -> None:
+    """Poll (and stream) every configured schedule into the configured storage.
+
+    With ``config_dir`` set, edits to the config files are applied while
+    running; ``providers`` is updated in place so the caller closes the
+    current instances. ``prepare`` is applied to every reloaded config.
+    Without ``require_tasks`` an empty schedule is not an error: the pipeline
+    idles until a reload brings work, or returns at once if reloading is off.
+    """
+
+    tasks = build_tasks_from_config(config, providers)
+    reload_seconds = _reload_seconds() if config_dir is not None else None
+    if not tasks and (require_tasks or reload_seconds is None):
+        if require_tasks:
+            raise ConfigError("No polling tasks defined in schedules.yaml")
         return
+    streams = build_streams(config, providers, tasks)
+    storage = build_storage(config.storage)
+    pipeline = build_pipeline(config, storage, sinks)
+    pipeline.update(tasks, streams)
+    reloader = None
+    if config_dir is not None and reload_seconds is not None:
+        from pricemonitor.scheduler.reload import ConfigReloader
 
+        reloader = asyncio.create_task(
+            ConfigReloader(config_dir, config, providers, pipeline, prepare=prepare, interval=reload_seconds).run()
+        )
     try:
-        await asyncio.sleep(run_seconds)
+        await pipeline.run(run_seconds)
     finally:
-        for worker in workers:
-            worker.cancel()
-        await asyncio.gather(*workers, return_exceptions=True)
+        if reloader is not None:
+            reloader.cancel()
+            await asyncio.gather(reloader, return_exceptions=True)
+        storage.close()
 
 
-async def run_from_config(config_dir: Path, run_seconds: float | None = None) -> None:
+async def run_from_config(
+    config_dir: Path,
+    run_seconds: float | None = None,
+    sinks: Iterable[QuoteSink] = (),
+) -> None:
     config = load_app_config(config_dir)
-    storage = CsvStorage(Path(config.storage.root))
-    tasks = build_tasks(config_dir)
-    if not tasks:
-        raise ConfigError("No polling tasks defined in schedules.yaml")
-    await run(tasks, storage, run_seconds=run_seconds)
+    await run_app_config(config, run_seconds=run_seconds, sinks=sinks, config_dir=config_dir)
+
+
+async def run_app_config(
+    config: AppConfig,
+    run_seconds: float | None = None,
+    sinks: Iterable[QuoteSink] = (),
+    config_dir: Path | None = None,
+    prepare: Callable[[AppConfig], AppConfig] | None = None,
+    require_tasks: bool = True,
+) -> None:
+    providers = build_providers(config.providers)
+    try:
+        await run_pipeline(
+            config,
+            providers,
+            run_seconds=run_seconds,
+            sinks=sinks,
+            config_dir=config_dir,
+            prepare=prepare,
+            require_tasks=require_tasks,
+        )
+    finally:
+        for provider in providers.values():
+            close = getattr(provider, "close", None)
+            if close is not None:
+                await close()
 
 
 def run_main(config_dir: Path, run_seconds: float | None = None) -> None:
-    asyncio.run(run_from_config(config_dir, run_seconds=run_seconds))
+    configure_logging()
+    config = load_app_config(config_dir)
+    if config.storage.shards > 1:
+        from pricemonitor.scheduler.supervisor import Supervisor
+
+        Supervisor(config_dir, config.storage.shards, run_seconds=run_seconds).run()
+        return
+    asyncio.run(run_app_config(config, run_seconds=run_seconds, config_dir=config_dir))
 
 
 def main() -> None:
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from pricemonitor.models.quotes import Quote
+
+
+class QuoteSink(Protocol):
+    """Consumer fed with every batch of quotes the scheduler fetches."""
+
+    def publish(self, quotes: list[Quote]) -> None:
+        """Receive quotes from one poll tick."""
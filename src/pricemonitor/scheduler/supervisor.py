@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from dataclasses import replace
+from functools import partial
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Callable
+
+from pricemonitor.config.loader import load_app_config
+from pricemonitor.config.models import DERIVED_PROVIDER, AppConfig
+from pricemonitor.scheduler.runner import run_app_config
+from pricemonitor.storage.registry import shard_storage_config
+from pricemonitor.utils.backoff import exponential_backoff
+from pricemonitor.utils.hashring import HashRing
+from pricemonitor.utils.log import configure_logging, get_logger, log_event
+
+logger = get_logger(__name__)
+
+
+Key = tuple[str, str]
+
+
+def _colocated(config: AppConfig) -> dict[Key, Key]:
+    """Map every ``(provider, symbol)`` tied to a derived instrument onto one anchor key.
+
+    A worker only prices derived instruments from the quotes it polls itself,
+    so a derived instrument and all of its inputs, followed through
+    derived-on-derived legs, must share a shard. Linked keys are merged
+    (union-find) and the smallest key of each group is its anchor.
+    """
+
+    parent: dict[Key, Key] = {}
+
+    def find(key: Key) -> Key:
+        root = parent.setdefault(key, key)
+        while parent[root] != root:
+            root = parent[root]
+        parent[key] = root
+        return root
+
+    for item in config.derived:
+        own = (DERIVED_PROVIDER, item.symbol)
+        for leg in item.legs:
+            first, second = find(own), find((leg.provider, leg.symbol))
+            if first != second:
+                parent[max(first, second)] = min(first, second)
+    return {key: find(key) for key in parent}
+
+
+def shard_config(config: AppConfig, index: int, count: int) -> AppConfig:
+    """Restrict ``config`` to the schedules, derived instruments and storage partition owned by shard ``index``."""
+
+    ring = HashRing(count)
+    anchors = _colocated(config)
+
+    def owner(key: Key) -> int:
+        return ring.node_for(*anchors.get(key, key))
+
+    schedules = [item for item in config.schedules if owner((item.provider, item.symbol)) == index]
+    derived = [item for item in config.derived if owner((DERIVED_PROVIDER, item.symbol)) == index]
+    return replace(
+        config,
+        schedules=schedules,
+        derived=derived,
+        storage=shard_storage_config(config.storage, index),
+    )
+
+
+def _worker(config_dir: str, index: int, count: int, run_seconds: float | None) -> None:
+    configure_logging()
+    prepare = partial(shard_config, index=index, count=count)
+    config = prepare(load_app_config(Path(config_dir)))
+    # A shard without schedules stays up so a later config reload can hand it some.
+    log_event(logger, logging.INFO, "shard started", shard=index, schedules=len(config.schedules))
+    try:
+        asyncio.run(_run_worker(config, Path(config_dir), prepare, run_seconds))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _run_worker(
+    config: AppConfig,
+    config_dir: Path,
+    prepare: Callable[[AppConfig], AppConfig],
+    run_seconds: float | None,
+) -> None:
+    # SIGTERM from the supervisor cancels the pipeline so buffered quotes get flushed.
+    task = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    try:
+        await run_app_config(
+            config,
+            run_seconds=run_seconds,
+            config_dir=config_dir,
+            prepare=prepare,
+            require_tasks=False,
+        )
+    except asyncio.CancelledError:
+        pass
+
+
+class Supervisor:
+    """Run one polling worker process per shard and restart the ones that crash.
+
+    Schedules are assigned to shards by consistent hashing on
+    ``(provider, symbol)``, with each derived instrument and its inputs kept
+    together on one shard, and every worker writes to its own storage
+    partition (``<root>/shard-<n>``), so workers share no files. Workers
+    owning no schedules keep running and pick work up on config reload. A
+    worker that exits cleanly (its ``run_seconds`` elapsed) is not restarted;
+    one that fails is restarted after jittered exponential backoff, reset once
+    it has stayed up for ``stable_seconds``.
+    """
+
+    def __init__(
+        self,
+        config_dir: Path,
+        workers: int,
+        run_seconds: float | None = None,
+        stable_seconds: float = 60.0,
+    ) -> None:
+        self.config_dir = config_dir
+        self.workers = workers
+        self.run_seconds = run_seconds
+        self.stable_seconds = stable_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: dict[int, BaseProcess] = {}
+        self._started: dict[int, float] = {}
+        self._failures: dict[int, int] = {}
+        self._restart_at: dict[int, float] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        previous = signal.signal(signal.SIGTERM, self._request_stop)
+        try:
+            for index in range(self.workers):
+                self._start(index)
+            while not self._stopping and (self._processes or self._restart_at):
+                self._restart_due()
+                sentinels = [process.sentinel for process in self._processes.values()]
+                wait(sentinels, timeout=self._wait_time())
+                self._reap()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self._shutdown()
+
+    def _start(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker,
+            args=(str(self.config_dir), index, self.workers, self.run_seconds),
+            name=f"pricemonitor-shard-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        self._started[index] = time.monotonic()
+
+    def _reap(self) -> None:
+        now = time.monotonic()
+        for index, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self._processes[index]
+            if process.exitcode == 0 or self._stopping:
+                continue
+            if now - self._started[index] >= self.stable_seconds:
+                self._failures[index] = 0
+            attempt = self._failures.get(index, 0)
+            self._failures[index] = attempt + 1
+            delay = exponential_backoff(attempt, base=1.0, cap=60.0)
+            self._restart_at[index] = now + delay
+            log_event(
+                logger,
+                logging.WARNING,
+                "shard worker exited",
+                shard=index,
+                exitcode=process.exitcode,
+                restart_in=round(delay, 2),
+            )
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+        for index, due in list(self._restart_at.items()):
+            if due <= now:
+                del self._restart_at[index]
+                self._start(index)
+
+    def _wait_time(self) -> float | None:
+        if not self._restart_at:
+            return None
+        return max(0.0, min(self._restart_at.values()) - time.monotonic())
+
+    def _request_stop(self, signum: int, frame: object) -> None:
+        self._stopping = True
+        raise KeyboardInterrupt
+
+    def _shutdown(self) -> None:
+        self._stopping = True
+        self._restart_at.clear()
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._processes.clear()
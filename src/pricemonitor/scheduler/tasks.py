@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from pricemonitor.config.models import FilterConfig
 from pricemonitor.models.instruments import Instrument
 from pricemonitor.providers.base import Provider
 
@@ -11,3 +12,19 @@ class PollTask:
     instrument: Instrument
     provider: Provider
     interval_seconds: float
+    filter: FilterConfig | None = None
+    # Configured provider name (``sources.yaml`` key); several may share one adapter kind.
+    source: str | None = None
+
+    @property
+    def source_name(self) -> str:
+        return self.source if self.source is not None else self.provider.name
+
+
+@dataclass(frozen=True)
+class PollGroup:
+    """Tasks sharing a provider and interval, fetched with one batched call per tick."""
+
+    provider: Provider
+    interval_seconds: float
+    instruments: tuple[Instrument, ...]
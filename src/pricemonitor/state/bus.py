@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Iterable
+
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.store import QuoteKey
+
+QuoteEncoder = Callable[[Quote], str]
+
+
+class Subscription:
+    """Conflating mailbox holding only the newest encoded quote per key.
+
+    However slowly the consumer drains it, a subscription never holds more
+    than one entry per subscribed (provider, symbol).
+    """
+
+    def __init__(self, keys: frozenset[QuoteKey] | None, providers: frozenset[str] = frozenset()) -> None:
+        self.keys = keys
+        self.providers = providers
+        self._pending: dict[QuoteKey, str] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+
+    def offer(self, key: QuoteKey, payload: str) -> None:
+        self._pending[key] = payload
+        self._ready.set()
+
+    async def get(self, timeout: float | None = None) -> list[str]:
+        """Wait for and drain the newest payloads; returns ``[]`` on timeout."""
+
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except TimeoutError:
+                return []
+        payloads = list(self._pending.values())
+        self._pending.clear()
+        return payloads
+
+
+class QuoteBus:
+    """In-process pub/sub fan-out of quotes, usable as a scheduler sink.
+
+    ``publish`` never blocks: each quote is encoded once, no matter how many
+    subscribers receive it, and dropped into per-subscriber conflating slots.
+    """
+
+    def __init__(self, encode: QuoteEncoder) -> None:
+        self.encode = encode
+        self._by_key: dict[QuoteKey, set[Subscription]] = {}
+        self._by_provider: dict[str, set[Subscription]] = {}
+        self._wildcard: set[Subscription] = set()
+
+    def subscribe(self, keys: Iterable[QuoteKey] | None = None, providers: Iterable[str] = ()) -> Subscription:
+        """Subscribe to ``keys`` plus every symbol of ``providers``; with neither, to every quote."""
+
+        providers = frozenset(providers)
+        if keys is None and providers:
+            keys = ()
+        subscription = Subscription(frozenset(keys) if keys is not None else None, providers)
+        if subscription.keys is None:
+            self._wildcard.add(subscription)
+            return subscription
+        for key in subscription.keys:
+            self._by_key.setdefault(key, set()).add(subscription)
+        for provider in providers:
+            self._by_provider.setdefault(provider, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        if subscription.keys is None:
+            self._wildcard.discard(subscription)
+            return
+        for index, names in ((self._by_key, subscription.keys), (self._by_provider, subscription.providers)):
+            for name in names:
+                subscribers = index.get(name)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[name]
+
+    @property
+    def subscriber_count(self) -> int:
+        indexed = {sub for index in (self._by_key, self._by_provider) for subs in index.values() for sub in subs}
+        return len(self._wildcard) + len(indexed)
+
+    def publish(self, quotes: Iterable[Quote]) -> None:
+        for quote in quotes:
+            key = (quote.provider, quote.instrument.symbol)
+            subscribers = self._by_key.get(key)
+            followers = self._by_provider.get(quote.provider)
+            if not subscribers and not followers and not self._wildcard:
+                continue
+            payload = self.encode(quote)
+            for group in (subscribers, followers, self._wildcard):
+                for subscription in group or ():
+                    subscription.offer(key, payload)
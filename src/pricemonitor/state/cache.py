@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from pricemonitor.models.instruments import AssetClass
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.store import QuoteKey
+
+DEFAULT_TTLS: dict[AssetClass, float] = {
+    AssetClass.CRYPTO: 1.0,
+    AssetClass.FX: 2.0,
+    AssetClass.METAL: 5.0,
+    AssetClass.EQUITY: 5.0,
+}
+
+
+class LatestCache:
+    """Single-flight, TTL-bounded LRU cache of upstream latest-price lookups.
+
+    Concurrent ``get`` calls for a key with no fresh entry share one loader
+    call: the first caller starts it and the rest await the same task, so
+    upstream volume tracks distinct keys rather than clients. The loader runs
+    detached from any one caller, so a client disconnecting does not cancel the
+    fetch for the others. Results live for their asset class's TTL (measured
+    from when the fetch completed) and the least recently used entries are
+    evicted beyond ``max_entries``. Failures are shared but never cached.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[AssetClass, float] | None = None,
+        default_ttl: float = 1.0,
+        max_entries: int = 10_000,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[QuoteKey, tuple[Quote, float]] = OrderedDict()
+        self._inflight: dict[QuoteKey, asyncio.Task[Quote]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def peek(self, key: QuoteKey) -> Quote | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        quote, expires = entry
+        if time.monotonic() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return quote
+
+    async def get(self, key: QuoteKey, loader: Callable[[], Awaitable[Quote]]) -> Quote:
+        quote = self.peek(key)
+        if quote is not None:
+            self.hits += 1
+            return quote
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            # Mark the outcome retrieved even if every caller went away.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def put(self, quote: Quote, key: QuoteKey | None = None) -> None:
+        if key is None:
+            key = (quote.provider, quote.instrument.symbol)
+        ttl = self.ttls.get(quote.instrument.asset_class, self.default_ttl)
+        self._entries[key] = (quote, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _load(self, key: QuoteKey, loader: Callable[[], Awaitable[Quote]]) -> Quote:
+        try:
+            quote = await loader()
+            self.put(quote, key)
+            return quote
+        finally:
+            self._inflight.pop(key, None)
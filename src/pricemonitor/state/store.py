@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from array import array
+from datetime import timedelta
+from typing import Iterable
+
+from pricemonitor.models.quotes import Quote
+from pricemonitor.utils.time import to_epoch_micros, utc_now
+
+QuoteKey = tuple[str, str]
+
+
+class TickRing:
+    """Fixed-capacity ring of (epoch-microsecond, price) pairs in compact arrays."""
+
+    __slots__ = ("capacity", "timestamps", "prices", "_head", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("TickRing capacity must be positive.")
+        self.capacity = capacity
+        self.timestamps = array("q", bytes(8 * capacity))
+        self.prices = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp_us: int, price: float) -> None:
+        self.timestamps[self._head] = timestamp_us
+        self.prices[self._head] = price
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def snapshot(self, limit: int | None = None) -> tuple[array, array]:
+        """Return the most recent ``limit`` ticks, oldest first, as new arrays."""
+
+        count = self._size if limit is None else max(0, min(limit, self._size))
+        start = (self._head - count) % self.capacity
+        if start + count <= self.capacity:
+            return self.timestamps[start : start + count], self.prices[start : start + count]
+        tail = self.capacity - start
+        return (
+            self.timestamps[start:] + self.timestamps[: count - tail],
+            self.prices[start:] + self.prices[: count - tail],
+        )
+
+
+class QuoteStore:
+    """In-process hot state: latest quote and a tick ring per (provider, symbol).
+
+    The scheduler publishes every fetched batch here, so API handlers and
+    analytics can read current prices without another provider call or file
+    scan. All operations are O(1) per instrument and run on the event loop.
+    """
+
+    def __init__(self, ring_capacity: int = 3600) -> None:
+        self.ring_capacity = ring_capacity
+        self._latest: dict[QuoteKey, Quote] = {}
+        self._rings: dict[QuoteKey, TickRing] = {}
+
+    def publish(self, quotes: Iterable[Quote]) -> None:
+        for quote in quotes:
+            key = (quote.provider, quote.instrument.symbol)
+            self._latest[key] = quote
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = TickRing(self.ring_capacity)
+            ring.append(to_epoch_micros(quote.timestamp), quote.price)
+
+    def latest(self, provider: str, symbol: str, max_age: float | None = None) -> Quote | None:
+        quote = self._latest.get((provider, symbol))
+        if quote is None or max_age is None:
+            return quote
+        if utc_now() - quote.timestamp > timedelta(seconds=max_age):
+            return None
+        return quote
+
+    def latest_many(
+        self,
+        provider: str,
+        symbols: Iterable[str],
+        max_age: float | None = None,
+    ) -> dict[str, Quote]:
+        found: dict[str, Quote] = {}
+        for symbol in symbols:
+            quote = self.latest(provider, symbol, max_age=max_age)
+            if quote is not None:
+                found[symbol] = quote
+        return found
+
+    def recent(self, provider: str, symbol: str, limit: int | None = None) -> tuple[array, array]:
+        """Return recent tick timestamps (epoch microseconds) and prices, oldest first."""
+
+        ring = self._rings.get((provider, symbol))
+        if ring is None:
+            return array("q"), array("d")
+        return ring.snapshot(limit)
+
+    def keys(self) -> list[QuoteKey]:
+        return list(self._latest)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Iterable, Protocol
+from datetime import datetime
+from typing import Iterable, Iterator, Protocol
 
+from pricemonitor.models.bars import Bar
 from pricemonitor.models.instruments import Instrument
 from pricemonitor.models.quotes import Quote
 
@@ -18,5 +20,35 @@ class Storage(Protocol):
     def latest(self, instrument: Instrument) -> Quote | None:
         """Return the latest quote for an instrument."""
 
-    def history(self, instrument: Instrument, limit: int | None = None) -> list[Quote]:
-        """Return recent quotes for an instrument."""
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        """Return quotes for an instrument, optionally bounded to ``[start, end]``.
+
+        ``limit`` keeps the most recent ``limit`` quotes of the selection.
+        """
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        """Yield quotes in ``[start, end]`` oldest first, reading incrementally."""
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        """Persist closed OHLC bars next to the raw quotes."""
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        """Return stored bars of one width, optionally bounded by bar start time."""
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.base import Storage
+from pricemonitor.utils.log import get_logger, log_event
+from pricemonitor.utils.metrics import ERRORS
+from pricemonitor.utils.time import format_duration, to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = get_logger(__name__)
+
+TICK_FIELDS = [
+    ("timestamp_ns", "<i8"),
+    ("price", "<f8"),
+    ("provider", "<u2"),
+    ("currency", "<u2"),
+]
+
+BAR_FIELDS = [
+    ("start_ns", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("count", "<i8"),
+    ("mean", "<f8"),
+    ("variance", "<f8"),
+    ("provider", "<u2"),
+    ("currency", "<u2"),
+]
+
+CODEBOOK_NAME = "codes.jsonl"
+MAX_CODES = 1 << 16
+LATE_SUFFIX = ".late"
+
+_ITER_CHUNK = 4096
+
+
+def _to_epoch_nanos(value: datetime) -> int:
+    return to_epoch_micros(value) * 1000
+
+
+def _from_epoch_nanos(value: int) -> datetime:
+    seconds, nanos = divmod(value, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=nanos // 1000)
+
+
+class Codebook:
+    """Provider and currency names stored as ``uint16`` codes.
+
+    The mapping lives in a sidecar file with one JSON-encoded string per line;
+    a value's code is its line number. New values are appended (and flushed)
+    before any record uses them, and readers in other processes pick up new
+    lines when they meet a code they do not know yet.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._codes: dict[str, int] = {}
+        self._values: list[str] = []
+        self._offset = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            self._load()
+
+    def code(self, value: str) -> int:
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string code value, got {value!r}")
+        code = self._codes.get(value)
+        if code is not None:
+            return code
+        with self._lock:
+            self._load()
+            code = self._codes.get(value)
+            if code is not None:
+                return code
+            if len(self._values) >= MAX_CODES:
+                raise ValueError(f"Codebook {self.path} is full ({MAX_CODES} values)")
+            line = json.dumps(value) + "\n"
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+            self._offset += len(line.encode("utf-8"))
+            code = len(self._values)
+            self._values.append(value)
+            self._codes[value] = code
+            return code
+
+    def value(self, code: int) -> str:
+        if code >= len(self._values):
+            with self._lock:
+                self._load()
+            if code >= len(self._values):
+                raise ValueError(f"Unknown code {code} in {self.path}")
+        return self._values[code]
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as handle:
+            handle.seek(self._offset)
+            data = handle.read()
+        # Ignore a trailing partial line; it is picked up once its writer finishes it.
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            value = json.loads(line)
+            self._codes.setdefault(value, len(self._values))
+            self._values.append(value)
+        self._offset += len(complete)
+
+
+class BinaryStorage(Storage):
+    """Fixed-width binary tick files, one per instrument, read through ``numpy.memmap``.
+
+    Each record is 20 bytes: int64 epoch-nanosecond timestamp, float64 price
+    and uint16 provider/currency codes resolved through a ``Codebook``. Each
+    file is kept sorted by timestamp, so range reads are a binary search over
+    the mapped timestamp column and ``history_arrays`` returns zero-copy
+    views. Rows older than a file's last record (e.g. stream trades stamped
+    by the exchange landing after a locally stamped poll) go to a ``.late``
+    side file instead, which reads merge back in by timestamp. The sorted
+    late rows are cached per file and reloaded only when its size or mtime
+    changes, so reads do not pay for the whole side file each time.
+    """
+
+    suffix = ".ticks"
+
+    def __init__(self, root: Path, max_open_files: int = 256) -> None:
+        if np is None:
+            raise RuntimeError("NumPy is required for the binary storage backend.")
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open_files = max_open_files
+        self.dtype = np.dtype(TICK_FIELDS)
+        self.bar_dtype = np.dtype(BAR_FIELDS)
+        self.codes = Codebook(root / CODEBOOK_NAME)
+        self._handles: OrderedDict[Path, BinaryIO] = OrderedDict()
+        self._tails: dict[Path, int] = {}
+        self._late_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+    def append_quote(self, quote: Quote) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        by_path: dict[Path, list[tuple[Quote, int, int]]] = {}
+        for quote in quotes:
+            encoded = self._encode(quote.provider, quote.currency, quote.instrument.symbol)
+            if encoded is not None:
+                by_path.setdefault(self._path_for(quote.instrument), []).append((quote, *encoded))
+        for path, batch in by_path.items():
+            records = np.empty(len(batch), dtype=self.dtype)
+            records["timestamp_ns"] = [_to_epoch_nanos(quote.timestamp) for quote, _, _ in batch]
+            records["price"] = [quote.price for quote, _, _ in batch]
+            records["provider"] = [provider for _, provider, _ in batch]
+            records["currency"] = [currency for _, _, currency in batch]
+            self._append(path, records, "timestamp_ns", keep_open=True)
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        by_path: dict[Path, list[tuple[Bar, int, int]]] = {}
+        for bar in bars:
+            encoded = self._encode(bar.provider, bar.currency, bar.instrument.symbol)
+            if encoded is not None:
+                by_path.setdefault(self._bar_path_for(bar.instrument, bar.interval_seconds), []).append((bar, *encoded))
+        for path, batch in by_path.items():
+            records = np.empty(len(batch), dtype=self.bar_dtype)
+            records["start_ns"] = [_to_epoch_nanos(bar.start) for bar, _, _ in batch]
+            for name in ("open", "high", "low", "close", "count", "mean", "variance"):
+                records[name] = [getattr(bar, name) for bar, _, _ in batch]
+            records["provider"] = [provider for _, provider, _ in batch]
+            records["currency"] = [currency for _, _, currency in batch]
+            self._append(path, records, "start_ns", keep_open=False)
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        path = self._bar_path_for(instrument, interval_seconds)
+        records = self._select(path, self.bar_dtype, "start_ns", limit=limit, start=start, end=end)
+        if records is None:
+            return []
+        return [
+            Bar(
+                instrument=instrument,
+                provider=self.codes.value(int(record["provider"])),
+                currency=self.codes.value(int(record["currency"])),
+                interval_seconds=interval_seconds,
+                start=_from_epoch_nanos(int(record["start_ns"])),
+                open=float(record["open"]),
+                high=float(record["high"]),
+                low=float(record["low"]),
+                close=float(record["close"]),
+                count=int(record["count"]),
+                mean=float(record["mean"]),
+                variance=float(record["variance"]),
+            )
+            for record in records
+        ]
+
+    def close(self) -> None:
+        while self._handles:
+            _, handle = self._handles.popitem(last=False)
+            handle.close()
+        self._late_cache.clear()
+
+    def latest(self, instrument: Instrument) -> Quote | None:
+        records = self._select(self._path_for(instrument), self.dtype, "timestamp_ns", limit=1, start=None, end=None)
+        if records is None or len(records) == 0:
+            return None
+        return self._to_quote(records[-1], instrument)
+
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        records = self._select(self._path_for(instrument), self.dtype, "timestamp_ns", limit=limit, start=start, end=end)
+        if records is None:
+            return []
+        return [self._to_quote(record, instrument) for record in records]
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        path = self._path_for(instrument)
+        main = self._range(self._map(path, self.dtype), "timestamp_ns", start, end)
+        late = self._late(path, self.dtype, "timestamp_ns", start, end)
+        if late is None:
+            yield from self._iter_records(main, instrument)
+            return
+        yield from heapq.merge(
+            self._iter_records(main, instrument),
+            self._iter_records(late, instrument),
+            key=lambda quote: quote.timestamp,
+        )
+
+    def history_arrays(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[Any, Any]:
+        """Return ``(timestamps_ns, prices)``: read-only views over the mapped file unless late rows are merged in."""
+
+        records = self._select(self._path_for(instrument), self.dtype, "timestamp_ns", limit=limit, start=start, end=end)
+        if records is None:
+            return np.empty(0, dtype="<i8"), np.empty(0, dtype="<f8")
+        return records["timestamp_ns"], records["price"]
+
+    def _encode(self, provider: str, currency: str, symbol: str) -> tuple[int, int] | None:
+        # One bad value must not sink the rest of the batch (the write-behind buffer would drop it all).
+        try:
+            return self.codes.code(provider), self.codes.code(currency)
+        except ValueError as exc:
+            ERRORS.labels("storage", type(exc).__name__).inc()
+            log_event(logger, logging.ERROR, "binary storage rejected row", symbol=symbol, error=str(exc))
+            return None
+
+    def _append(self, path: Path, records: Any, field: str, keep_open: bool) -> None:
+        records = records[np.argsort(records[field], kind="stable")]
+        tail = self._tail(path, records.dtype, field)
+        split = 0 if tail is None else int(np.searchsorted(records[field], tail, side="left"))
+        late, ordered = records[:split], records[split:]
+        if len(ordered):
+            if keep_open:
+                handle = self._handle_for(path)
+                handle.write(ordered.tobytes())
+                handle.flush()
+            else:
+                with path.open("ab") as handle:
+                    handle.write(ordered.tobytes())
+            self._tails[path] = int(ordered[field][-1])
+        if len(late):
+            with self._late_path(path).open("ab") as handle:
+                handle.write(late.tobytes())
+
+    def _tail(self, path: Path, dtype: Any, field: str) -> int | None:
+        tail = self._tails.get(path)
+        if tail is None and path.exists():
+            count = path.stat().st_size // dtype.itemsize
+            if count:
+                last = np.fromfile(path, dtype=dtype, count=1, offset=(count - 1) * dtype.itemsize)
+                tail = self._tails[path] = int(last[field][0])
+        return tail
+
+    def _select(
+        self,
+        path: Path,
+        dtype: Any,
+        field: str,
+        limit: int | None,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> Any:
+        main = self._range(self._map(path, dtype), field, start, end)
+        late = self._late(path, dtype, field, start, end)
+        if late is None:
+            if main is not None and limit:
+                main = main[-limit:]
+            return main
+        merged = late
+        if main is not None:
+            # Only the last ``limit`` rows of each sorted source can make the cut.
+            if limit:
+                main = main[-limit:]
+            merged = np.concatenate([np.asarray(main), late])
+            merged = merged[np.argsort(merged[field], kind="stable")]
+        return merged[-limit:] if limit else merged
+
+    @staticmethod
+    def _range(records: Any, field: str, start: datetime | None, end: datetime | None) -> Any:
+        if records is None:
+            return None
+        times = records[field]
+        lower = 0 if start is None else int(np.searchsorted(times, _to_epoch_nanos(start), side="left"))
+        upper = len(records) if end is None else int(np.searchsorted(times, _to_epoch_nanos(end), side="right"))
+        return records[lower:upper]
+
+    def _late(self, path: Path, dtype: Any, field: str, start: datetime | None, end: datetime | None) -> Any:
+        late_path = self._late_path(path)
+        try:
+            stat = late_path.stat()
+        except FileNotFoundError:
+            return None
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._late_cache.get(late_path)
+        if cached is not None and cached[0] == key:
+            records = cached[1]
+        else:
+            records = np.fromfile(late_path, dtype=dtype, count=stat.st_size // dtype.itemsize)
+            records = records[np.argsort(records[field], kind="stable")]
+            # Shared by every read until the file changes; callers may get views of it.
+            records.flags.writeable = False
+            self._late_cache[late_path] = (key, records)
+        if len(records) == 0:
+            return None
+        return self._range(records, field, start, end)
+
+    def _iter_records(self, records: Any, instrument: Instrument) -> Iterator[Quote]:
+        if records is None:
+            return
+        # Copy out fixed-size slices so only one chunk of the mapping is resident at a time.
+        for offset in range(0, len(records), _ITER_CHUNK):
+            for record in np.array(records[offset : offset + _ITER_CHUNK]):
+                yield self._to_quote(record, instrument)
+
+    @staticmethod
+    def _map(path: Path, dtype: Any) -> Any:
+        if not path.exists():
+            return None
+        count = path.stat().st_size // dtype.itemsize
+        if count == 0:
+            return None
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _handle_for(self, path: Path) -> BinaryIO:
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        if len(self._handles) >= self.max_open_files:
+            _, evicted = self._handles.popitem(last=False)
+            evicted.close()
+        handle = path.open("ab")
+        self._handles[path] = handle
+        return handle
+
+    @staticmethod
+    def _late_path(path: Path) -> Path:
+        return path.with_name(path.name + LATE_SUFFIX)
+
+    def _path_for(self, instrument: Instrument) -> Path:
+        filename = instrument.symbol.lower().replace("/", "-")
+        return self.root / f"{filename}{self.suffix}"
+
+    def _bar_path_for(self, instrument: Instrument, interval_seconds: int) -> Path:
+        filename = instrument.symbol.lower().replace("/", "-")
+        return self.root / f"{filename}.bars-{format_duration(interval_seconds)}"
+
+    def _to_quote(self, record: Any, instrument: Instrument) -> Quote:
+        return Quote(
+            instrument=instrument,
+            price=float(record["price"]),
+            timestamp=_from_epoch_nanos(int(record["timestamp_ns"])),
+            currency=self.codes.value(int(record["currency"])),
+            provider=self.codes.value(int(record["provider"])),
+        )
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.base import Storage
+from pricemonitor.utils.log import get_logger, log_event
+from pricemonitor.utils.metrics import ERRORS, STORAGE_DROPPED, STORAGE_PENDING, STORAGE_WRITE_SECONDS
+from pricemonitor.utils.time import to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = get_logger(__name__)
+
+_ITER_CHUNK = 1024
+_READ_ATTEMPTS = 3
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BufferedStorage(Storage):
+    """Write-behind wrapper that group-commits quotes from a dedicated writer thread.
+
+    Appends only touch an in-memory buffer, so the event loop never waits on
+    disk. The writer thread hands the buffer to the wrapped backend's
+    ``append_quotes`` once it holds ``max_batch`` quotes or its oldest quote is
+    ``max_delay`` seconds old. The buffer holds at most ``max_pending`` quotes:
+    while the backend cannot keep up, further appends are dropped and counted
+    rather than blocking the caller. Reads never write: ``latest``, ``history``,
+    ``history_arrays`` and ``bars`` merge still-buffered rows into what the
+    backend returns, so they observe everything appended so far, while
+    ``iter_history`` streams committed rows only. Those reads run outside the
+    I/O lock, so a slow query never holds up the writer's drain.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        max_batch: int = 500,
+        max_delay: float = 0.5,
+        max_pending: int = 100_000,
+    ) -> None:
+        if max_pending < max_batch:
+            raise ValueError("max_pending must be at least max_batch")
+        self.storage = storage
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: list[Quote] = []
+        self._pending_bars: list[Bar] = []
+        self._oldest: float | None = None
+        self._overflowing = False
+        lock = threading.RLock()
+        self._cond = threading.Condition(lock)
+        self._committed = threading.Condition(lock)
+        self._commits = 0
+        self._committing = False
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="pricemonitor-writer", daemon=True)
+        self._thread.start()
+
+    def append_quote(self, quote: Quote) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        quotes = list(quotes)
+        if not quotes:
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BufferedStorage is closed.")
+            before = len(self._pending)
+            room = max(0, self.max_pending - before)
+            dropped = max(0, len(quotes) - room)
+            started_overflow = dropped > 0 and not self._overflowing
+            if dropped:
+                self._overflowing = True
+                self.dropped += dropped
+                quotes = quotes[:room]
+            self._pending.extend(quotes)
+            if quotes:
+                STORAGE_PENDING.labels().set(len(self._pending))
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                if before == 0 or len(self._pending) >= self.max_batch:
+                    self._cond.notify()
+        if dropped:
+            STORAGE_DROPPED.labels().inc(dropped)
+        if started_overflow:
+            log_event(logger, logging.WARNING, "storage buffer full; dropping quotes", max_pending=self.max_pending)
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BufferedStorage is closed.")
+            self._pending_bars.extend(bars)
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        stored, pending = self._read(
+            lambda: self.storage.bars(instrument, interval_seconds, limit=limit, start=start, end=end),
+            lambda: [
+                bar
+                for bar in self._pending_bars
+                if bar.instrument.symbol == instrument.symbol
+                and bar.interval_seconds == interval_seconds
+                and _within(bar.start, start, end)
+            ],
+        )
+        if not pending:
+            return stored
+        merged = list(heapq.merge(stored, sorted(pending, key=lambda bar: bar.start), key=lambda bar: bar.start))
+        return merged[-limit:] if limit else merged
+
+    def latest(self, instrument: Instrument) -> Quote | None:
+        stored, pending = self._read(
+            lambda: self.storage.latest(instrument),
+            lambda: self._pending_for(instrument, None, None),
+        )
+        if not pending:
+            return stored
+        newest = pending[-1]
+        if stored is not None and stored.timestamp > newest.timestamp:
+            return stored
+        return newest
+
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        stored, pending = self._read(
+            lambda: self.storage.history(instrument, limit=limit, start=start, end=end),
+            lambda: self._pending_for(instrument, start, end),
+        )
+        if not pending:
+            return stored
+        merged = list(heapq.merge(stored, pending, key=lambda quote: quote.timestamp))
+        return merged[-limit:] if limit else merged
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        source = self.storage.iter_history(instrument, start=start, end=end)
+        # Advance the delegate under the I/O lock a chunk at a time so reads never
+        # see a half-written batch, without blocking the writer for the whole export.
+        while True:
+            with self._io_lock:
+                chunk = list(islice(source, _ITER_CHUNK))
+            yield from chunk
+            if len(chunk) < _ITER_CHUNK:
+                return
+
+    def history_arrays(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[Any, Any]:
+        history_arrays = getattr(self.storage, "history_arrays", None)
+        if history_arrays is None:
+            raise NotImplementedError(f"{type(self.storage).__name__} does not provide history_arrays")
+        (timestamps, prices), pending = self._read(
+            lambda: history_arrays(instrument, limit=limit, start=start, end=end),
+            lambda: self._pending_for(instrument, start, end),
+        )
+        if not pending:
+            return timestamps, prices
+        timestamps = np.concatenate(
+            [timestamps, np.array([to_epoch_micros(quote.timestamp) * 1000 for quote in pending], dtype="<i8")]
+        )
+        prices = np.concatenate([prices, np.array([quote.price for quote in pending], dtype="<f8")])
+        order = np.argsort(timestamps, kind="stable")
+        if limit:
+            order = order[-limit:]
+        return timestamps[order], prices[order]
+
+    def flush(self) -> None:
+        """Commit every pending quote on the calling thread (shutdown and tests; reads do not need it)."""
+
+        self._drain()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        close = getattr(self.storage, "close", None)
+        if close is not None:
+            with self._io_lock:
+                close()
+
+    def _read(self, read: Callable[[], T], buffered: Callable[[], list[R]]) -> tuple[T, list[R]]:
+        """Run a backend ``read`` outside the I/O lock, alongside the ``buffered`` rows it cannot see yet.
+
+        ``buffered`` runs under the buffer lock. A drain bumps the commit count
+        when it takes its batch, so an unchanged count after ``read`` means no
+        row moved from the buffer to the backend meanwhile: every row shows up
+        exactly once. Reads that keep losing that race fall back to the lock.
+        """
+
+        for _ in range(_READ_ATTEMPTS):
+            with self._cond:
+                while self._committing:
+                    self._committed.wait()
+                commits = self._commits
+                rows = buffered()
+            stored = read()
+            with self._cond:
+                if self._commits == commits:
+                    return stored, rows
+        with self._io_lock:
+            with self._cond:
+                rows = buffered()
+            return read(), rows
+
+    def _pending_for(self, instrument: Instrument, start: datetime | None, end: datetime | None) -> list[Quote]:
+        # Backends key series by symbol and return quotes of the queried instrument; match that.
+        # Called with the buffer lock held.
+        matched = [
+            quote
+            for quote in self._pending
+            if quote.instrument.symbol == instrument.symbol and _within(quote.timestamp, start, end)
+        ]
+        matched.sort(key=lambda quote: quote.timestamp)
+        return [Quote(instrument, quote.price, quote.timestamp, quote.currency, quote.provider) for quote in matched]
+
+    def _writer(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    self._cond.wait(self._wait_time())
+                if self._closed:
+                    return
+            self._drain()
+
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.max_batch:
+            return True
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+
+    def _wait_time(self) -> float | None:
+        if self._oldest is None:
+            return None
+        return max(0.0, self.max_delay - (time.monotonic() - self._oldest))
+
+    def _take(self) -> tuple[list[Quote], list[Bar]]:
+        with self._cond:
+            batch, self._pending = self._pending, []
+            STORAGE_PENDING.labels().set(0)
+            bars, self._pending_bars = self._pending_bars, []
+            self._oldest = None
+            self._overflowing = False
+            if batch or bars:
+                self._commits += 1
+                self._committing = True
+        return batch, bars
+
+    def _drain(self) -> None:
+        # Take the batch under the I/O lock so concurrent drains commit in append order.
+        with self._io_lock:
+            batch, bars = self._take()
+            try:
+                self._commit(batch, bars)
+            finally:
+                with self._cond:
+                    self._committing = False
+                    self._committed.notify_all()
+
+    def _commit(self, batch: list[Quote], bars: list[Bar]) -> None:
+        if batch:
+            started = time.perf_counter()
+            try:
+                self.storage.append_quotes(batch)
+            except Exception as exc:  # pragma: no cover - keep the writer alive
+                ERRORS.labels("storage", type(exc).__name__).inc()
+                log_event(logger, logging.ERROR, "storage write failed", dropped_quotes=len(batch), error=str(exc))
+            else:
+                STORAGE_WRITE_SECONDS.labels("flush").observe(time.perf_counter() - started)
+        if bars:
+            try:
+                self.storage.append_bars(bars)
+            except Exception as exc:  # pragma: no cover - keep the writer alive
+                ERRORS.labels("storage", type(exc).__name__).inc()
+                log_event(logger, logging.ERROR, "storage write failed", dropped_bars=len(bars), error=str(exc))
+
+
+def _within(timestamp: datetime, start: datetime | None, end: datetime | None) -> bool:
+    value = to_epoch_micros(timestamp)
+    if start is not None and value < to_epoch_micros(start):
+        return False
+    return end is None or value <= to_epoch_micros(end)
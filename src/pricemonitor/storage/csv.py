@@ -1,58 +1,544 @@
 from __future__ import annotations
 
 import csv
-from datetime import datetime
+import heapq
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, TextIO
 
+from pricemonitor.models.bars import Bar
 from pricemonitor.models.instruments import Instrument
 from pricemonitor.models.quotes import Quote
 from pricemonitor.storage.base import Storage
+from pricemonitor.utils.time import ensure_utc, format_duration, to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+_TAIL_BLOCK = 8192
+_UTC_SUFFIX = "+00:00"
+
+_PARTITIONS = {
+    "day": ("%Y-%m-%d", timedelta(days=1)),
+    "hour": ("%Y-%m-%dT%H", timedelta(hours=1)),
+}
+
+
+class _LineEncoder:
+    """Encodes CSV rows one at a time through a csv writer that writes into this object.
+
+    The last-line buffer is per instance, so each append call builds its own.
+    """
+
+    def __init__(self) -> None:
+        self._line = ""
+        self._writer = csv.writer(self)
+
+    def write(self, text: str) -> int:
+        self._line = text
+        return len(text)
+
+    def encode(self, row: list[str]) -> bytes:
+        self._writer.writerow(row)
+        return self._line.encode("utf-8")
+
+
+@dataclass
+class _Appender:
+    data: BinaryIO
+    index: TextIO
+    offset: int
+    last_indexed: int
+    last_stamp: int | None
+    ordered: bool
+
+    def close(self) -> None:
+        self.data.close()
+        self.index.close()
 
 
 class CsvStorage(Storage):
-    """Append-only CSV storage, partitioned by instrument symbol."""
+    """Append-only CSV storage, partitioned by instrument symbol and optionally by time.
+
+    Each CSV has a sparse ``.idx`` sidecar mapping row timestamps (epoch
+    microseconds) to byte offsets, written every ``index_stride`` bytes, so
+    time-range reads seek close to the first wanted row instead of parsing the
+    whole file. ``latest`` and ``history(limit=...)`` read backward from EOF.
+    ``history_arrays`` reads only the timestamp and price columns of the rows
+    it needs, without building quotes.
+
+    Those shortcuts need a file's rows in timestamp order. A row older than
+    one already written (an exchange-stamped trade landing after a locally
+    stamped poll) is still appended, but first drops an ``.unordered`` marker
+    next to the file; reads of a marked file scan all of it and sort.
 
-    def __init__(self, root: Path) -> None:
+    With ``partition`` set to ``"day"`` or ``"hour"`` each symbol gets a
+    directory of per-period files. Range queries open only the partitions
+    overlapping the range and scan them in parallel on a thread pool.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_open_files: int = 256,
+        index_stride: int = 64 * 1024,
+        partition: str | None = None,
+        scan_workers: int = 4,
+    ) -> None:
+        if partition is not None and partition not in _PARTITIONS:
+            raise ValueError(f"Unsupported CSV partitioning: {partition}")
         self.root = root
         self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open_files = max_open_files
+        self.index_stride = index_stride
+        self.partition = partition
+        self.scan_workers = scan_workers
+        self._appenders: OrderedDict[Path, _Appender] = OrderedDict()
+        self._active: dict[Path, Path] = {}
+        self._executor: ThreadPoolExecutor | None = None
 
     def append_quote(self, quote: Quote) -> None:
-        path = self._path_for(quote.instrument)
-        write_header = not path.exists() or path.stat().st_size == 0
-        with path.open("a", newline="", encoding="utf-8") as handle:
-            writer = csv.writer(handle)
-            if write_header:
-                writer.writerow(self._header())
-            writer.writerow(self._row(quote))
-
-    def append_quotes(self, quotes: list[Quote]) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        by_path: dict[Path, list[Quote]] = {}
         for quote in quotes:
-            self.append_quote(quote)
+            by_path.setdefault(self._path_for(quote.instrument, quote.timestamp), []).append(quote)
+        encode = _LineEncoder().encode
+        for path, batch in by_path.items():
+            appender = self._appender_for(path)
+            chunks: list[bytes] = []
+            entries: list[str] = []
+            offset = appender.offset
+            for quote in batch:
+                stamp = to_epoch_micros(quote.timestamp)
+                if appender.last_stamp is not None and stamp < appender.last_stamp:
+                    if appender.ordered:
+                        # Mark before the row lands so readers never trust the order of a file that lost it.
+                        self._unordered_path_for(path).touch()
+                        appender.ordered = False
+                else:
+                    appender.last_stamp = stamp
+                if offset - appender.last_indexed >= self.index_stride:
+                    entries.append(f"{stamp},{offset}\n")
+                    appender.last_indexed = offset
+                line = encode(self._row(quote))
+                chunks.append(line)
+                offset += len(line)
+            appender.data.write(b"".join(chunks))
+            appender.data.flush()
+            appender.offset = offset
+            if entries:
+                appender.index.write("".join(entries))
+                appender.index.flush()
+
+    def close(self) -> None:
+        while self._appenders:
+            _, appender = self._appenders.popitem(last=False)
+            appender.close()
+        self._active.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def latest(self, instrument: Instrument) -> Quote | None:
-        path = self._path_for(instrument)
+        for _, path in reversed(self._partitions(instrument)):
+            rows = self._last_rows(path, 1)
+            if rows:
+                return self._parse_row(rows[-1], instrument)
+        return None
+
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        partitions = self._partitions(instrument)
+        if not partitions:
+            return []
+        if start is None and end is None:
+            if limit:
+                return self._tail(instrument, partitions, limit)
+            return [quote for _, path in partitions for quote in self._scan(path, instrument)]
+        quotes = self._scan_range(instrument, self._overlapping(partitions, start, end), start, end)
+        if limit:
+            return list(deque(quotes, maxlen=limit))
+        return list(quotes)
+
+    def history_arrays(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[Any, Any]:
+        """Return ``(timestamps_ns, prices)`` with the same selection as ``history``."""
+
+        if np is None:
+            raise NotImplementedError("CSV history_arrays requires NumPy")
+        partitions = self._partitions(instrument)
+        stamps: list[str] = []
+        prices: list[str] = []
+        if start is None and end is None and limit:
+            for row in self._tail_rows_across(partitions, limit):
+                stamps.append(row[0])
+                prices.append(row[4])
+            return _column_arrays(stamps, prices)
+        start_us = to_epoch_micros(start) if start is not None else None
+        end_us = to_epoch_micros(end) if end is not None else None
+        paths = self._overlapping(partitions, start, end)
+        for path in paths:
+            self._read_columns(path, start_us, end_us, stamps, prices)
+        timestamps, values = _column_arrays(stamps, prices)
+        if not all(self._ordered(path) for path in paths):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[order]
+        if start_us is not None or end_us is not None:
+            keep = np.ones(len(timestamps), dtype=bool)
+            if start_us is not None:
+                keep &= timestamps >= start_us * 1000
+            if end_us is not None:
+                keep &= timestamps <= end_us * 1000
+            timestamps, values = timestamps[keep], values[keep]
+        if limit:
+            timestamps, values = timestamps[-limit:], values[-limit:]
+        return timestamps, values
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        # One partition at a time, row by row: memory stays flat for any range.
+        for path in self._overlapping(self._partitions(instrument), start, end):
+            yield from self._scan(path, instrument, start, end)
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        by_path: dict[Path, list[Bar]] = {}
+        for bar in bars:
+            by_path.setdefault(self._bar_path_for(bar.instrument, bar.interval_seconds), []).append(bar)
+        for path, batch in by_path.items():
+            if not path.exists():
+                self._create(path, self._bar_header())
+            encode = _LineEncoder().encode
+            with path.open("ab") as handle:
+                handle.write(b"".join(encode(self._bar_row(bar)) for bar in batch))
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        path = self._bar_path_for(instrument, interval_seconds)
         if not path.exists():
+            return []
+        if start is None and end is None and limit:
+            rows = self._tail_rows(path, limit)
+        else:
+            with path.open("r", newline="", encoding="utf-8") as handle:
+                rows = list(csv.reader(handle))[1:]
+        bars = [self._parse_bar(row, instrument, interval_seconds) for row in rows if row]
+        if start is not None:
+            bars = [bar for bar in bars if bar.start >= ensure_utc(start)]
+        if end is not None:
+            bars = [bar for bar in bars if bar.start <= ensure_utc(end)]
+        return bars[-limit:] if limit else bars
+
+    def _tail(self, instrument: Instrument, partitions: list[tuple[datetime | None, Path]], limit: int) -> list[Quote]:
+        return [self._parse_row(row, instrument) for row in self._tail_rows_across(partitions, limit)]
+
+    def _tail_rows_across(self, partitions: list[tuple[datetime | None, Path]], limit: int) -> list[list[str]]:
+        rows: list[list[str]] = []
+        for _, path in reversed(partitions):
+            rows = self._last_rows(path, limit - len(rows)) + rows
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _read_columns(
+        self,
+        path: Path,
+        start_us: int | None,
+        end_us: int | None,
+        stamps: list[str],
+        prices: list[str],
+    ) -> None:
+        """Append the raw timestamp and price fields of rows the index cannot rule out."""
+
+        ordered = self._ordered(path)
+        offset = self._seek_offset(path, start_us) if ordered else 0
+        stop = self._stop_offset(path, end_us) if ordered else None
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read(-1 if stop is None else max(0, stop - offset))
+        lines = data.decode("utf-8").splitlines()
+        if offset == 0 and lines:
+            lines = lines[1:]
+        for line in lines:
+            if not line:
+                continue
+            # Quoting only appears when a field contains a comma or quote; the rest split directly.
+            fields = next(csv.reader([line])) if '"' in line else line.split(",", 5)
+            stamps.append(fields[0])
+            prices.append(fields[4])
+
+    def _scan_range(
+        self,
+        instrument: Instrument,
+        paths: list[Path],
+        start: datetime | None,
+        end: datetime | None,
+    ) -> Iterator[Quote]:
+        if len(paths) <= 1:
+            return iter([quote for path in paths for quote in self._scan(path, instrument, start, end)])
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.scan_workers, thread_name_prefix="pricemonitor-scan")
+        futures = [
+            self._executor.submit(lambda path=path: list(self._scan(path, instrument, start, end)))
+            for path in paths
+        ]
+        return heapq.merge(*(future.result() for future in futures), key=lambda quote: quote.timestamp)
+
+    def _partitions(self, instrument: Instrument) -> list[tuple[datetime | None, Path]]:
+        """Return ``(period_start, path)`` for every stored file of an instrument, oldest first."""
+
+        if self.partition is None:
+            path = self._path_for(instrument, None)
+            return [(None, path)] if path.exists() else []
+        directory = self._series_dir(instrument)
+        if not directory.is_dir():
+            return []
+        fmt, _ = _PARTITIONS[self.partition]
+        partitions: list[tuple[datetime | None, Path]] = []
+        for path in directory.glob("*.csv"):
+            try:
+                period = datetime.strptime(path.stem, fmt).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            partitions.append((period, path))
+        partitions.sort(key=lambda item: item[0])
+        return partitions
+
+    def _overlapping(
+        self,
+        partitions: list[tuple[datetime | None, Path]],
+        start: datetime | None,
+        end: datetime | None,
+    ) -> list[Path]:
+        if self.partition is None:
+            return [path for _, path in partitions]
+        _, width = _PARTITIONS[self.partition]
+        start = ensure_utc(start) if start is not None else None
+        end = ensure_utc(end) if end is not None else None
+        return [
+            path
+            for period, path in partitions
+            if (end is None or period <= end) and (start is None or period + width > start)
+        ]
+
+    def _scan(
+        self,
+        path: Path,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        start_us = to_epoch_micros(start) if start is not None else None
+        end_us = to_epoch_micros(end) if end is not None else None
+        if not self._ordered(path):
+            # No index seek or early stop: the whole file is filtered, then sorted.
+            with path.open("r", newline="", encoding="utf-8") as handle:
+                rows = list(csv.reader(handle))[1:]
+            quotes = [self._parse_row(row, instrument) for row in rows if row]
+            yield from sorted(
+                (quote for quote in quotes if _in_range(to_epoch_micros(quote.timestamp), start_us, end_us)),
+                key=lambda quote: quote.timestamp,
+            )
+            return
+        offset = self._seek_offset(path, start_us)
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            if offset == 0:
+                handle.readline()
+            for raw in handle:
+                row = next(csv.reader([raw.decode("utf-8")]), None)
+                if not row:
+                    continue
+                quote = self._parse_row(row, instrument)
+                stamp = to_epoch_micros(quote.timestamp)
+                if start_us is not None and stamp < start_us:
+                    continue
+                if end_us is not None and stamp > end_us:
+                    break
+                yield quote
+
+    def _seek_offset(self, path: Path, start_us: int | None) -> int:
+        if start_us is None:
+            return 0
+        stamps, offsets = self._load_index(path)
+        position = bisect_left(stamps, start_us) - 1
+        if position < 0:
+            return 0
+        return offsets[position]
+
+    def _stop_offset(self, path: Path, end_us: int | None) -> int | None:
+        """Offset of the first indexed row stamped after ``end_us``; ``None`` reads to EOF."""
+
+        if end_us is None:
             return None
+        stamps, offsets = self._load_index(path)
+        position = bisect_right(stamps, end_us)
+        return offsets[position] if position < len(offsets) else None
+
+    def _ordered(self, path: Path) -> bool:
+        return not self._unordered_path_for(path).exists()
+
+    def _last_rows(self, path: Path, count: int) -> list[list[str]]:
+        """The ``count`` most recent rows of a file, by timestamp rather than position if it is unordered."""
+
+        if self._ordered(path):
+            return self._tail_rows(path, count)
         with path.open("r", newline="", encoding="utf-8") as handle:
-            rows = list(csv.reader(handle))
-        if len(rows) <= 1:
-            return None
-        return self._parse_row(rows[-1], instrument)
+            rows = [row for row in list(csv.reader(handle))[1:] if row]
+        rows.sort(key=lambda row: to_epoch_micros(datetime.fromisoformat(row[0])))
+        return rows[-count:]
+
+    def _tail_rows(self, path: Path, count: int) -> list[list[str]]:
+        """Parse the last ``count`` data rows by reading blocks backward from EOF."""
 
-    def history(self, instrument: Instrument, limit: int | None = None) -> list[Quote]:
-        path = self._path_for(instrument)
         if not path.exists():
             return []
-        with path.open("r", newline="", encoding="utf-8") as handle:
-            rows = list(csv.reader(handle))
-        data_rows = rows[1:]
-        if limit:
-            data_rows = data_rows[-limit:]
-        return [self._parse_row(row, instrument) for row in data_rows]
+        with path.open("rb") as handle:
+            position = handle.seek(0, os.SEEK_END)
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= count:
+                step = min(_TAIL_BLOCK, position)
+                position -= step
+                handle.seek(position)
+                buffer = handle.read(step) + buffer
+        lines = buffer.splitlines()
+        if position == 0 and lines:
+            lines = lines[1:]
+        lines = [line for line in lines if line][-count:]
+        return list(csv.reader(line.decode("utf-8") for line in lines))
+
+    def _load_index(self, path: Path) -> tuple[list[int], list[int]]:
+        index_path = self._index_path_for(path)
+        if not index_path.exists():
+            self._rebuild_index(path)
+        stamps: list[int] = []
+        offsets: list[int] = []
+        with index_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                stamp, _, offset = line.strip().partition(",")
+                if offset:
+                    stamps.append(int(stamp))
+                    offsets.append(int(offset))
+        return stamps, offsets
+
+    def _rebuild_index(self, path: Path) -> None:
+        """Write the sidecar index for a CSV that predates it."""
+
+        entries: list[str] = []
+        last_indexed = -self.index_stride
+        if path.exists():
+            with path.open("rb") as handle:
+                offset = len(handle.readline())
+                for raw in handle:
+                    if offset - last_indexed >= self.index_stride:
+                        row = next(csv.reader([raw.decode("utf-8")]), None)
+                        if row:
+                            stamp = to_epoch_micros(datetime.fromisoformat(row[0]))
+                            entries.append(f"{stamp},{offset}\n")
+                            last_indexed = offset
+                    offset += len(raw)
+        self._index_path_for(path).write_text("".join(entries), encoding="utf-8")
+
+    def _appender_for(self, path: Path) -> _Appender:
+        appender = self._appenders.get(path)
+        if appender is not None:
+            self._appenders.move_to_end(path)
+            return appender
+        if self.partition is not None:
+            self._rotate(path)
+        if len(self._appenders) >= self.max_open_files:
+            _, evicted = self._appenders.popitem(last=False)
+            evicted.close()
+        if not path.exists():
+            self._create(path)
+        ordered = self._ordered(path)
+        last = self._last_rows(path, 1)
+        data = path.open("ab")
+        offsets = self._load_index(path)[1]
+        appender = _Appender(
+            data=data,
+            index=self._index_path_for(path).open("a", encoding="utf-8"),
+            offset=data.tell(),
+            last_indexed=offsets[-1] if offsets else -self.index_stride,
+            last_stamp=to_epoch_micros(datetime.fromisoformat(last[-1][0])) if last else None,
+            ordered=ordered,
+        )
+        self._appenders[path] = appender
+        return appender
+
+    def _rotate(self, path: Path) -> None:
+        """Close the previous partition of a series once writes move to a newer one."""
+
+        previous = self._active.get(path.parent)
+        if previous is not None and previous != path and previous.stem < path.stem:
+            appender = self._appenders.pop(previous, None)
+            if appender is not None:
+                appender.close()
+        if previous is None or previous.stem < path.stem:
+            self._active[path.parent] = path
+
+    def _create(self, path: Path, header: list[str] | None = None) -> None:
+        """Create a CSV with its header, publishing it via rename so readers never see a partial file."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.name}.tmp")
+        staging.write_bytes(_LineEncoder().encode(header or self._header()))
+        os.replace(staging, path)
+
+    def _path_for(self, instrument: Instrument, timestamp: datetime | None) -> Path:
+        if self.partition is None or timestamp is None:
+            return self.root / f"{self._series_name(instrument)}.csv"
+        fmt, _ = _PARTITIONS[self.partition]
+        return self._series_dir(instrument) / f"{ensure_utc(timestamp).strftime(fmt)}.csv"
+
+    def _bar_path_for(self, instrument: Instrument, interval_seconds: int) -> Path:
+        label = format_duration(interval_seconds)
+        if self.partition is None:
+            return self.root / f"{self._series_name(instrument)}.bars-{label}.csv"
+        return self._series_dir(instrument) / f"bars-{label}.csv"
+
+    def _series_dir(self, instrument: Instrument) -> Path:
+        return self.root / self._series_name(instrument)
+
+    @staticmethod
+    def _series_name(instrument: Instrument) -> str:
+        return instrument.symbol.lower().replace("/", "-")
+
+    @staticmethod
+    def _index_path_for(path: Path) -> Path:
+        return path.with_suffix(".idx")
 
-    def _path_for(self, instrument: Instrument) -> Path:
-        filename = instrument.symbol.lower().replace("/", "-")
-        return self.root / f"{filename}.csv"
+    @staticmethod
+    def _unordered_path_for(path: Path) -> Path:
+        return path.with_suffix(".unordered")
 
     @staticmethod
     def _header() -> list[str]:
@@ -89,3 +575,72 @@ class CsvStorage(Storage):
             currency=currency,
             provider=provider,
         )
+
+    @staticmethod
+    def _bar_header() -> list[str]:
+        return [
+            "start",
+            "provider",
+            "symbol",
+            "open",
+            "high",
+            "low",
+            "close",
+            "count",
+            "mean",
+            "variance",
+            "currency",
+        ]
+
+    @staticmethod
+    def _bar_row(bar: Bar) -> list[str]:
+        return [
+            bar.start.isoformat(),
+            bar.provider,
+            bar.instrument.symbol,
+            f"{bar.open:.10f}",
+            f"{bar.high:.10f}",
+            f"{bar.low:.10f}",
+            f"{bar.close:.10f}",
+            str(bar.count),
+            f"{bar.mean:.10f}",
+            repr(bar.variance),
+            bar.currency,
+        ]
+
+    @staticmethod
+    def _parse_bar(row: list[str], instrument: Instrument, interval_seconds: int) -> Bar:
+        return Bar(
+            instrument=instrument,
+            provider=row[1],
+            currency=row[10],
+            interval_seconds=interval_seconds,
+            start=datetime.fromisoformat(row[0]),
+            open=float(row[3]),
+            high=float(row[4]),
+            low=float(row[5]),
+            close=float(row[6]),
+            count=int(row[7]),
+            mean=float(row[8]),
+            variance=float(row[9]),
+        )
+
+
+def _in_range(stamp: int, start_us: int | None, end_us: int | None) -> bool:
+    return (start_us is None or stamp >= start_us) and (end_us is None or stamp <= end_us)
+
+
+def _column_arrays(stamps: list[str], prices: list[str]) -> tuple[Any, Any]:
+    """Convert raw CSV fields to ``(timestamps_ns, prices)`` arrays in bulk."""
+
+    values = np.array(prices, dtype=np.float64)
+    naive = [stamp[: -len(_UTC_SUFFIX)] for stamp in stamps if stamp.endswith(_UTC_SUFFIX)]
+    if len(naive) == len(stamps):
+        # Rows are written as UTC ISO strings, which NumPy parses without per-row datetimes.
+        return np.array(naive, dtype="datetime64[ns]").astype(np.int64), values
+    timestamps = np.fromiter(
+        (to_epoch_micros(datetime.fromisoformat(stamp)) * 1000 for stamp in stamps),
+        dtype=np.int64,
+        count=len(stamps),
+    )
+    return timestamps, values
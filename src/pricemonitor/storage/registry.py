@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from pricemonitor.config.loader import ConfigError
+from pricemonitor.config.models import StorageConfig
+from pricemonitor.storage.base import Storage
+from pricemonitor.storage.binary import BinaryStorage
+from pricemonitor.storage.buffered import BufferedStorage
+from pricemonitor.storage.csv import CsvStorage
+from pricemonitor.storage.sharded import ShardedStorage
+from pricemonitor.storage.sqlite import SqliteStorage
+
+
+def build_storage(config: StorageConfig, write_behind: bool | None = None) -> Storage:
+    """Construct the configured backend, wrapped in write-behind buffering if enabled."""
+
+    if config.shards > 1:
+        return ShardedStorage(
+            [build_storage(shard_storage_config(config, index), write_behind) for index in range(config.shards)]
+        )
+
+    root = Path(config.root)
+    if config.backend == "csv":
+        try:
+            storage: Storage = CsvStorage(root, partition=config.partition)
+        except ValueError as exc:
+            raise ConfigError(str(exc)) from exc
+    elif config.backend == "binary":
+        try:
+            storage = BinaryStorage(root)
+        except RuntimeError as exc:
+            raise ConfigError(str(exc)) from exc
+    elif config.backend == "sqlite":
+        storage = SqliteStorage(root)
+    else:
+        raise ConfigError(f"Storage backend '{config.backend}' is not implemented yet.")
+
+    if write_behind is None:
+        write_behind = config.write_behind
+    if write_behind:
+        storage = BufferedStorage(
+            storage,
+            max_batch=config.flush_max_quotes,
+            max_delay=config.flush_interval_seconds,
+            max_pending=config.max_pending_quotes,
+        )
+    return storage
+
+
+def shard_storage_config(config: StorageConfig, index: int) -> StorageConfig:
+    """Config of the single partition written by shard ``index``."""
+
+    return replace(config, root=str(Path(config.root) / f"shard-{index}"), shards=1)
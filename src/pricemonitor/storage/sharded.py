@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.base import Storage
+from pricemonitor.utils.hashring import HashRing
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class ShardedStorage(Storage):
+    """Storage split into per-shard backends, as written by the sharded runner.
+
+    Writes go to the shard owning ``(provider, symbol)`` on the hash ring, the
+    same placement the sharded runner uses for its workers. Reads fan out to
+    every shard and merge by time, so callers see one logical store.
+    """
+
+    def __init__(self, shards: Sequence[Storage]) -> None:
+        self.shards = list(shards)
+        self.ring = HashRing(len(self.shards))
+
+    def append_quote(self, quote: Quote) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        routed: dict[int, list[Quote]] = {}
+        for quote in quotes:
+            routed.setdefault(self.ring.node_for(quote.provider, quote.instrument.symbol), []).append(quote)
+        for shard, batch in routed.items():
+            self.shards[shard].append_quotes(batch)
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        routed: dict[int, list[Bar]] = {}
+        for bar in bars:
+            routed.setdefault(self.ring.node_for(bar.provider, bar.instrument.symbol), []).append(bar)
+        for shard, batch in routed.items():
+            self.shards[shard].append_bars(batch)
+
+    def latest(self, instrument: Instrument) -> Quote | None:
+        quotes = [quote for quote in (shard.latest(instrument) for shard in self.shards) if quote is not None]
+        return max(quotes, key=lambda quote: quote.timestamp, default=None)
+
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        merged = list(
+            heapq.merge(
+                *(shard.history(instrument, limit=limit, start=start, end=end) for shard in self.shards),
+                key=lambda quote: quote.timestamp,
+            )
+        )
+        return merged[-limit:] if limit else merged
+
+    def history_arrays(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[Any, Any]:
+        if np is None:
+            raise NotImplementedError("history_arrays requires NumPy")
+        parts = []
+        for shard in self.shards:
+            history_arrays = getattr(shard, "history_arrays", None)
+            if history_arrays is None:
+                raise NotImplementedError(f"{type(shard).__name__} does not provide history_arrays")
+            parts.append(history_arrays(instrument, limit=limit, start=start, end=end))
+        timestamps = np.concatenate([np.asarray(stamps, dtype=np.int64) for stamps, _ in parts])
+        prices = np.concatenate([np.asarray(values, dtype=np.float64) for _, values in parts])
+        order = np.argsort(timestamps, kind="stable")
+        if limit:
+            order = order[-limit:]
+        return timestamps[order], prices[order]
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        return heapq.merge(
+            *(shard.iter_history(instrument, start=start, end=end) for shard in self.shards),
+            key=lambda quote: quote.timestamp,
+        )
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        merged = list(
+            heapq.merge(
+                *(shard.bars(instrument, interval_seconds, limit=limit, start=start, end=end) for shard in self.shards),
+                key=lambda bar: bar.start,
+            )
+        )
+        return merged[-limit:] if limit else merged
+
+    def flush(self) -> None:
+        for shard in self.shards:
+            flush = getattr(shard, "flush", None)
+            if flush is not None:
+                flush()
+
+    def close(self) -> None:
+        for shard in self.shards:
+            close = getattr(shard, "close", None)
+            if close is not None:
+                close()
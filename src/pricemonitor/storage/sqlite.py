@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.instruments import Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.base import Storage
+from pricemonitor.utils.time import to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS quotes (
+        provider TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        ts_us INTEGER NOT NULL,
+        price REAL NOT NULL,
+        currency TEXT NOT NULL
+    )
+    """,
+    # Storage reads are keyed by symbol alone, so (symbol, ts_us) serves every query; a
+    # (provider, symbol, ts_us) index was never used and only doubled index writes.
+    "DROP INDEX IF EXISTS quotes_provider_symbol_ts",
+    "CREATE INDEX IF NOT EXISTS quotes_symbol_ts ON quotes (symbol, ts_us)",
+    """
+    CREATE TABLE IF NOT EXISTS bars (
+        provider TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        interval_s INTEGER NOT NULL,
+        start_us INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        variance REAL NOT NULL,
+        currency TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS bars_symbol_interval_start ON bars (symbol, interval_s, start_us)",
+)
+
+_INSERT = "INSERT INTO quotes (provider, symbol, ts_us, price, currency) VALUES (?, ?, ?, ?, ?)"
+_LATEST = "SELECT provider, ts_us, price, currency FROM quotes WHERE symbol = ? ORDER BY ts_us DESC LIMIT 1"
+_RANGE = (
+    "SELECT provider, ts_us, price, currency FROM quotes "
+    "WHERE symbol = ? AND ts_us >= ? AND ts_us <= ? ORDER BY ts_us"
+)
+_RANGE_TAIL = (
+    "SELECT provider, ts_us, price, currency FROM quotes "
+    "WHERE symbol = ? AND ts_us >= ? AND ts_us <= ? ORDER BY ts_us DESC LIMIT ?"
+)
+
+# Columns only, for history_arrays.
+_RANGE_COLUMNS = "SELECT ts_us, price FROM quotes WHERE symbol = ? AND ts_us >= ? AND ts_us <= ? ORDER BY ts_us"
+_RANGE_COLUMNS_TAIL = (
+    "SELECT ts_us, price FROM quotes WHERE symbol = ? AND ts_us >= ? AND ts_us <= ? ORDER BY ts_us DESC LIMIT ?"
+)
+_COLUMNS_DTYPE = [("ts_us", "<i8"), ("price", "<f8")]
+
+_INSERT_BAR = (
+    "INSERT INTO bars (provider, symbol, interval_s, start_us, open, high, low, close, count, mean, variance, currency) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_BAR_COLUMNS = "provider, start_us, open, high, low, close, count, mean, variance, currency"
+_BAR_RANGE = (
+    f"SELECT {_BAR_COLUMNS} FROM bars "
+    "WHERE symbol = ? AND interval_s = ? AND start_us >= ? AND start_us <= ? ORDER BY start_us"
+)
+_BAR_RANGE_TAIL = (
+    f"SELECT {_BAR_COLUMNS} FROM bars "
+    "WHERE symbol = ? AND interval_s = ? AND start_us >= ? AND start_us <= ? ORDER BY start_us DESC LIMIT ?"
+)
+
+# Keyset page for iter_history; each page runs on whichever thread asks for it. The bare
+# ``ts_us >= ?`` gives SQLite an index lower bound, so a page seeks rather than rescanning.
+_RANGE_PAGE = (
+    "SELECT rowid, provider, ts_us, price, currency FROM quotes "
+    "WHERE symbol = ? AND ts_us >= ? AND (ts_us > ? OR rowid > ?) AND ts_us <= ? "
+    "ORDER BY ts_us, rowid LIMIT ?"
+)
+_PAGE_SIZE = 5000
+
+_MIN_TS = -(2**63)
+_MAX_TS = 2**63 - 1
+
+
+def _from_epoch_micros(value: int) -> datetime:
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micros)
+
+
+class SqliteStorage(Storage):
+    """SQLite storage in WAL mode with batched inserts and an indexed time axis.
+
+    Each thread gets its own connection, so the write-behind writer thread can
+    commit while API readers query concurrently under WAL. Statements are
+    constant SQL strings served from sqlite3's prepared-statement cache.
+    """
+
+    filename = "quotes.sqlite3"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / self.filename
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        connection = self._connection()
+        with connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def append_quote(self, quote: Quote) -> None:
+        self.append_quotes([quote])
+
+    def append_quotes(self, quotes: Iterable[Quote]) -> None:
+        rows = [
+            (
+                quote.provider,
+                quote.instrument.symbol,
+                to_epoch_micros(quote.timestamp),
+                quote.price,
+                quote.currency,
+            )
+            for quote in quotes
+        ]
+        if not rows:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany(_INSERT, rows)
+
+    def latest(self, instrument: Instrument) -> Quote | None:
+        row = self._connection().execute(_LATEST, (instrument.symbol,)).fetchone()
+        if row is None:
+            return None
+        return self._to_quote(row, instrument)
+
+    def history(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Quote]:
+        lower = to_epoch_micros(start) if start is not None else _MIN_TS
+        upper = to_epoch_micros(end) if end is not None else _MAX_TS
+        connection = self._connection()
+        if limit:
+            rows = connection.execute(_RANGE_TAIL, (instrument.symbol, lower, upper, limit)).fetchall()
+            rows.reverse()
+        else:
+            rows = connection.execute(_RANGE, (instrument.symbol, lower, upper)).fetchall()
+        return [self._to_quote(row, instrument) for row in rows]
+
+    def history_arrays(
+        self,
+        instrument: Instrument,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[Any, Any]:
+        """Return ``(timestamps_ns, prices)`` for the ``history`` selection, selecting only those columns."""
+
+        if np is None:
+            raise NotImplementedError("SQLite history_arrays requires NumPy")
+        lower = to_epoch_micros(start) if start is not None else _MIN_TS
+        upper = to_epoch_micros(end) if end is not None else _MAX_TS
+        connection = self._connection()
+        if limit:
+            rows = connection.execute(_RANGE_COLUMNS_TAIL, (instrument.symbol, lower, upper, limit)).fetchall()
+            rows.reverse()
+        else:
+            rows = connection.execute(_RANGE_COLUMNS, (instrument.symbol, lower, upper)).fetchall()
+        records = np.array(rows, dtype=_COLUMNS_DTYPE)
+        return records["ts_us"] * 1000, records["price"]
+
+    def iter_history(
+        self,
+        instrument: Instrument,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Quote]:
+        # Rowids are positive, so the first page takes every row stamped ``start`` or later.
+        last_ts = to_epoch_micros(start) if start is not None else _MIN_TS
+        last_rowid = 0
+        upper = to_epoch_micros(end) if end is not None else _MAX_TS
+        while True:
+            rows = (
+                self._connection()
+                .execute(_RANGE_PAGE, (instrument.symbol, last_ts, last_ts, last_rowid, upper, _PAGE_SIZE))
+                .fetchall()
+            )
+            for row in rows:
+                yield self._to_quote(row[1:], instrument)
+            if len(rows) < _PAGE_SIZE:
+                return
+            last_rowid, _, last_ts = rows[-1][:3]
+
+    def append_bars(self, bars: Iterable[Bar]) -> None:
+        rows = [
+            (
+                bar.provider,
+                bar.instrument.symbol,
+                bar.interval_seconds,
+                to_epoch_micros(bar.start),
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.count,
+                bar.mean,
+                bar.variance,
+                bar.currency,
+            )
+            for bar in bars
+        ]
+        if not rows:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany(_INSERT_BAR, rows)
+
+    def bars(
+        self,
+        instrument: Instrument,
+        interval_seconds: int,
+        limit: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Bar]:
+        lower = to_epoch_micros(start) if start is not None else _MIN_TS
+        upper = to_epoch_micros(end) if end is not None else _MAX_TS
+        connection = self._connection()
+        params = (instrument.symbol, interval_seconds, lower, upper)
+        if limit:
+            rows = connection.execute(_BAR_RANGE_TAIL, (*params, limit)).fetchall()
+            rows.reverse()
+        else:
+            rows = connection.execute(_BAR_RANGE, params).fetchall()
+        return [
+            Bar(
+                instrument=instrument,
+                provider=provider,
+                currency=currency,
+                interval_seconds=interval_seconds,
+                start=_from_epoch_micros(start_us),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                count=count,
+                mean=mean,
+                variance=variance,
+            )
+            for provider, start_us, open_, high, low, close, count, mean, variance, currency in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @staticmethod
+    def _to_quote(row: tuple, instrument: Instrument) -> Quote:
+        provider, ts_us, price, currency = row
+        return Quote(
+            instrument=instrument,
+            price=price,
+            timestamp=_from_epoch_micros(ts_us),
+            currency=currency,
+            provider=provider,
+        )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from websockets.asyncio.server import serve
+except ImportError:  # pragma: no cover - optional dependency
+    serve = None
+
+
+class FakeBinanceStreamServer:
+    """Local stand-in for Binance combined WebSocket streams.
+
+    Clients connect to ``/stream?streams=btcusdt@aggTrade/...`` exactly as
+    they would upstream. ``push`` sends an aggTrade event to every connection
+    subscribed to the symbol, ``send_raw`` sends any frame as-is and
+    ``drop_connections`` force-closes clients to exercise reconnect and REST
+    fallback paths.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        if serve is None:
+            raise RuntimeError("websockets is required for the fake Binance stream server.")
+        self.host = host
+        self.port = port
+        self._server: Any = None
+        self._subscriptions: dict[Any, set[str]] = {}
+        self.connections_seen = 0
+        self._trade_id = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> FakeBinanceStreamServer:
+        self._server = await serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> FakeBinanceStreamServer:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def wait_for_subscribers(self, count: int = 1, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self._subscriptions) < count:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Expected {count} stream subscribers, have {len(self._subscriptions)}")
+            await asyncio.sleep(0.01)
+
+    async def push(self, symbol: str, price: float) -> int:
+        """Broadcast one aggTrade event; returns how many connections received it."""
+
+        self._trade_id += 1
+        now_ms = int(time.time() * 1000)
+        stream = f"{symbol.lower()}@aggTrade"
+        data = {
+            "e": "aggTrade",
+            "E": now_ms,
+            "s": symbol,
+            "a": self._trade_id,
+            "p": f"{price:.8f}",
+            "q": "1.00000000",
+            "T": now_ms,
+        }
+        message = json.dumps({"stream": stream, "data": data})
+        delivered = 0
+        for connection, streams in list(self._subscriptions.items()):
+            if stream in streams:
+                await connection.send(message)
+                delivered += 1
+        return delivered
+
+    async def send_raw(self, message: str | bytes) -> int:
+        """Send an arbitrary frame to every connection, e.g. to exercise malformed input."""
+
+        for connection in list(self._subscriptions):
+            await connection.send(message)
+        return len(self._subscriptions)
+
+    async def drop_connections(self) -> None:
+        for connection in list(self._subscriptions):
+            await connection.close()
+
+    async def _handle(self, connection: Any) -> None:
+        query = parse_qs(urlsplit(connection.request.path).query)
+        streams = set("/".join(query.get("streams", [])).split("/")) - {""}
+        self._subscriptions[connection] = streams
+        self.connections_seen += 1
+        try:
+            await connection.wait_closed()
+        finally:
+            self._subscriptions.pop(connection, None)
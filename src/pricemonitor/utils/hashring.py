@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_right
+
+
+def _hash(value: str) -> int:
+    # Stable across processes, unlike the built-in (randomised) ``hash``.
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys onto ``nodes`` shards.
+
+    Each shard owns ``replicas`` virtual points, so keys spread evenly and
+    changing the shard count only moves about ``1 / nodes`` of them.
+    """
+
+    def __init__(self, nodes: int, replicas: int = 64) -> None:
+        if nodes < 1:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes = nodes
+        points = sorted((_hash(f"{node}:{replica}"), node) for node in range(nodes) for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, *key: str) -> int:
+        if self.nodes == 1:
+            return 0
+        index = bisect_right(self._hashes, _hash("\x1f".join(key)))
+        return self._owners[index % len(self._owners)]
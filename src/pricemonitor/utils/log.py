@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
+
+ROOT_LOGGER = "pricemonitor"
+
+_listener: QueueListener | None = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including ``fields`` passed via ``log_event``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """Log ``event`` with structured ``fields``; a no-op when ``level`` is disabled."""
+
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
+
+
+def configure_logging(level: str | int | None = None, stream: TextIO | None = None) -> None:
+    """Route ``pricemonitor`` logs through a queue drained by a background thread.
+
+    Callers on the event loop only enqueue the record; formatting and the write
+    syscall happen on the listener thread. Safe to call more than once.
+    """
+
+    global _listener
+    if level is None:
+        level = os.environ.get("PRICEMONITOR_LOG_LEVEL", "INFO").upper()
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(StructuredFormatter())
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    logger.propagate = False
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
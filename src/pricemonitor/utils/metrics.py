@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Iterable, Sequence
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: tuple[str, ...], child: object) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+def _render_value(metric: _Metric, key: tuple[str, ...], value: float) -> str:
+    return f"{metric.name}{_format_labels(metric.labelnames, key)} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    """Monotonic counter; ``name`` should end in ``_total``."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def _render_child(self, key: tuple[str, ...], child: _CounterValue) -> Iterable[str]:
+        yield _render_value(self, key, child.value)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be set outright."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def _render_child(self, key: tuple[str, ...], child: _GaugeValue) -> Iterable[str]:
+        yield _render_value(self, key, child.value)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "total", "count", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; observations are O(log buckets) and lock-light."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def _render_child(self, key: tuple[str, ...], child: _Buckets) -> Iterable[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total, count = child.total, child.count
+        cumulative = 0
+        for bound, bucket in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, key)
+        yield f"{self.name}_sum{labels} {_format_value(total)}"
+        yield f"{self.name}_count{labels} {count}"
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text exposition format."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+FETCH_SECONDS = REGISTRY.histogram(
+    "pricemonitor_fetch_seconds",
+    "Provider fetch latency; symbol is 'batch' for multi-symbol requests.",
+    ("provider", "symbol"),
+)
+SCHEDULE_LAG_SECONDS = REGISTRY.histogram(
+    "pricemonitor_schedule_lag_seconds",
+    "Delay between a poll group's intended and actual fire time.",
+    ("provider",),
+)
+STORAGE_WRITE_SECONDS = REGISTRY.histogram(
+    "pricemonitor_storage_write_seconds",
+    "Time spent handing quotes to storage (enqueue) or committing them to the backend (flush).",
+    ("stage",),
+)
+TICKS = REGISTRY.counter("pricemonitor_ticks_total", "Quotes received from providers.", ("provider",))
+SKIPPED_TICKS = REGISTRY.counter(
+    "pricemonitor_skipped_ticks_total",
+    "Scheduled polls skipped because the previous fetch was still running or deadlines were missed.",
+    ("provider",),
+)
+ERRORS = REGISTRY.counter("pricemonitor_errors_total", "Errors by component and exception type.", ("component", "type"))
+IN_FLIGHT = REGISTRY.gauge("pricemonitor_in_flight", "Provider fetches currently running.", ("provider",))
+STORAGE_PENDING = REGISTRY.gauge("pricemonitor_storage_pending", "Quotes buffered for the storage writer.")
+STORAGE_DROPPED = REGISTRY.counter(
+    "pricemonitor_storage_dropped_total",
+    "Quotes dropped because the storage write-behind buffer was full.",
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram(
+    "pricemonitor_rate_limit_wait_seconds",
+    "Time requests spent queued for provider request-weight budget.",
+    ("provider",),
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "pricemonitor_circuit_state",
+    "Provider circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    ("provider",),
+)
+HEDGED_REQUESTS = REGISTRY.counter(
+    "pricemonitor_hedged_requests_total",
+    "Hedged provider requests by which copy answered first.",
+    ("provider", "winner"),
+)
+ALERTS = REGISTRY.counter(
+    "pricemonitor_alerts_total",
+    "Alert notifications delivered, by rule kind; suppressed repeats are not counted.",
+    ("provider", "kind"),
+)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+
+from pricemonitor.utils.backoff import exponential_backoff
+from pricemonitor.utils.metrics import RATE_LIMIT_WAIT_SECONDS
+
+# Lower values are served first when the budget is short. Pollers set this to
+# their schedule interval; anything that leaves it unset (API lookups) goes first.
+request_priority: ContextVar[float] = ContextVar("pricemonitor_request_priority", default=0.0)
+
+
+class WeightLimiter:
+    """Token bucket measured in request weight, kept in sync with the server's count.
+
+    The bucket refills ``capacity`` weight every ``window`` seconds. Callers
+    ``acquire`` the weight of a request before sending it; when the bucket is
+    short they queue, and queued requests are granted in ``request_priority``
+    order so the shortest-interval schedules keep their cadence. ``observe``
+    feeds back the server-reported used weight and rate-limit responses: a
+    ``Retry-After`` (or, without one, jittered exponential backoff) closes the
+    bucket until it expires.
+    """
+
+    def __init__(self, name: str, capacity: float, window: float = 60.0) -> None:
+        if capacity <= 0 or window <= 0:
+            raise ValueError("capacity and window must be positive")
+        self.name = name
+        self.capacity = float(capacity)
+        self.window = window
+        self.rate = self.capacity / window
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[float, int, float, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, weight: float, priority: float | None = None) -> None:
+        weight = min(float(weight), self.capacity)
+        if priority is None:
+            priority = request_priority.get()
+        self._refill()
+        if not self._waiters and self._ready(weight):
+            self.tokens -= weight
+            return
+
+        started = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), weight, future))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; hand the weight back.
+                self.tokens = min(self.capacity, self.tokens + weight)
+                self._schedule()
+            raise
+        RATE_LIMIT_WAIT_SECONDS.labels(self.name).observe(time.monotonic() - started)
+
+    def observe(self, used_weight: float | None = None, retry_after: float | None = None, limited: bool = False) -> None:
+        """Record the outcome of a request.
+
+        ``used_weight`` is the server's count for the current window; ``limited``
+        marks a 429/418 response, optionally carrying ``retry_after`` seconds.
+        """
+
+        self._refill()
+        if used_weight is not None:
+            self.tokens = min(self.tokens, max(0.0, self.capacity - used_weight))
+        if limited:
+            self.strikes += 1
+            delay = exponential_backoff(self.strikes - 1, base=1.0, cap=self.window)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.tokens = 0.0
+        else:
+            self.strikes = 0
+        self._schedule()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def headroom(self) -> float:
+        """Weight that could be spent right now without queueing behind anyone."""
+
+        self._refill()
+        if self.waiting or time.monotonic() < self.blocked_until:
+            return 0.0
+        return self.tokens
+
+    def _ready(self, weight: float) -> bool:
+        return time.monotonic() >= self.blocked_until and self.tokens >= weight
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._grant()
+        if not self._waiters:
+            return
+        weight = self._waiters[0][2]
+        now = time.monotonic()
+        delay = max(self.blocked_until - now, (weight - self.tokens) / self.rate, 0.0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._schedule()
+
+    def _grant(self) -> None:
+        self._refill()
+        while self._waiters:
+            _, _, weight, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._ready(weight):
+                return
+            heapq.heappop(self._waiters)
+            self.tokens -= weight
+            future.set_result(None)
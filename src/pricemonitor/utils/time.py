@@ -5,3 +5,45 @@ from datetime import datetime, timezone
 
 def utc_now() -> datetime:
     return datetime.now(tz=timezone.utc)
+
+
+def ensure_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def to_epoch_micros(value: datetime) -> int:
+    value = ensure_utc(value)
+    return int(value.timestamp()) * 1_000_000 + value.microsecond
+
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str | int | float) -> int:
+    """Parse ``"1s"``, ``"5m"``, ``"1h"`` or ``"1d"`` (or a bare number of seconds) into seconds."""
+
+    if isinstance(value, (int, float)):
+        seconds = int(value)
+    else:
+        text = value.strip()
+        unit = _DURATION_UNITS.get(text[-1:])
+        number = text[:-1] if unit else text
+        if not number.isdigit():
+            raise ValueError(f"Invalid duration: {value}")
+        seconds = int(number) * (unit or 1)
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {value}")
+    return seconds
+
+
+def format_duration(seconds: int) -> str:
+    """Inverse of ``parse_duration`` using the largest whole unit, e.g. ``300 -> "5m"``."""
+
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pricemonitor.analytics.alerts import AlertEngine, AlertEvent, AlertKind, AlertRule, _Ladder
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+class Collector:
+    def __init__(self) -> None:
+        self.events: list[AlertEvent] = []
+
+    def notify(self, events: list[AlertEvent]) -> None:
+        self.events.extend(events)
+
+
+def quote(price: float, seconds: float = 0.0) -> Quote:
+    return Quote(BTC, price, NOW + timedelta(seconds=seconds), "USDT", "binance")
+
+
+def rule(index: int) -> AlertRule:
+    return AlertRule(index, "binance", "BTCUSDT", AlertKind.ABOVE, 1.0)
+
+
+def test_ladder_matches_brute_force() -> None:
+    # A small bucket load forces splits, bulk merges and bucket removal.
+    generator = random.Random(7)
+    ladder = _Ladder(load=4)
+    entries: list[tuple[float, AlertRule]] = []
+    for index in range(60):
+        level = float(generator.randint(0, 40))
+        entries.append((level, rule(index)))
+        ladder.insert(*entries[-1])
+    bulk = [(float(generator.randint(0, 40)), rule(100 + index)) for index in range(30)]
+    ladder.extend([level for level, _ in bulk], [item for _, item in bulk])
+    entries.extend(bulk)
+    for level, item in generator.sample(entries, 45):
+        ladder.remove(level, item)
+        entries.remove((level, item))
+    assert len(ladder) == len(entries)
+
+    for _ in range(200):
+        low, high = sorted(generator.uniform(-5, 45) for _ in range(2))
+        up = ladder.crossed_up(low, high)
+        down = ladder.crossed_down(high, low)
+        assert sorted(level for level, _ in up) == [level for level, _ in up]
+        expected_up = sorted(id(item) for level, item in entries if low < level <= high)
+        expected_down = sorted(id(item) for level, item in entries if low <= level < high)
+        assert sorted(id(item) for _, item in up) == expected_up
+        assert sorted(id(item) for _, item in down) == expected_down
+        assert [level for level, _ in down] == sorted((level for level, _ in down), reverse=True)
+
+
+def test_above_and_below_fire_on_crossing_only() -> None:
+    sink = Collector()
+    engine = AlertEngine(sink)
+    above = engine.add("binance", "BTCUSDT", "above", 105.0, cooldown_seconds=0)
+    below = engine.add("binance", "BTCUSDT", AlertKind.BELOW, 95.0, cooldown_seconds=0)
+    engine.publish([quote(110.0)])
+    assert sink.events == []
+    engine.publish([quote(100.0, 1), quote(104.0, 2), quote(106.0, 3), quote(90.0, 4)])
+    assert [(event.rule_id, event.direction, event.level) for event in sink.events] == [
+        (above.id, "up", 105.0),
+        (below.id, "down", 95.0),
+    ]
+
+
+def test_cooldown_suppresses_repeats() -> None:
+    sink = Collector()
+    engine = AlertEngine(sink)
+    engine.add("binance", "BTCUSDT", "above", 100.0, cooldown_seconds=60)
+    prices = [99.0, 101.0, 99.0, 101.0, 99.0]
+    engine.publish([quote(price, seconds) for seconds, price in enumerate(prices)])
+    engine.publish([quote(101.0, 120)])
+    assert [event.timestamp for event in sink.events] == [NOW + timedelta(seconds=1), NOW + timedelta(seconds=120)]
+    assert engine.suppressed == 1
+
+
+def test_move_rearms_at_the_new_price() -> None:
+    sink = Collector()
+    engine = AlertEngine(sink)
+    move = engine.add("binance", "BTCUSDT", "move", 10.0, cooldown_seconds=0)
+    engine.publish([quote(100.0)])
+    assert move.reference == 100.0
+    engine.publish([quote(109.0, 1), quote(111.0, 2)])
+    assert [event.level for event in sink.events] == [pytest.approx(110.0)]
+    assert move.reference == 111.0
+    engine.publish([quote(100.5, 3), quote(99.8, 4)])
+    assert [event.level for event in sink.events][1:] == [pytest.approx(99.9)]
+
+
+def test_identical_rules_dedupe_and_remove_cleans_up() -> None:
+    engine = AlertEngine(Collector())
+    first = engine.add("binance", "BTCUSDT", "move", 5.0)
+    assert engine.add("binance", "BTCUSDT", "move", 5.0) is first
+    engine.publish([quote(100.0)])
+    assert engine.remove(first.id) is first
+    assert engine.remove(first.id) is None
+    assert len(engine) == 0 and engine.rules() == []
+    with pytest.raises(ValueError):
+        engine.add("binance", "BTCUSDT", "move", 100.0)
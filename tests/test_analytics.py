@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import math
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pricemonitor.analytics.bars import resample_ohlc
+from pricemonitor.analytics.series import AnalyticsError
+from pricemonitor.analytics.stats import rolling_mean, rolling_std, rolling_volatility
+
+SECOND = 1_000_000_000
+
+
+def test_resample_buckets_on_epoch_aligned_boundaries() -> None:
+    stamps = [0, 30 * SECOND, 61 * SECOND, 119 * SECOND, 120 * SECOND]
+    bars = resample_ohlc(stamps, [1.0, 3.0, 2.0, 5.0, 4.0], 60)
+    # 0 and 30 share the first minute, 61 and 119 the second, and 120 opens the third.
+    assert list(bars.start_ns) == [0, 60 * SECOND, 120 * SECOND]
+    assert list(bars.open) == [1.0, 2.0, 4.0]
+    assert list(bars.high) == [3.0, 5.0, 4.0]
+    assert list(bars.low) == [1.0, 2.0, 4.0]
+    assert list(bars.close) == [3.0, 5.0, 4.0]
+    assert list(bars.count) == [2, 2, 1]
+
+
+def test_resample_empty_input() -> None:
+    bars = resample_ohlc([], [], 60)
+    assert len(bars) == 0
+    assert bars.start_ns.dtype == np.int64 and bars.close.dtype == np.float64
+
+
+def test_rolling_mean_and_std_match_each_window() -> None:
+    values = [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]
+    assert list(rolling_mean(values, 3)) == pytest.approx([10 / 3, 4.0, 13 / 3, 14 / 3, 17 / 3, 7.0])
+    expected = [statistics.stdev(values[index : index + 4]) for index in range(len(values) - 3)]
+    assert list(rolling_std(values, 4)) == pytest.approx(expected)
+    assert len(rolling_mean(values, 9)) == 0
+    with pytest.raises(AnalyticsError):
+        rolling_mean(values, 0)
+
+
+def test_rolling_volatility_is_the_std_of_log_returns() -> None:
+    prices = [100.0, 101.0, 99.0, 102.0, 102.0]
+    returns = [math.log(later / earlier) for earlier, later in zip(prices, prices[1:])]
+    expected = [statistics.stdev(returns[:3]), statistics.stdev(returns[1:])]
+    assert list(rolling_volatility(prices, 3)) == pytest.approx(expected)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("yaml")
+
+from pathlib import Path
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from pricemonitor.app.api import AppContext, create_app
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.csv import CsvStorage
+from pricemonitor.utils.metrics import FETCH_SECONDS, IN_FLIGHT, REGISTRY, Counter
+
+SAMPLE_CONFIG = Path(__file__).resolve().parents[1] / "config"
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = create_app(context=AppContext.load(SAMPLE_CONFIG), embed_scheduler=False)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("heartbeat", ["0", "-1", "0.01", "301", "nan", "abc"])
+def test_stream_rejects_bad_heartbeat(client: TestClient, heartbeat: str) -> None:
+    response = client.get("/prices/stream", params={"heartbeat": heartbeat})
+    assert response.status_code == 422
+
+
+def test_stream_rejects_symbols_without_provider(client: TestClient) -> None:
+    response = client.get("/prices/stream", params={"symbols": "BTCUSDT"})
+    assert response.status_code == 422
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/prices/ws?symbols=BTCUSDT"):
+            pass
+    assert error.value.code == 1008
+
+
+def test_ws_provider_only_subscribes_to_all_its_symbols(client: TestClient) -> None:
+    bus = client.app.state.bus
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    quotes = [
+        Quote(Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO), 1.0, now, "USDT", provider)
+        for provider, symbol in [("binance", "BTCUSDT"), ("kraken", "XBTUSD"), ("binance", "ETHUSDT")]
+    ]
+    with client.websocket_connect("/prices/ws?provider=binance") as websocket:
+        client.portal.call(bus.publish, quotes)
+        received = websocket.receive_json()
+    assert sorted(item["symbol"] for item in received) == ["BTCUSDT", "ETHUSDT"]
+
+
+EXPORT_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def export_client(tmp_path: Path) -> TestClient:
+    context = AppContext.load(SAMPLE_CONFIG)
+    context.storage = CsvStorage(tmp_path)
+    # BTCUSDT on even seconds and ETHUSDT on odd ones, so a merged export alternates.
+    for symbol, offset in [("BTCUSDT", 0), ("ETHUSDT", 1)]:
+        instrument = context.instrument("binance", symbol)
+        context.storage.append_quotes(
+            Quote(instrument, float(second), EXPORT_START + timedelta(seconds=second), "USDT", "binance")
+            for second in range(offset, 10, 2)
+        )
+    app = create_app(context=context, embed_scheduler=False)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_export_ndjson_merges_symbols_in_time_order(export_client: TestClient) -> None:
+    response = export_client.get("/prices/export", params={"provider": "binance", "symbols": "BTCUSDT,ETHUSDT"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["price"] for row in rows] == [float(second) for second in range(10)]
+    assert [row["symbol"] for row in rows[:3]] == ["BTCUSDT", "ETHUSDT", "BTCUSDT"]
+    # Without symbols every configured instrument of the provider is exported.
+    everything = export_client.get("/prices/export", params={"provider": "binance"})
+    assert everything.text == response.text
+
+
+def test_export_csv_honours_start_and_end(export_client: TestClient) -> None:
+    params = {
+        "provider": "binance",
+        "symbols": "ETHUSDT,BTCUSDT",
+        "start": (EXPORT_START + timedelta(seconds=3)).isoformat(),
+        "end": (EXPORT_START + timedelta(seconds=6)).isoformat(),
+        "format": "csv",
+    }
+    response = export_client.get("/prices/export", params=params)
+    assert response.status_code == 200
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == ["timestamp", "provider", "symbol", "price", "currency"]
+    assert [(row[2], float(row[3])) for row in rows] == [
+        ("ETHUSDT", 3.0),
+        ("BTCUSDT", 4.0),
+        ("ETHUSDT", 5.0),
+        ("BTCUSDT", 6.0),
+    ]
+
+
+def test_export_rejects_unknown_symbols_and_formats(export_client: TestClient) -> None:
+    response = export_client.get("/prices/export", params={"provider": "binance", "symbols": "BTCUSDT,NOPE"})
+    assert response.status_code == 404
+    assert "NOPE" in response.json()["detail"]
+    response = export_client.get("/prices/export", params={"provider": "binance", "format": "xml"})
+    assert response.status_code == 400
+
+
+def test_metrics_exposition(client: TestClient) -> None:
+    provider = 'odd "name"\\with\nbreaks'
+    histogram = FETCH_SECONDS.labels(provider, "batch")
+    for seconds in (0.003, 0.2, 30.0):
+        histogram.observe(seconds)
+    IN_FLIGHT.labels(provider).inc(2)
+    IN_FLIGHT.labels(provider).dec()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == REGISTRY.content_type
+    lines = response.text.splitlines()
+    labels = 'provider="odd \\"name\\"\\\\with\\nbreaks",symbol="batch"'
+    assert "# TYPE pricemonitor_fetch_seconds histogram" in lines
+    assert f'pricemonitor_fetch_seconds_bucket{{{labels},le="0.001"}} 0' in lines
+    assert f'pricemonitor_fetch_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'pricemonitor_fetch_seconds_bucket{{{labels},le="0.25"}} 2' in lines
+    assert f'pricemonitor_fetch_seconds_bucket{{{labels},le="10"}} 2' in lines
+    assert f'pricemonitor_fetch_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f"pricemonitor_fetch_seconds_sum{{{labels}}} 30.203" in lines
+    assert f"pricemonitor_fetch_seconds_count{{{labels}}} 3" in lines
+    assert "# TYPE pricemonitor_in_flight gauge" in lines
+    assert 'pricemonitor_in_flight{provider="odd \\"name\\"\\\\with\\nbreaks"} 1' in lines
+
+
+def test_counters_only_go_up() -> None:
+    counter = Counter("test_total", "Test counter.")
+    counter.labels().inc(2)
+    with pytest.raises(ValueError):
+        counter.labels().inc(-1)
+    assert not hasattr(counter.labels(), "set")
+    assert counter.render() == ["# HELP test_total Test counter.", "# TYPE test_total counter", "test_total 2"]
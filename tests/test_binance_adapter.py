@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.providers.base import ProviderError, UnknownSymbolError
+from pricemonitor.providers.binance.adapter import BinanceProvider
+from pricemonitor.providers.binance.client import BinanceClient
+from pricemonitor.utils.metrics import ERRORS
+
+
+def instruments(*symbols: str) -> list[Instrument]:
+    return [Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO, quote="USDT") for symbol in symbols]
+
+
+class FakeTicker:
+    """``/api/v3/ticker/price`` that rejects unlisted symbols the way Binance does."""
+
+    def __init__(self, listed: set[str], omitted: set[str] = frozenset()) -> None:
+        self.listed = listed
+        self.omitted = omitted
+        self.requests: list[list[str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        symbols = json.loads(params["symbols"]) if "symbols" in params else [params["symbol"]]
+        self.requests.append(symbols)
+        if any(symbol not in self.listed for symbol in symbols):
+            return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+        items = [{"symbol": symbol, "price": "1.5"} for symbol in symbols if symbol not in self.omitted]
+        return httpx.Response(200, json=items if "symbols" in params else items[0])
+
+
+def provider_for(fake: FakeTicker) -> BinanceProvider:
+    return BinanceProvider(BinanceClient(transport=httpx.MockTransport(fake)))
+
+
+def run(provider: BinanceProvider, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await provider.close()
+
+    return asyncio.run(main())
+
+
+def test_one_request_per_batch() -> None:
+    symbols = [f"S{index}USDT" for index in range(10)]
+    fake = FakeTicker(set(symbols))
+    provider = provider_for(fake)
+    quotes = run(provider, provider.fetch_quotes(instruments(*symbols)))
+    assert [quote.instrument.symbol for quote in quotes] == symbols
+    assert fake.requests == [symbols]
+
+
+def test_batches_split_by_count_and_query_length() -> None:
+    symbols = [f"S{index}USDT" for index in range(50)]
+    provider = BinanceProvider(BinanceClient(transport=httpx.MockTransport(FakeTicker(set(symbols)))))
+    provider.max_batch_size = 20
+    assert [len(chunk) for chunk in provider._chunks(instruments(*symbols))] == [20, 20, 10]
+    provider.max_batch_size = 400
+    provider.max_query_length = 100
+    chunks = list(provider._chunks(instruments(*symbols)))
+    assert all(sum(len(item.symbol) + 9 for item in chunk) <= 100 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == 50
+    run(provider, asyncio.sleep(0))
+
+
+def test_unknown_symbol_is_bisected_out_and_quarantined() -> None:
+    symbols = [f"S{index}USDT" for index in range(16)]
+    fake = FakeTicker(set(symbols) - {"S5USDT"})
+    provider = provider_for(fake)
+
+    async def scenario():
+        first = await provider.fetch_quotes(instruments(*symbols))
+        requests = len(fake.requests)
+        fake.requests.clear()
+        second = await provider.fetch_quotes(instruments(*symbols))
+        return first, requests, second
+
+    first, requests, second = run(provider, scenario())
+    expected = [symbol for symbol in symbols if symbol != "S5USDT"]
+    assert [quote.instrument.symbol for quote in first] == expected
+    assert requests <= 1 + 2 * 4
+    assert provider.quarantined == ["S5USDT"]
+    assert [quote.instrument.symbol for quote in second] == expected
+    assert fake.requests == [expected]
+
+
+def test_quarantine_expires() -> None:
+    fake = FakeTicker({"AUSDT"})
+    provider = provider_for(fake)
+    provider.quarantine_seconds = 0.0
+
+    async def scenario():
+        await provider.fetch_quotes(instruments("AUSDT", "BUSDT"))
+        fake.requests.clear()
+        fake.listed.add("BUSDT")
+        return await provider.fetch_quotes(instruments("AUSDT", "BUSDT"))
+
+    quotes = run(provider, scenario())
+    assert [quote.instrument.symbol for quote in quotes] == ["AUSDT", "BUSDT"]
+    assert provider.quarantined == []
+
+
+def test_single_unknown_symbol_raises_without_tripping_breaker() -> None:
+    fake = FakeTicker(set())
+    provider = provider_for(fake)
+    with pytest.raises(UnknownSymbolError) as info:
+        run(provider, provider.fetch_quotes(instruments("NOPEUSDT")))
+    assert info.value.symbols == ("NOPEUSDT",)
+    assert provider.quarantined == ["NOPEUSDT"]
+
+
+def test_missing_symbols_are_reported(caplog: pytest.LogCaptureFixture) -> None:
+    fake = FakeTicker({"AUSDT", "BUSDT"}, omitted={"BUSDT"})
+    provider = provider_for(fake)
+    missing = ERRORS.labels("binance", "MissingSymbol")
+    before = missing.value
+    with caplog.at_level("WARNING"):
+        quotes = run(provider, provider.fetch_quotes(instruments("AUSDT", "BUSDT")))
+    assert [quote.instrument.symbol for quote in quotes] == ["AUSDT"]
+    assert missing.value == before + 1
+    (record,) = [record for record in caplog.records if record.getMessage() == "binance symbols missing from response"]
+    assert record.fields == {"symbols": "BUSDT"}
+
+
+class FlakyTicker(FakeTicker):
+    """Drops the connection for any request naming one of ``broken``."""
+
+    def __init__(self, listed: set[str], broken: set[str]) -> None:
+        super().__init__(listed)
+        self.broken = broken
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        response = super().__call__(request)
+        if self.broken.intersection(self.requests[-1]):
+            raise httpx.ConnectError("connection reset", request=request)
+        return response
+
+
+def test_failed_chunk_keeps_quotes_from_the_others(caplog: pytest.LogCaptureFixture) -> None:
+    symbols = [f"S{index}USDT" for index in range(6)]
+    provider = provider_for(FlakyTicker(set(symbols), broken={"S4USDT"}))
+    provider.max_batch_size = 2
+    with caplog.at_level("WARNING"):
+        quotes = run(provider, provider.fetch_quotes(instruments(*symbols)))
+    assert [quote.instrument.symbol for quote in quotes] == ["S0USDT", "S1USDT", "S2USDT", "S3USDT"]
+    (record,) = [record for record in caplog.records if record.getMessage() == "binance batch failed"]
+    assert record.fields["symbols"] == "S4USDT,S5USDT"
+
+
+def test_fetch_raises_when_every_chunk_fails() -> None:
+    symbols = [f"S{index}USDT" for index in range(4)]
+    provider = provider_for(FlakyTicker(set(symbols), broken=set(symbols)))
+    provider.max_batch_size = 2
+    with pytest.raises(ProviderError):
+        run(provider, provider.fetch_quotes(instruments(*symbols)))
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.providers.binance.adapter import BinanceProvider
+from pricemonitor.providers.binance.stream import BinanceStream
+from pricemonitor.testing.fake_binance import FakeBinanceStreamServer
+
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+ETH = Instrument(symbol="ETHUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("condition not met")
+        await asyncio.sleep(0.01)
+
+
+class Collector:
+    def __init__(self) -> None:
+        self.batches: list[list[Quote]] = []
+
+    def __call__(self, quotes: list[Quote]) -> None:
+        self.batches.append(quotes)
+
+    @property
+    def quotes(self) -> list[Quote]:
+        return [quote for batch in self.batches for quote in batch]
+
+
+async def _with_stream(scenario, max_streams: int = 200) -> None:
+    provider = BinanceProvider()
+    async with FakeBinanceStreamServer() as server:
+        stream = BinanceStream(provider, [BTC, ETH], base_url=server.url, max_streams=max_streams)
+        collector = Collector()
+        worker = asyncio.create_task(stream.run(collector))
+        try:
+            await server.wait_for_subscribers()
+            await wait_until(lambda: stream.healthy)
+            await scenario(server, stream, collector)
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            await provider.close()
+
+
+def test_stream_delivers_trades() -> None:
+    async def scenario(server, stream, collector) -> None:
+        assert await server.push("BTCUSDT", 101.5) == 1
+        assert await server.push("ETHUSDT", 3.25) == 1
+        await wait_until(lambda: len(collector.quotes) == 2)
+        btc, eth = collector.quotes
+        assert (btc.instrument.symbol, btc.price, btc.provider, btc.currency) == ("BTCUSDT", 101.5, "binance", "USDT")
+        assert (eth.instrument.symbol, eth.price) == ("ETHUSDT", 3.25)
+        assert stream.covers("BTCUSDT") and stream.covers("ETHUSDT")
+
+    asyncio.run(_with_stream(scenario))
+
+
+def test_stream_batches_buffered_frames() -> None:
+    async def scenario(server, stream, collector) -> None:
+        for price in range(1, 51):
+            await server.push("BTCUSDT", float(price))
+        await wait_until(lambda: len(collector.quotes) == 50)
+        assert [quote.price for quote in collector.quotes] == [float(price) for price in range(1, 51)]
+        assert len(collector.batches) < 50
+
+    asyncio.run(_with_stream(scenario))
+
+
+def test_stream_splits_connections() -> None:
+    async def scenario(server, stream, collector) -> None:
+        assert server.connections_seen == 2
+        await server.push("ETHUSDT", 2.0)
+        await wait_until(lambda: len(collector.quotes) == 1)
+
+    asyncio.run(_with_stream(scenario, max_streams=1))
+
+
+def test_stream_reconnects_after_disconnect() -> None:
+    async def scenario(server, stream, collector) -> None:
+        await server.drop_connections()
+        await wait_until(lambda: not stream.covers("BTCUSDT"))
+        await wait_until(lambda: server.connections_seen == 2 and stream.healthy)
+        await server.push("BTCUSDT", 99.0)
+        await wait_until(lambda: len(collector.quotes) == 1)
+        assert collector.quotes[0].price == 99.0
+
+    asyncio.run(_with_stream(scenario))
+
+
+def test_stream_survives_malformed_frames() -> None:
+    async def scenario(server, stream, collector) -> None:
+        for frame in (
+            "not json",
+            "[1, 2]",
+            json.dumps({"data": {"s": "BTCUSDT", "p": "1.0"}}),
+            json.dumps({"data": {"s": "BTCUSDT", "p": "abc", "T": 1}}),
+            json.dumps({"data": {"s": "BTCUSDT", "p": "1.0", "T": 10**20}}),
+        ):
+            await server.send_raw(frame)
+        await server.push("BTCUSDT", 42.0)
+        await wait_until(lambda: len(collector.quotes) == 1)
+        assert collector.quotes[0].price == 42.0
+        assert server.connections_seen == 1
+        assert stream.healthy
+
+    asyncio.run(_with_stream(scenario))
+
+
+def test_parse_ignores_unknown_symbols_and_events() -> None:
+    stream = BinanceStream(BinanceProvider(), [BTC], connect=lambda *args, **kwargs: None)
+    assert stream.parse(json.dumps({"data": {"s": "XRPUSDT", "p": "1", "T": 1}})) is None
+    assert stream.parse(json.dumps({"result": None, "id": 1})) is None
+    quote = stream.parse(json.dumps({"data": {"s": "BTCUSDT", "p": "2.5", "T": 1_700_000_000_000}}))
+    assert quote is not None and quote.price == 2.5
+    assert quote.timestamp.timestamp() == 1_700_000_000
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.bus import QuoteBus
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class Encoder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, quote: Quote) -> str:
+        self.calls += 1
+        return f"{quote.provider}:{quote.instrument.symbol}:{quote.price}"
+
+
+def quote(price: float, symbol: str = "BTCUSDT", provider: str = "binance") -> Quote:
+    return Quote(Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO), price, NOW, "USDT", provider)
+
+
+def test_subscription_keeps_only_the_newest_quote_per_key() -> None:
+    async def scenario() -> None:
+        bus = QuoteBus(Encoder())
+        subscription = bus.subscribe([("binance", "BTCUSDT"), ("binance", "ETHUSDT")])
+        bus.publish([quote(1.0), quote(2.0), quote(10.0, "ETHUSDT"), quote(3.0)])
+        assert sorted(await subscription.get(timeout=0.1)) == ["binance:BTCUSDT:3.0", "binance:ETHUSDT:10.0"]
+        assert await subscription.get(timeout=0.01) == []
+        bus.publish([quote(4.0)])
+        assert await subscription.get(timeout=0.1) == ["binance:BTCUSDT:4.0"]
+
+    asyncio.run(scenario())
+
+
+def test_keys_providers_and_wildcard_filter_quotes() -> None:
+    async def scenario() -> None:
+        encode = Encoder()
+        bus = QuoteBus(encode)
+        keyed = bus.subscribe([("binance", "BTCUSDT")])
+        provider_wide = bus.subscribe(providers=["binance"])
+        everything = bus.subscribe()
+        bus.publish([quote(1.0), quote(2.0, "ETHUSDT"), quote(3.0, provider="kraken")])
+        assert await keyed.get(timeout=0.1) == ["binance:BTCUSDT:1.0"]
+        assert sorted(await provider_wide.get(timeout=0.1)) == ["binance:BTCUSDT:1.0", "binance:ETHUSDT:2.0"]
+        assert len(await everything.get(timeout=0.1)) == 3
+        # Each quote is encoded once however many subscribers receive it.
+        assert encode.calls == 3
+
+        for subscription in (keyed, provider_wide, everything):
+            bus.unsubscribe(subscription)
+        assert bus.subscriber_count == 0
+        bus.publish([quote(4.0)])
+        assert encode.calls == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.cache import LatestCache
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def quote(symbol: str, price: float = 1.0, asset_class: AssetClass = AssetClass.CRYPTO) -> Quote:
+    return Quote(Instrument(symbol=symbol, asset_class=asset_class), price, NOW, "USD", "binance")
+
+
+class Loader:
+    def __init__(self, delay: float = 0.02, error: BaseException | None = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, symbol: str):
+        async def load() -> Quote:
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return quote(symbol, float(self.calls))
+
+        return load
+
+
+def test_concurrent_gets_share_one_load() -> None:
+    async def scenario() -> None:
+        cache = LatestCache()
+        loader = Loader()
+        key = ("binance", "BTCUSDT")
+        results = await asyncio.gather(*(cache.get(key, loader("BTCUSDT")) for _ in range(50)))
+        assert loader.calls == 1
+        assert {result.price for result in results} == {1.0}
+        assert (cache.misses, cache.coalesced, cache.hits) == (1, 49, 0)
+        await cache.get(key, loader("BTCUSDT"))
+        assert cache.hits == 1 and loader.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_shared_but_not_cached() -> None:
+    async def scenario() -> None:
+        cache = LatestCache()
+        key = ("binance", "BTCUSDT")
+        failing = Loader(error=RuntimeError("upstream down"))
+        results = await asyncio.gather(*(cache.get(key, failing("BTCUSDT")) for _ in range(5)), return_exceptions=True)
+        assert failing.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(cache) == 0
+        assert (await cache.get(key, Loader()("BTCUSDT"))).price == 1.0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_load() -> None:
+    async def scenario() -> None:
+        cache = LatestCache()
+        loader = Loader(delay=0.05)
+        key = ("binance", "BTCUSDT")
+        first = asyncio.ensure_future(cache.get(key, loader("BTCUSDT")))
+        second = asyncio.ensure_future(cache.get(key, loader("BTCUSDT")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second).price == 1.0
+        assert loader.calls == 1
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(scenario())
+
+
+def test_ttl_by_asset_class_and_lru_bound() -> None:
+    async def scenario() -> None:
+        cache = LatestCache(ttls={AssetClass.CRYPTO: 0.02, AssetClass.FX: 60.0}, max_entries=2)
+        cache.put(quote("BTCUSDT"))
+        cache.put(quote("EURUSD", asset_class=AssetClass.FX))
+        await asyncio.sleep(0.03)
+        assert cache.peek(("binance", "BTCUSDT")) is None
+        assert cache.peek(("binance", "EURUSD")) is not None
+        cache.put(quote("GBPUSD", asset_class=AssetClass.FX))
+        cache.put(quote("USDJPY", asset_class=AssetClass.FX))
+        assert len(cache) == 2
+        assert cache.peek(("binance", "EURUSD")) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from pricemonitor.analytics.derived import DerivedDefinition, DerivedEngine
+from pricemonitor.config.loader import load_app_config
+from pricemonitor.config.models import DERIVED_PROVIDER, AppConfig
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote, Tick
+from pricemonitor.scheduler.runner import build_derived, build_pipeline
+from pricemonitor.scheduler.supervisor import shard_config
+
+SAMPLE_CONFIG = Path(__file__).resolve().parents[1] / "config"
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def tick(provider: str, symbol: str, price: float, seconds: float = 0.0) -> Tick:
+    instrument = Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO)
+    return Tick(instrument, price, NOW + timedelta(seconds=seconds), "USD", provider)
+
+
+def definition(symbol: str, *legs: tuple[str, str, int], max_skew: float | None = None) -> DerivedDefinition:
+    return DerivedDefinition(
+        instrument=Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO),
+        currency="USD",
+        legs=tuple(((provider, name), power) for provider, name, power in legs),
+        max_skew_seconds=max_skew,
+    )
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.batches: list[list[Quote]] = []
+
+    def __call__(self, quotes: list[Quote]) -> None:
+        self.batches.append(quotes)
+
+    def publish(self, quotes: list[Quote]) -> None:
+        self.batches.append(quotes)
+
+
+@pytest.fixture(scope="module")
+def sample() -> AppConfig:
+    pytest.importorskip("yaml")
+    return load_app_config(SAMPLE_CONFIG)
+
+
+def test_product_and_quotient() -> None:
+    emitted = Recorder()
+    engine = DerivedEngine(
+        [
+            definition("ETHBTC", ("binance", "ETHUSDT", 1), ("binance", "BTCUSDT", -1)),
+            definition("BTCUSD", ("binance", "BTCUSDT", 1), ("tv", "USDTUSD", 1)),
+        ],
+        emit=emitted,
+    )
+    engine.publish([tick("binance", "BTCUSDT", 50_000.0)])
+    assert emitted.batches == []
+    engine.publish([tick("binance", "ETHUSDT", 2_500.0), tick("tv", "USDTUSD", 0.999)])
+    (batch,) = emitted.batches
+    prices = {quote.instrument.symbol: quote.price for quote in batch}
+    assert prices == {"ETHBTC": pytest.approx(0.05), "BTCUSD": pytest.approx(49_950.0)}
+    assert all(quote.provider == DERIVED_PROVIDER for quote in batch)
+
+
+def test_chained_definitions_evaluate_once_in_dependency_order() -> None:
+    emitted = Recorder()
+    engine = DerivedEngine(
+        [
+            # Listed before its input on purpose.
+            definition("GOLDBTC", ("tv", "XAUUSD", 1), (DERIVED_PROVIDER, "BTCUSD", -1)),
+            definition("BTCUSD", ("binance", "BTCUSDT", 1), ("tv", "USDTUSD", 1)),
+        ],
+        emit=emitted,
+    )
+    engine.publish([tick("binance", "BTCUSDT", 40_000.0), tick("tv", "USDTUSD", 1.0), tick("tv", "XAUUSD", 2_000.0)])
+    (batch,) = emitted.batches
+    assert [quote.instrument.symbol for quote in batch] == ["BTCUSD", "GOLDBTC"]
+    assert batch[1].price == pytest.approx(0.05)
+
+    emitted.batches.clear()
+    engine.publish([tick("tv", "XAUUSD", 4_000.0)])
+    (batch,) = emitted.batches
+    assert [(quote.instrument.symbol, quote.price) for quote in batch] == [("GOLDBTC", pytest.approx(0.1))]
+
+
+def test_cycle_rejected() -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        DerivedEngine([definition("A", (DERIVED_PROVIDER, "B", 1)), definition("B", (DERIVED_PROVIDER, "A", 1))])
+
+
+def test_skew_zero_divisor_and_own_output_ignored() -> None:
+    emitted = Recorder()
+    engine = DerivedEngine(
+        [definition("ETHBTC", ("binance", "ETHUSDT", 1), ("binance", "BTCUSDT", -1), max_skew=5)],
+        emit=emitted,
+    )
+    engine.publish([tick("binance", "ETHUSDT", 2_500.0), tick("binance", "BTCUSDT", 50_000.0, seconds=10)])
+    engine.publish([tick("binance", "ETHUSDT", 2_500.0, seconds=10), tick("binance", "BTCUSDT", 0.0, seconds=10)])
+    engine.publish([tick(DERIVED_PROVIDER, "ETHUSDT", 1.0)])
+    assert emitted.batches == []
+    engine.publish([tick("binance", "BTCUSDT", 50_000.0, seconds=12)])
+    assert engine.latest("ETHBTC").price == pytest.approx(0.05)
+
+
+def test_sample_config_prices_eth_in_btc(sample: AppConfig) -> None:
+    emitted = Recorder()
+    engine = DerivedEngine(build_derived(sample), emit=emitted)
+    engine.publish([tick("binance", "ETHUSDT", 3_000.0), tick("binance", "BTCUSDT", 60_000.0, seconds=3)])
+    ethbtc = engine.latest("ETHBTC")
+    assert ethbtc is not None
+    assert ethbtc.price == pytest.approx(0.05)
+    assert ethbtc.currency == "BTC"
+
+
+class MemoryStorage:
+    def __init__(self, log: list[tuple[str, list[str]]]) -> None:
+        self.log = log
+
+    def append_quotes(self, quotes: list[Quote]) -> None:
+        self.log.append(("storage", [quote.instrument.symbol for quote in quotes]))
+
+    def append_bars(self, bars: list) -> None:
+        pass
+
+
+class LoggingSink:
+    def __init__(self, log: list[tuple[str, list[str]]]) -> None:
+        self.log = log
+
+    def publish(self, quotes: list[Quote]) -> None:
+        self.log.append(("sink", [quote.instrument.symbol for quote in quotes]))
+
+
+def test_pipeline_delivers_inputs_before_derived_quotes(sample: AppConfig) -> None:
+    log: list[tuple[str, list[str]]] = []
+    pipeline = build_pipeline(sample, MemoryStorage(log), [LoggingSink(log)])
+    pipeline.deliver([tick("binance", "ETHUSDT", 3_000.0)])
+    log.clear()
+    pipeline.deliver([tick("binance", "BTCUSDT", 60_000.0)])
+    assert log == [
+        ("storage", ["BTCUSDT"]),
+        ("sink", ["BTCUSDT"]),
+        ("storage", ["ETHBTC"]),
+        ("sink", ["ETHBTC"]),
+    ]
+
+
+@pytest.mark.parametrize("count", [2, 3, 4, 7])
+def test_shards_keep_derived_inputs_together(sample: AppConfig, count: int) -> None:
+    shards = [shard_config(sample, index, count) for index in range(count)]
+    assert sum(len(shard.schedules) for shard in shards) == len(sample.schedules)
+    assert sum(len(shard.derived) for shard in shards) == len(sample.derived)
+    for shard in shards:
+        polled = {(item.provider, item.symbol) for item in shard.schedules}
+        for item in shard.derived:
+            for leg in item.legs:
+                if leg.provider == DERIVED_PROVIDER:
+                    assert leg.symbol in {other.symbol for other in shard.derived}
+                else:
+                    assert (leg.provider, leg.symbol) in polled
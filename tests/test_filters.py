@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from pricemonitor.config.models import FilterConfig
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.scheduler.filters import QuoteFilter
+from pricemonitor.scheduler.tasks import PollTask
+
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeProvider:
+    name = "binance"
+
+
+def quote(price: float, seconds: float = 0.0, symbol: str = "BTCUSDT") -> Quote:
+    instrument = BTC if symbol == BTC.symbol else Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO)
+    return Quote(instrument, price, NOW + timedelta(seconds=seconds), "USDT", "binance")
+
+
+def test_deadband_measures_from_last_written_price() -> None:
+    rules = {("binance", "BTCUSDT"): FilterConfig(absolute=1.0, heartbeat_seconds=60.0)}
+    quote_filter = QuoteFilter(rules)
+    prices = [100.0, 100.6, 100.9, 101.0, 101.5]
+    kept = quote_filter.apply([quote(price, seconds) for seconds, price in enumerate(prices)])
+    # Small steps that add up still count against the last write; a move of exactly the deadband is not enough.
+    assert [item.price for item in kept] == [100.0, 101.5]
+    assert quote_filter.dropped == 3
+
+
+def test_relative_deadband_heartbeat_and_passthrough() -> None:
+    rules = {("binance", "BTCUSDT"): FilterConfig(relative=0.01, heartbeat_seconds=10.0)}
+    quote_filter = QuoteFilter(rules)
+    assert quote_filter.accept(quote(200.0))
+    assert not quote_filter.accept(quote(202.0, 1))
+    assert quote_filter.accept(quote(202.5, 2))
+    assert not quote_filter.accept(quote(202.5, 11))
+    assert quote_filter.accept(quote(202.5, 12))
+    assert all(quote_filter.accept(quote(1.0, seconds, symbol="ETHUSDT")) for seconds in range(3))
+
+
+def test_zero_deadband_drops_only_repeats() -> None:
+    quote_filter = QuoteFilter({("binance", "BTCUSDT"): FilterConfig()})
+    kept = quote_filter.apply([quote(1.0), quote(1.0, 1), quote(1.0001, 2), quote(1.0001, 3)])
+    assert [item.price for item in kept] == [1.0, 1.0001]
+
+
+def test_providers_of_one_kind_keep_separate_rules() -> None:
+    main, backup = FakeProvider(), FakeProvider()
+    quote_filter = QuoteFilter({})
+    quote_filter.update(
+        [
+            PollTask(BTC, main, 1.0, FilterConfig(absolute=5.0), source="binance-main"),
+            PollTask(BTC, backup, 1.0, source="binance-backup"),
+        ]
+    )
+    assert set(quote_filter.rules) == {("binance-main", "BTCUSDT")}
+    assert len(quote_filter.apply([quote(100.0), quote(101.0, 1)], main)) == 1
+    assert len(quote_filter.apply([quote(100.0), quote(101.0, 1)], backup)) == 2
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import dataclasses
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote, Tick
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+def test_tick_is_frozen_like_quote() -> None:
+    tick = Tick(BTC, 100.0, NOW, "USDT", "binance")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        tick.price = 99.0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del tick.provider
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        tick.extra = {}
+    assert tick.price == 100.0
+
+
+def test_tick_round_trips_as_a_quote() -> None:
+    tick = Tick(BTC, 100.0, NOW, "USDT", "binance")
+    quote = Quote(BTC, 100.0, NOW, "USDT", "binance")
+    assert tick == quote and tick.as_quote() == quote
+    assert dataclasses.asdict(tick) == dataclasses.asdict(quote)
+    tick.extra["venue"] = "spot"
+    assert pickle.loads(pickle.dumps(tick)) == tick
+    moved = dataclasses.replace(tick, price=101.0)
+    assert moved.price == 101.0 and tick.price == 100.0
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from pricemonitor.utils.ratelimit import WeightLimiter
+
+
+def test_limiter_grants_burst_then_refills() -> None:
+    async def scenario() -> list[float]:
+        limiter = WeightLimiter("test", capacity=10, window=1.0)
+        started = time.monotonic()
+        granted = []
+        for _ in range(12):
+            await limiter.acquire(1)
+            granted.append(time.monotonic() - started)
+        return granted
+
+    granted = asyncio.run(scenario())
+    assert granted[9] < 0.05
+    # Past the burst, weight comes back at capacity / window = 10 per second.
+    assert 0.15 < granted[11] < 0.4
+
+
+def test_limiter_serves_waiters_by_priority() -> None:
+    async def scenario() -> list[str]:
+        limiter = WeightLimiter("test", capacity=2, window=0.2)
+        await limiter.acquire(2)
+        order: list[str] = []
+
+        async def take(label: str, priority: float) -> None:
+            await limiter.acquire(1, priority=priority)
+            order.append(label)
+
+        await asyncio.gather(take("slow", 60.0), take("api", 0.0), take("fast", 5.0))
+        return order
+
+    assert asyncio.run(scenario()) == ["api", "fast", "slow"]
+
+
+def test_limiter_observes_server_weight_and_retry_after() -> None:
+    async def scenario() -> None:
+        limiter = WeightLimiter("test", capacity=100, window=60.0)
+        limiter.observe(used_weight=95)
+        assert limiter.headroom() == pytest.approx(5, abs=0.1)
+        limiter.observe(retry_after=0.1, limited=True)
+        assert limiter.headroom() == 0.0
+        started = time.monotonic()
+        await limiter.acquire(1)
+        assert time.monotonic() - started >= 0.1
+
+    asyncio.run(scenario())
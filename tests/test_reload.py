@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from pricemonitor.config.loader import load_app_config
+from pricemonitor.providers.registry import build_provider
+from pricemonitor.scheduler.reload import ConfigReloader
+from pricemonitor.scheduler.runner import build_pipeline, build_tasks_from_config
+from pricemonitor.storage.csv import CsvStorage
+
+SOURCES = """
+providers:
+  tradingview:
+    kind: tradingview
+    settings:
+      circuit_breaker: {breaker}
+instruments:
+  - symbol: XAUUSD
+    asset_class: metal
+    provider: tradingview
+  - symbol: XAGUSD
+    asset_class: metal
+    provider: tradingview
+"""
+
+
+def schedules(*entries: tuple[str, int]) -> str:
+    lines = ["schedules:"]
+    for symbol, interval in entries:
+        lines += [f"  - symbol: {symbol}", "    provider: tradingview", f"    interval_seconds: {interval}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_config(directory: Path, schedule_text: str, breaker: str = "false") -> None:
+    (directory / "sources.yaml").write_text(SOURCES.format(breaker=breaker))
+    (directory / "schedules.yaml").write_text(schedule_text)
+    (directory / "storage.yaml").write_text(f"storage:\n  backend: csv\n  root: {directory / 'data'}\n")
+
+
+def scheduled(reloader: ConfigReloader) -> dict[float, list[str]]:
+    return {
+        interval: [instrument.symbol for instrument in entry.group.instruments]
+        for (_, interval), entry in reloader.pipeline.entries.items()
+    }
+
+
+def test_reload_applies_schedule_changes_and_keeps_unchanged_providers(tmp_path: Path) -> None:
+    write_config(tmp_path, schedules(("XAUUSD", 60)))
+
+    async def scenario() -> None:
+        config = load_app_config(tmp_path)
+        providers = {name: build_provider(item) for name, item in config.providers.items()}
+        pipeline = build_pipeline(config, CsvStorage(tmp_path / "data"))
+        pipeline.update(build_tasks_from_config(config, providers))
+        reloader = ConfigReloader(tmp_path, config, providers, pipeline)
+        original = providers["tradingview"]
+
+        # Retime XAUUSD and add XAGUSD.
+        write_config(tmp_path, schedules(("XAUUSD", 30), ("XAGUSD", 60)))
+        assert await reloader.reload()
+        assert scheduled(reloader) == {30.0: ["XAUUSD"], 60.0: ["XAGUSD"]}
+        assert reloader.providers["tradingview"] is original
+
+        # Remove XAUUSD; the group it was alone in goes away.
+        write_config(tmp_path, schedules(("XAGUSD", 60)))
+        assert await reloader.reload()
+        assert scheduled(reloader) == {60.0: ["XAGUSD"]}
+        assert reloader.providers["tradingview"] is original
+
+        # An edit that does not load leaves everything running as it was.
+        (tmp_path / "schedules.yaml").write_text(schedules(("XAGUSD", 0)))
+        assert not await reloader.reload()
+        assert scheduled(reloader) == {60.0: ["XAGUSD"]}
+
+        # Changed provider settings build a new instance and move the schedule onto it.
+        write_config(tmp_path, schedules(("XAGUSD", 60)), breaker="true")
+        assert await reloader.reload()
+        replacement = reloader.providers["tradingview"]
+        assert replacement is not original
+        assert [key for key, _ in pipeline.entries] == [id(replacement)]
+        await asyncio.gather(*reloader._retiring)
+
+    asyncio.run(scenario())
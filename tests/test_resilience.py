@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.providers.base import ProviderError, UnknownSymbolError
+from pricemonitor.providers.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilientProvider,
+    upstream_request,
+)
+from pricemonitor.utils.ratelimit import WeightLimiter
+
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+class FakeProvider:
+    """Answers ``fetch_quote`` after the next scripted delay, or raises the scripted error."""
+
+    name = "fake"
+
+    def __init__(self, *script: float | BaseException, limiter: WeightLimiter | None = None) -> None:
+        self.script = list(script)
+        self.calls = 0
+        if limiter is not None:
+            self.limiter = limiter
+            self.times_requests = True
+
+    async def fetch_quote(self, instrument: Instrument) -> str:
+        step = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        if isinstance(step, BaseException):
+            raise step
+        limiter = getattr(self, "limiter", None)
+        if limiter is not None:
+            await limiter.acquire(1)
+            async with upstream_request():
+                await asyncio.sleep(step)
+        else:
+            await asyncio.sleep(step)
+        return f"answer-{self.calls}"
+
+
+def test_breaker_opens_then_probes_once() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05, max_reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED and breaker.allow()
+
+
+def test_provider_fails_fast_while_open_and_ignores_rejected_requests() -> None:
+    async def scenario() -> None:
+        provider = FakeProvider(UnknownSymbolError("nope", ["BTCUSDT"]))
+        resilient = ResilientProvider(provider, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=60.0))
+        for _ in range(3):
+            with pytest.raises(UnknownSymbolError):
+                await resilient.fetch_quote(BTC)
+        assert resilient.breaker.state is CircuitState.CLOSED
+
+        provider.script = [ProviderError("down")]
+        for _ in range(2):
+            with pytest.raises(ProviderError):
+                await resilient.fetch_quote(BTC)
+        calls = provider.calls
+        with pytest.raises(CircuitOpenError):
+            await resilient.fetch_quote(BTC)
+        assert provider.calls == calls
+
+    asyncio.run(scenario())
+
+
+def test_timeout_counts_as_failure() -> None:
+    async def scenario() -> None:
+        resilient = ResilientProvider(FakeProvider(1.0), max_timeout=0.05, breaker=CircuitBreaker(failure_threshold=1))
+        with pytest.raises(ProviderError, match="timed out"):
+            await resilient.fetch_quote(BTC)
+        assert resilient.breaker.state is CircuitState.OPEN
+
+    asyncio.run(scenario())
+
+
+def warmed(provider: FakeProvider, samples: float = 0.01, **options) -> ResilientProvider:
+    resilient = ResilientProvider(provider, hedge=True, min_samples=5, **options)
+    for _ in range(5):
+        resilient.latency.record(samples)
+    return resilient
+
+
+def test_slow_primary_is_hedged() -> None:
+    async def scenario() -> None:
+        provider = FakeProvider(0.5, 0.01)
+        assert await warmed(provider).fetch_quote(BTC) == "answer-2"
+        assert provider.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_fast_primary_is_not_hedged() -> None:
+    async def scenario() -> None:
+        provider = FakeProvider(0.0)
+        assert await warmed(provider, samples=0.2).fetch_quote(BTC) == "answer-1"
+        assert provider.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_hedge_skipped_without_limiter_headroom() -> None:
+    async def scenario() -> None:
+        limiter = WeightLimiter("test", capacity=100, window=60.0)
+        limiter.observe(used_weight=99)
+        provider = FakeProvider(0.1, 0.0, limiter=limiter)
+        assert await warmed(provider).fetch_quote(BTC) == "answer-1"
+        assert provider.calls == 1
+
+    asyncio.run(scenario())
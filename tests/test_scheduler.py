@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.scheduler.engine import Scheduler
+from pricemonitor.scheduler.tasks import PollGroup
+
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+class FakeProvider:
+    def __init__(self, name: str = "fake", max_in_flight: int | None = None) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+
+
+class Handler:
+    """Records when each group fired and holds it for ``delay`` seconds."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[tuple[PollGroup, float]] = []
+
+    async def __call__(self, group: PollGroup) -> None:
+        self.calls.append((group, asyncio.get_running_loop().time()))
+        await asyncio.sleep(self.delay)
+
+
+def drive(scheduler: Scheduler, groups: list[PollGroup], seconds: float, removed: int = 0):
+    """Add ``groups`` due immediately, cancel the first ``removed`` of them, and run for ``seconds``."""
+
+    async def main():
+        entries = [scheduler.add(group, delay=0.0) for group in groups]
+        for entry in entries[:removed]:
+            scheduler.remove(entry)
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return entries
+
+    return asyncio.run(main())
+
+
+def test_ticks_stay_on_absolute_deadlines() -> None:
+    # Each fetch takes most of the interval; relative sleeps would drift by that much per tick.
+    interval = 0.05
+    handler = Handler(delay=0.03)
+    scheduler = Scheduler(handler)
+    [entry] = drive(scheduler, [PollGroup(FakeProvider(), interval, (BTC,))], 0.52)
+    times = [at for _, at in handler.calls]
+    assert entry.fired == len(times) >= 9
+    assert entry.skipped == 0
+    for index, at in enumerate(times):
+        assert abs((at - times[0]) - index * interval) < interval / 2
+
+
+def test_slow_fetch_skips_ahead_instead_of_bursting() -> None:
+    interval = 0.02
+    handler = Handler(delay=0.11)
+    scheduler = Scheduler(handler)
+    [entry] = drive(scheduler, [PollGroup(FakeProvider(), interval, (BTC,))], 0.3)
+    # The group never runs twice at once and missed ticks are counted, not replayed.
+    assert 2 <= entry.fired <= 3
+    assert entry.skipped >= 8
+    gaps = [later - earlier for (_, earlier), (_, later) in zip(handler.calls, handler.calls[1:])]
+    assert all(gap >= 0.11 for gap in gaps)
+
+
+def test_removed_group_stops_firing() -> None:
+    handler = Handler()
+    scheduler = Scheduler(handler)
+    groups = [PollGroup(FakeProvider("dropped"), 0.02, (BTC,)), PollGroup(FakeProvider("kept"), 0.02, (BTC,))]
+    dropped, kept = drive(scheduler, groups, 0.1, removed=1)
+    assert kept.fired >= 3
+    assert dropped.fired == 0
+
+
+def test_provider_in_flight_cap() -> None:
+    provider = FakeProvider(max_in_flight=1)
+    peak = 0
+
+    async def handler(group: PollGroup) -> None:
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight(provider))
+        await asyncio.sleep(0.05)
+
+    scheduler = Scheduler(handler)
+    drive(scheduler, [PollGroup(provider, 0.2, (BTC,)) for _ in range(4)], 0.15)
+    assert peak == 1
+
+
+def test_provider_state_is_dropped_once_idle() -> None:
+    retired, current = FakeProvider(), FakeProvider()
+    handler = Handler(delay=0.05)
+    scheduler = Scheduler(handler)
+
+    async def scenario() -> None:
+        old = scheduler.add(PollGroup(retired, 10.0, (BTC,)), delay=0.0)
+        scheduler.add(PollGroup(current, 10.0, (BTC,)), delay=0.0)
+        runner = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.02)
+        scheduler.remove(old)
+        scheduler.remove(old)
+        # The removed provider's fetch is still running, so it is still counted.
+        assert scheduler.in_flight(retired) == 1
+        await asyncio.sleep(0.06)
+        assert scheduler.in_flight(retired) == 0
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert list(scheduler._slots) == [id(current)]
+
+
+def test_non_positive_interval_is_rejected() -> None:
+    async def scenario() -> None:
+        with pytest.raises(ValueError):
+            Scheduler(Handler()).add(PollGroup(FakeProvider(), 0, (BTC,)))
+
+    asyncio.run(scenario())
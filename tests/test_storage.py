@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.storage.buffered import BufferedStorage
+from pricemonitor.storage.csv import CsvStorage
+from pricemonitor.storage.sqlite import SqliteStorage
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+ETH = Instrument(symbol="ETHUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+def binary(root: Path):
+    pytest.importorskip("numpy")
+    from pricemonitor.storage.binary import BinaryStorage
+
+    return BinaryStorage(root)
+
+
+BACKENDS = {
+    # A small index stride so range reads seek through the sidecar index.
+    "csv": lambda root: CsvStorage(root, index_stride=512),
+    "csv-hourly": lambda root: CsvStorage(root, partition="hour"),
+    "sqlite": SqliteStorage,
+    "binary": binary,
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def storage(request, tmp_path: Path):
+    backend = BACKENDS[request.param](tmp_path)
+    yield backend
+    backend.close()
+
+
+def quote(instrument: Instrument, minutes: float, price: float | None = None) -> Quote:
+    return Quote(
+        instrument=instrument,
+        price=price if price is not None else 100.0 + minutes,
+        timestamp=NOW + timedelta(minutes=minutes),
+        currency="USDT",
+        provider="binance",
+    )
+
+
+def at(minutes: float) -> datetime:
+    return NOW + timedelta(minutes=minutes)
+
+
+def prices(quotes) -> list[float]:
+    return [quote.price for quote in quotes]
+
+
+@pytest.fixture
+def filled(storage):
+    # Three hours of minute quotes, so hourly partitions are crossed, interleaved with a second series.
+    storage.append_quotes([quote(BTC, minute) for minute in range(180)])
+    storage.append_quotes([quote(ETH, minute, 1.0) for minute in range(0, 180, 10)])
+    return storage
+
+
+def test_latest(filled) -> None:
+    assert filled.latest(BTC).price == 279.0
+    assert filled.latest(BTC).timestamp == at(179)
+    assert filled.latest(Instrument(symbol="XRPUSDT", asset_class=AssetClass.CRYPTO)) is None
+
+
+def test_history_keeps_series_apart_and_in_order(filled) -> None:
+    history = filled.history(BTC)
+    assert prices(history) == [100.0 + minute for minute in range(180)]
+    assert all(quote.instrument == BTC and quote.provider == "binance" for quote in history)
+    assert len(filled.history(ETH)) == 18
+
+
+def test_history_range_is_inclusive(filled) -> None:
+    assert prices(filled.history(BTC, start=at(30), end=at(90))) == [100.0 + minute for minute in range(30, 91)]
+    assert prices(filled.history(BTC, start=at(170))) == [100.0 + minute for minute in range(170, 180)]
+    assert prices(filled.history(BTC, end=at(4))) == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert filled.history(BTC, start=at(200)) == []
+
+
+def test_history_limit_keeps_most_recent(filled) -> None:
+    assert prices(filled.history(BTC, limit=3)) == [277.0, 278.0, 279.0]
+    assert prices(filled.history(BTC, limit=3, start=at(30), end=at(90))) == [188.0, 189.0, 190.0]
+    assert len(filled.history(BTC, limit=1_000)) == 180
+
+
+def test_iter_history_matches_history(filled) -> None:
+    assert list(filled.iter_history(BTC)) == filled.history(BTC)
+    assert list(filled.iter_history(BTC, start=at(59), end=at(121))) == filled.history(BTC, start=at(59), end=at(121))
+    assert list(filled.iter_history(BTC, start=at(500))) == []
+
+
+def test_history_arrays_match_history(filled) -> None:
+    if not hasattr(filled, "history_arrays"):
+        pytest.skip("backend has no columnar reads")
+    pytest.importorskip("numpy")
+    for limit, start, end in [(None, None, None), (5, None, None), (None, at(30), at(90)), (4, at(30), at(90))]:
+        stamps, values = filled.history_arrays(BTC, limit=limit, start=start, end=end)
+        expected = filled.history(BTC, limit=limit, start=start, end=end)
+        assert list(values) == prices(expected)
+        expected_stamps = [int(quote.timestamp.timestamp()) * 1_000_000_000 for quote in expected]
+        assert [int(stamp) for stamp in stamps] == expected_stamps
+
+
+def test_reads_survive_reopen(filled, request, tmp_path: Path) -> None:
+    filled.close()
+    backend = BACKENDS[request.node.callspec.params["storage"]](tmp_path)
+    try:
+        assert prices(backend.history(BTC, limit=2)) == [278.0, 279.0]
+        backend.append_quote(quote(BTC, 180))
+        assert backend.latest(BTC).price == 280.0
+    finally:
+        backend.close()
+
+
+def test_late_rows_are_read_in_time_order(filled) -> None:
+    # Exchange-stamped trades can land after locally stamped polls that are newer.
+    filled.append_quotes([quote(BTC, 180), quote(BTC, 90.5), quote(BTC, 179.5)])
+    assert prices(filled.history(BTC)) == sorted([100.0 + minute for minute in range(181)] + [190.5, 279.5])
+    window = filled.history(BTC, start=at(90), end=at(91))
+    assert prices(window) == [190.0, 190.5, 191.0]
+    assert list(filled.iter_history(BTC, start=at(90), end=at(91))) == window
+    assert prices(filled.history(BTC, limit=3)) == [279.0, 279.5, 280.0]
+    assert filled.latest(BTC).price == 280.0
+    if hasattr(filled, "history_arrays"):
+        pytest.importorskip("numpy")
+        _, values = filled.history_arrays(BTC, start=at(90), end=at(91))
+        assert list(values) == [190.0, 190.5, 191.0]
+
+
+def test_binary_late_rows_are_reloaded_only_when_the_side_file_changes(tmp_path: Path) -> None:
+    storage = binary(tmp_path)
+    try:
+        storage.append_quotes([quote(BTC, minute) for minute in range(10)])
+        storage.append_quotes([quote(BTC, 4.5)])
+        assert prices(storage.history(BTC, start=at(4), end=at(5))) == [104.0, 104.5, 105.0]
+        [(_, cached)] = storage._late_cache.values()
+        assert storage.latest(BTC).price == 109.0
+        assert next(iter(storage._late_cache.values()))[1] is cached
+        storage.append_quotes([quote(BTC, 2.5)])
+        assert prices(storage.history(BTC, start=at(2), end=at(5))) == [102.0, 102.5, 103.0, 104.0, 104.5, 105.0]
+        assert next(iter(storage._late_cache.values()))[1] is not cached
+    finally:
+        storage.close()
+
+
+class GatedStorage(SqliteStorage):
+    """SQLite backend whose writes wait until ``gate`` is set, standing in for a stalled disk."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.gate = threading.Event()
+
+    def append_quotes(self, quotes) -> None:
+        self.gate.wait()
+        super().append_quotes(quotes)
+
+
+def test_buffered_reads_see_pending_quotes_without_writing(tmp_path: Path) -> None:
+    backend = GatedStorage(tmp_path)
+    backend.gate.set()
+    storage = BufferedStorage(backend, max_batch=10_000, max_delay=60.0)
+    try:
+        storage.append_quotes([quote(BTC, minute) for minute in range(0, 100, 2)])
+        storage.flush()
+        backend.gate.clear()
+        storage.append_quotes([quote(BTC, minute) for minute in range(1, 100, 2)] + [quote(ETH, 5, 1.0)])
+
+        started = time.monotonic()
+        assert prices(storage.history(BTC)) == [100.0 + minute for minute in range(100)]
+        assert prices(storage.history(BTC, limit=3, start=at(10), end=at(20))) == [118.0, 119.0, 120.0]
+        assert storage.latest(BTC).price == 199.0
+        assert all(item.instrument is BTC for item in storage.history(BTC, limit=5))
+        stamps, values = storage.history_arrays(BTC, limit=4)
+        assert list(values) == [196.0, 197.0, 198.0, 199.0]
+        assert list(stamps) == sorted(stamps)
+        # Streaming exports read committed rows only.
+        assert len(list(storage.iter_history(BTC))) == 50
+        assert time.monotonic() - started < 1.0
+        assert len(backend.history(BTC)) == 50
+    finally:
+        backend.gate.set()
+        storage.close()
+
+
+def test_buffered_drops_beyond_max_pending(tmp_path: Path) -> None:
+    backend = GatedStorage(tmp_path)
+    storage = BufferedStorage(backend, max_batch=10, max_delay=60.0, max_pending=25)
+    try:
+        # The writer takes the first full batch and stalls on the gate; the buffer then fills up.
+        storage.append_quotes([quote(BTC, minute) for minute in range(10)])
+        deadline = time.monotonic() + 2.0
+        while storage._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        storage.append_quotes([quote(BTC, minute) for minute in range(10, 50)])
+        assert storage.dropped == 15
+        backend.gate.set()
+        assert len(storage.history(BTC)) == 35
+    finally:
+        backend.gate.set()
+        storage.close()
+    check = SqliteStorage(tmp_path)
+    assert prices(check.history(BTC)) == [100.0 + minute for minute in range(35)]
+    check.close()
+
+
+class SlowReadStorage(SqliteStorage):
+    """SQLite backend whose first ``history`` call stalls after reading until ``release`` is set."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def history(self, *args, **kwargs):
+        result = super().history(*args, **kwargs)
+        self.calls += 1
+        if self.calls == 1:
+            self.entered.set()
+            self.release.wait()
+        return result
+
+
+def test_buffered_slow_read_does_not_block_the_writer(tmp_path: Path) -> None:
+    backend = SlowReadStorage(tmp_path)
+    storage = BufferedStorage(backend, max_batch=10_000, max_delay=60.0)
+    try:
+        storage.append_quotes([quote(BTC, minute) for minute in range(10)])
+        results: list = []
+        reader = threading.Thread(target=lambda: results.append(storage.history(BTC)))
+        reader.start()
+        assert backend.entered.wait(2.0)
+        flusher = threading.Thread(target=storage.flush)
+        flusher.start()
+        flusher.join(2.0)
+        assert not flusher.is_alive()
+        # The rows moved to the backend while the read was out, so it runs again rather than miss them.
+        backend.release.set()
+        reader.join(2.0)
+        assert prices(results[0]) == [100.0 + minute for minute in range(10)]
+        assert backend.calls == 2
+    finally:
+        backend.release.set()
+        storage.close()
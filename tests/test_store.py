@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+from pricemonitor.state.store import QuoteStore, TickRing
+from pricemonitor.utils.time import utc_now
+
+
+def quote(symbol: str, price: float, age_seconds: float = 0.0) -> Quote:
+    instrument = Instrument(symbol=symbol, asset_class=AssetClass.CRYPTO)
+    return Quote(instrument, price, utc_now() - timedelta(seconds=age_seconds), "USDT", "binance")
+
+
+def test_ring_wraps_around_keeping_the_newest() -> None:
+    ring = TickRing(4)
+    for index in range(6):
+        ring.append(index, float(index))
+    assert len(ring) == 4
+    stamps, prices = ring.snapshot()
+    assert list(stamps) == [2, 3, 4, 5]
+    assert list(prices) == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_snapshot_limit_returns_newest_oldest_first() -> None:
+    ring = TickRing(5)
+    for index in range(3):
+        ring.append(index, float(index))
+    assert list(ring.snapshot(2)[0]) == [1, 2]
+    assert list(ring.snapshot(10)[0]) == [0, 1, 2]
+    assert list(ring.snapshot(0)[0]) == []
+    for index in range(3, 8):
+        ring.append(index, float(index))
+    # The head has wrapped, so the window is stitched from both ends of the arrays.
+    assert list(ring.snapshot(4)[1]) == [4.0, 5.0, 6.0, 7.0]
+    with pytest.raises(ValueError):
+        TickRing(0)
+
+
+def test_store_latest_honours_max_age() -> None:
+    store = QuoteStore(ring_capacity=2)
+    store.publish([quote("BTCUSDT", 1.0, age_seconds=120), quote("ETHUSDT", 2.0)])
+    assert store.latest("binance", "BTCUSDT").price == 1.0
+    assert store.latest("binance", "BTCUSDT", max_age=60) is None
+    assert store.latest("binance", "ETHUSDT", max_age=60).price == 2.0
+    assert set(store.latest_many("binance", ["BTCUSDT", "ETHUSDT", "SOLUSDT"], max_age=60)) == {"ETHUSDT"}
+    store.publish([quote("BTCUSDT", 3.0), quote("BTCUSDT", 4.0)])
+    assert store.latest("binance", "BTCUSDT", max_age=60).price == 4.0
+    assert list(store.recent("binance", "BTCUSDT")[1]) == [3.0, 4.0]
+    assert [len(column) for column in store.recent("kraken", "BTCUSDT")] == [0, 0]
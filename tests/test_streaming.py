@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pricemonitor.analytics.streaming import BarAggregator
+from pricemonitor.models.bars import Bar
+from pricemonitor.models.instruments import AssetClass, Instrument
+from pricemonitor.models.quotes import Quote
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BTC = Instrument(symbol="BTCUSDT", asset_class=AssetClass.CRYPTO, quote="USDT")
+
+
+class Writer:
+    def __init__(self) -> None:
+        self.bars: list[Bar] = []
+
+    def __call__(self, bars: list[Bar]) -> None:
+        self.bars.extend(bars)
+
+
+def quote(price: float, seconds: float) -> Quote:
+    return Quote(BTC, price, NOW + timedelta(seconds=seconds), "USDT", "binance")
+
+
+def test_bar_closes_when_the_next_bucket_starts() -> None:
+    writer = Writer()
+    aggregator = BarAggregator([60, 300], writer)
+    aggregator.publish([quote(10.0, 0), quote(12.0, 30), quote(9.0, 59.999)])
+    assert writer.bars == []
+    aggregator.publish([quote(11.0, 60)])
+    [bar] = writer.bars
+    assert (bar.interval_seconds, bar.start) == (60, NOW)
+    assert (bar.open, bar.high, bar.low, bar.close, bar.count) == (10.0, 12.0, 9.0, 9.0, 3)
+    # The tick at 60 s opens the next minute, while the 5-minute bar keeps accumulating.
+    assert sorted((bar.interval_seconds, bar.start, bar.count) for bar in aggregator.open_bars()) == [
+        (60, NOW + timedelta(seconds=60), 1),
+        (300, NOW, 4),
+    ]
+    aggregator.publish([quote(1.0, 5)])
+    assert len(writer.bars) == 1
+
+
+def test_running_mean_and_variance_match_statistics() -> None:
+    writer = Writer()
+    aggregator = BarAggregator([60], writer)
+    prices = [100.0, 100.5, 99.25, 101.0, 100.75, 98.5, 100.0, 102.25]
+    aggregator.publish([quote(price, index) for index, price in enumerate(prices)])
+    aggregator.publish([quote(100.0, 60)])
+    [bar] = writer.bars
+    count = len(prices)
+    assert bar.mean == pytest.approx(statistics.fmean(prices))
+    assert bar.variance * (count - 1) / count == pytest.approx(statistics.pvariance(prices))
+    # Bars store the sample variance.
+    assert bar.variance == pytest.approx(statistics.variance(prices))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from pricemonitor.config.loader import ConfigError, load_app_config
+from pricemonitor.scheduler.runner import run_app_config
+from pricemonitor.utils.metrics import ERRORS
+
+SOURCES = """
+providers:
+  tradingview:
+    kind: tradingview
+    settings:
+      circuit_breaker: false
+instruments:
+  - symbol: XAUUSD
+    asset_class: metal
+    provider: tradingview
+"""
+
+NO_SCHEDULES = "schedules: []\n"
+
+ONE_SCHEDULE = """
+schedules:
+  - symbol: XAUUSD
+    provider: tradingview
+    interval_seconds: 1
+"""
+
+
+def write_config(directory: Path, schedules: str) -> Path:
+    directory.mkdir(exist_ok=True)
+    (directory / "sources.yaml").write_text(SOURCES)
+    (directory / "schedules.yaml").write_text(schedules)
+    (directory / "storage.yaml").write_text(f"storage:\n  backend: csv\n  root: {directory / 'data'}\n")
+    return directory
+
+
+def test_empty_schedule_is_an_error_by_default(tmp_path: Path) -> None:
+    config_dir = write_config(tmp_path / "config", NO_SCHEDULES)
+    with pytest.raises(ConfigError):
+        asyncio.run(run_app_config(load_app_config(config_dir), run_seconds=0.1))
+
+
+def test_idle_worker_picks_up_schedules_on_reload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PRICEMONITOR_RELOAD_SECONDS", "0.05")
+    config_dir = write_config(tmp_path / "config", NO_SCHEDULES)
+    # The TradingView adapter is a stub that fails every fetch, which makes polls countable.
+    polls = ERRORS.labels("tradingview", "ProviderError")
+
+    async def scenario() -> float:
+        worker = asyncio.create_task(
+            run_app_config(load_app_config(config_dir), run_seconds=2.0, config_dir=config_dir, require_tasks=False)
+        )
+        await asyncio.sleep(0.3)
+        assert not worker.done()
+        before = polls.value
+        (config_dir / "schedules.yaml").write_text(ONE_SCHEDULE)
+        await worker
+        return polls.value - before
+
+    assert asyncio.run(scenario()) >= 1
+
+
+def test_idle_worker_without_reload_returns(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PRICEMONITOR_RELOAD_SECONDS", "0")
+    config_dir = write_config(tmp_path / "config", NO_SCHEDULES)
+    asyncio.run(
+        asyncio.wait_for(
+            run_app_config(load_app_config(config_dir), config_dir=config_dir, require_tasks=False),
+            timeout=5,
+        )
+    )
+
+
+def test_zero_interval_is_rejected_at_load(tmp_path: Path) -> None:
+    config_dir = write_config(tmp_path / "config", ONE_SCHEDULE.replace("interval_seconds: 1", "interval_seconds: 0"))
+    with pytest.raises(ConfigError, match="interval_seconds"):
+        load_app_config(config_dir)